@@ -0,0 +1,198 @@
+from src.util.ClasificadorTerminales import ClasificadorTerminales
+from src.util.Gramatica import Gramatica
+from src.util.GramaticaCompilada import GramaticaCompilada
+
+
+class AnalizadorEarley:
+    """
+    Reconocedor de Earley para cualquier gramática libre de contexto de Gramatica.
+
+    A diferencia del analizador con retroceso, acepta gramáticas ambiguas, recursivas por la
+    izquierda y con producciones vacías ([]): el costo es cúbico en el peor caso y lineal en
+    las gramáticas LL como la del lenguaje.
+
+    Cada producción con su punto ("expresion -> termino • operador_arit expresion") es un
+    número; un ítem (punto, origen) se guarda como el entero punto * (n + 1) + origen en el
+    conjunto de su posición. Por conjunto se guardan los ítems en orden (se procesan como una
+    cola), un set para no repetirlos y, por no terminal, los ítems que lo esperan (para
+    completar sin recorrer el conjunto).
+
+    Mejoras sobre el algoritmo básico:
+        - Anulables (Aycock y Horspool): al predecir un no terminal que puede ser vacío, el
+          ítem que lo espera avanza en el mismo momento.
+        - Recursión por la derecha (Leo): lista_instrucciones -> instruccion lista_instrucciones
+          completaría en cada instrucción toda la cadena de listas anteriores. Si en el conjunto
+          de origen un solo ítem espera al no terminal y este es su último símbolo, se salta
+          directamente al ítem más alto de la cadena (que se recuerda por conjunto).
+
+    Como la gramática es general no hay una única derivación que mostrar: no registra traza.
+    """
+
+    def __init__(self, tokens: list, gramatica: Gramatica = None, inicial: str = "programa") -> None:
+        """
+        :param tokens: Secuencia de lexemas (lista o VistaPlana de un TokenStream).
+        :param gramatica: Gramática a usar; por defecto la del lenguaje.
+        :param inicial: Símbolo inicial.
+        :raises ValueError: Si el símbolo inicial no está en la gramática.
+        """
+        self.tokens = tokens
+        self.gramatica = gramatica or Gramatica()
+        self.inicial = inicial
+
+        producciones = self.gramatica.obtener_gramatica()
+        if inicial not in producciones:
+            raise ValueError(f"No se encontró el símbolo inicial: '{inicial}'")
+
+        clasificador = ClasificadorTerminales.obtener(self.gramatica)
+        self.mascaras = clasificador.clasificar_tokens(tokens)
+
+        # Tablas por punto: qué hay después del punto y de qué no terminal es la producción
+        self.no_terminal_de = []    # <-- Lado izquierdo de la producción del punto
+        self.siguiente_nt = []      # <-- No terminal después del punto (None si no hay)
+        self.siguiente_bit = []     # <-- Bit del terminal después del punto (0 si no hay)
+        self.completo = []          # <-- True si el punto está al final de la producción
+        self.simbolo = []           # <-- Símbolo después del punto (para describir errores)
+        self.predicciones = {}      # <-- Primer punto de cada producción de un no terminal
+        for no_terminal, expansiones in producciones.items():
+            self.predicciones[no_terminal] = []
+            for produccion in expansiones:
+                self.predicciones[no_terminal].append(len(self.completo))
+                for posicion in range(len(produccion) + 1):
+                    simbolo = produccion[posicion] if posicion < len(produccion) else None
+                    self.no_terminal_de.append(no_terminal)
+                    self.siguiente_nt.append(simbolo if simbolo in producciones else None)
+                    self.siguiente_bit.append(clasificador.bits[simbolo] if simbolo is not None and simbolo not in producciones else 0)
+                    self.completo.append(simbolo is None)
+                    self.simbolo.append(simbolo)
+
+        compilada = GramaticaCompilada.obtener(self.gramatica, inicial)
+        self.anulables = {no_terminal for no_terminal in producciones if compilada.es_anulable(no_terminal)}
+
+        self.conjuntos = []         #<- Ítems de cada posición, en el orden en que se agregaron
+        self.esperando = []         #<- Por posición: no terminal -> ítems que lo tienen después del punto
+        self._leo = {}              #<- (posición, no terminal) -> ítem más alto de la cadena (o None)
+        self.indice_mas_lejano = 0  #<- Último token al que se llegó (ubica el error)
+        self.esperados = []         #<- Terminales que se podían leer en el token del error
+
+    #================== ANALISIS ===================
+    def analizar(self) -> bool:
+        total = len(self.tokens)
+        base = total + 1
+        mascaras = self.mascaras
+        no_terminal_de, siguiente_nt, siguiente_bit = self.no_terminal_de, self.siguiente_nt, self.siguiente_bit
+        completo, predicciones, anulables = self.completo, self.predicciones, self.anulables
+
+        conjuntos = self.conjuntos = [[] for _ in range(base)]
+        vistos = [set() for _ in range(base)]
+        esperando = self.esperando = [{} for _ in range(base)]
+
+        for punto in predicciones[self.inicial]:
+            conjuntos[0].append(punto * base)
+            vistos[0].add(punto * base)
+
+        for k in range(base):
+            cola, visto, espera = conjuntos[k], vistos[k], esperando[k]
+            mascara = mascaras[k] if k < total else 0
+            if not cola:
+                break
+            self.indice_mas_lejano = k
+
+            def agregar(item):
+                if item not in visto:
+                    visto.add(item)
+                    cola.append(item)
+
+            n = 0
+            while n < len(cola):
+                item = cola[n]
+                n += 1
+                punto, origen = divmod(item, base)
+
+                no_terminal = siguiente_nt[punto]
+                if no_terminal is not None:
+                    # Predicción
+                    espera.setdefault(no_terminal, []).append(item)
+                    for inicio in predicciones[no_terminal]:
+                        agregar(inicio * base + k)
+                    if no_terminal in anulables:
+                        agregar(item + base)
+
+                elif not completo[punto]:
+                    # Lectura
+                    if mascara & siguiente_bit[punto]:
+                        siguiente = item + base
+                        if siguiente not in vistos[k + 1]:
+                            vistos[k + 1].add(siguiente)
+                            conjuntos[k + 1].append(siguiente)
+
+                else:
+                    # Terminación
+                    lado_izquierdo = no_terminal_de[punto]
+                    alto = self._item_leo(origen, lado_izquierdo, base) if origen < k else None
+                    if alto is not None:
+                        agregar(alto)
+                    else:
+                        for esperado in esperando[origen].get(lado_izquierdo, ()):
+                            agregar(esperado + base)
+
+        aceptado = any(
+            completo[item // base] and item % base == 0 and no_terminal_de[item // base] == self.inicial
+            for item in conjuntos[total]
+        )
+        if aceptado:
+            self.indice_mas_lejano = total
+        else:
+            k = self.indice_mas_lejano
+            self.esperados = sorted({
+                self.simbolo[item // base] for item in conjuntos[k]
+                if siguiente_bit[item // base]
+            })
+        return aceptado
+
+    def _item_leo(self, origen: int, no_terminal: str, base: int):
+        """
+        Ítem más alto de la cadena de Leo para no_terminal completado desde origen, o None si en
+        ese conjunto no hay un único ítem que lo espere como último símbolo.
+        """
+        memo = self._leo
+        clave = (origen, no_terminal)
+        if clave in memo:
+            return memo[clave]
+
+        # La cadena puede ser tan larga como el programa: se recorre sin recursión
+        camino = []
+        recorridas = set()
+        alto = None
+        while clave not in recorridas:     # <-- Un ciclo de producciones unitarias no tiene ítem más alto
+            if clave in memo:
+                if memo[clave] is not None:
+                    alto = memo[clave]
+                break
+            esperan = self.esperando[clave[0]].get(clave[1], ())
+            if len(esperan) != 1 or not self.completo[esperan[0] // base + 1]:
+                break
+            avanzado = esperan[0] + base
+            camino.append(clave)
+            recorridas.add(clave)
+            alto = avanzado
+            punto, siguiente_origen = divmod(avanzado, base)
+            clave = (siguiente_origen, self.no_terminal_de[punto])
+
+        for paso in camino:
+            memo[paso] = alto
+        if not camino:
+            memo[(origen, no_terminal)] = None
+        return alto
+
+    def exportar_estados_tabla(self):
+        """El reconocedor de Earley no registra traza de estados."""
+        return []
+
+    def posicion_error(self):
+        """(indice, token, linea, columna) del token donde se detuvo, como AnalizadorSintactico.posicion_error()."""
+        indice = self.indice_mas_lejano
+        token = self.tokens[indice] if indice < len(self.tokens) else None
+
+        posicion = getattr(self.tokens, "posicion", None)
+        linea, columna = posicion(indice) if posicion else (None, None)
+        return indice, token, linea, columna
@@ -0,0 +1,250 @@
+import re
+from array import array
+from bisect import bisect_left
+
+from src.compiler.AnalizadorPackrat import AnalizadorPackrat
+from src.compiler.AnalizadorParalelo import AnalizadorParalelo
+from src.models.SourceFile import SourceFile
+from src.util.ClasificadorTerminales import ClasificadorTerminales
+from src.util.EspecificacionLexica import PATRON_FASES, SALTOS_DE_LINEA
+from src.util.Gramatica import Gramatica
+
+
+class AnalizadorIncremental:
+    """
+    Análisis sintáctico que, después de una edición del texto, vuelve a analizar solo las
+    instrucciones que la edición tocó.
+
+    El programa se guarda como 'fin', una lista de instrucciones e 'inicio', igual que lo corta
+    AnalizadorParalelo. De cada instrucción se recuerda dónde empieza y termina en el texto, sus
+    lexemas y el resultado de su análisis (el índice local del token con error, o -1).
+
+    editar(inicio, fin, texto) reemplaza texto[inicio:fin] y vuelve a tokenizar desde el final
+    de la última instrucción que termina antes de la línea editada (un token que empieza antes
+    de la edición en la misma línea puede cambiar, por ejemplo un '#' que pasa a abrir un
+    comentario). Las instrucciones nuevas se analizan hasta que un corte cae después de la
+    edición en el mismo lugar que un corte anterior: desde ahí el texto y los tokens son los
+    mismos, así que el resto se reutiliza corriendo sus posiciones. Los tokens no cruzan de
+    línea, por eso se puede tokenizar desde cualquier corte.
+
+    Si la edición toca 'fin' o la línea de 'inicio', o el programa no tiene esa forma, se
+    analiza todo.
+    """
+
+    _SALTO = re.compile(r'[' + SALTOS_DE_LINEA + r']')
+
+    def __init__(self, codigo) -> None:
+        """
+        :param codigo: Código fuente completo (str o SourceFile).
+        """
+        self.texto = codigo.texto if isinstance(codigo, SourceFile) else codigo
+        self._fuente = codigo if isinstance(codigo, SourceFile) else None
+
+        self.gramatica = Gramatica()
+        clasificador = ClasificadorTerminales.obtener(self.gramatica)
+        programa = self.gramatica.obtener_expansiones("programa")[0]
+        self.clasificar = clasificador.clasificar
+        self.bit_apertura, self.bit_cierre = clasificador.bits[programa[0]], clasificador.bits[programa[-1]]
+        self.bit_separador = clasificador.bits[";"]
+        self.bit_comentario = clasificador.bits[self.gramatica.obtener_expansiones("comentario")[0][0]]
+
+        # Instrucciones, en listas paralelas
+        self.inicios = array('I')       # <-- Offset del primer token de cada instrucción
+        self.finales = array('I')       # <-- Offset del final de su último token
+        self.lexemas = []               # <-- Tupla de lexemas de cada instrucción
+        self.desplazamientos = []       # <-- Offset de cada token, relativo al inicio de la instrucción
+        self.errores_locales = array('i')   # <-- Token con error dentro de la instrucción (-1 si no hay)
+
+        # Tokens 'fin' e 'inicio'; None si el programa no tiene esa forma (se analiza completo)
+        self.apertura = None            # <-- (inicio, fin, lexema)
+        self.cierre = None
+        self.completo = None            # <-- Resultado del análisis completo cuando no se puede cortar
+
+        self.errores = []               #<- (inicio de la instrucción, índice del token con error), en orden
+        self.indice_mas_lejano = 0      #<- Token del primer error (o la cantidad de tokens si no hay errores)
+        self.reanalizadas = 0           #<- Instrucciones analizadas en la última llamada
+
+    #================== ANALISIS ===================
+    def analizar(self) -> bool:
+        """Analiza el programa completo (lo que después editar() actualiza por partes)."""
+        tokens = list(self._escanear(self.texto, 0, len(self.texto)))
+        self._limpiar()
+
+        if len(tokens) < 2 or not self.clasificar(tokens[0][2]) & self.bit_apertura \
+                or not self.clasificar(tokens[-1][2]) & self.bit_cierre:
+            # Sin 'fin' ... 'inicio' no hay instrucciones que cortar: análisis completo
+            packrat = AnalizadorPackrat([token[2] for token in tokens], gramatica=self.gramatica)
+            exito = packrat.analizar()
+            self.completo = (tokens, exito, packrat.indice_mas_lejano)
+            self.reanalizadas = 1
+            return self._resultado()
+
+        self.apertura, self.cierre = tokens[0], tokens[-1]
+        nuevas = list(self._dividir(iter(tokens[1:-1])))
+        self._reemplazar(0, 0, nuevas)
+        return self._resultado()
+
+    def editar(self, inicio: int, fin: int, texto: str) -> bool:
+        """
+        Reemplaza self.texto[inicio:fin] por texto y actualiza el análisis.
+
+        :return: True si el programa editado es sintácticamente correcto.
+        """
+        if not 0 <= inicio <= fin <= len(self.texto):
+            raise IndexError(f"Edición fuera del código: {inicio}..{fin}")
+
+        tocada = self.completo is not None or inicio <= self.apertura[1] \
+            or fin >= self._inicio_de_linea(self.texto, self.cierre[0])
+
+        delta = len(texto) - (fin - inicio)
+        self.texto = self.texto[:inicio] + texto + self.texto[fin:]
+        self._fuente = None
+        if tocada:
+            return self.analizar()
+
+        # Primera instrucción que termina en la línea editada o después
+        k = bisect_left(self.finales, self._inicio_de_linea(self.texto, inicio))
+        desde = self.finales[k - 1] if k > 0 else self.apertura[1]
+        hasta = self.cierre[0] + delta
+        fin_edicion = inicio + len(texto)
+
+        nuevas = []
+        siguiente = len(self.lexemas)   #<- Primera instrucción anterior que se reutiliza
+        for instruccion in self._dividir(self._escanear(self.texto, desde, hasta)):
+            nuevas.append(instruccion)
+            corte = instruccion[1]
+            if corte < fin_edicion or not instruccion[4]:
+                continue
+            # Un corte después de la edición que ya existía: el resto no cambió
+            m = bisect_left(self.finales, corte - delta, k)
+            if m < len(self.finales) and self.finales[m] == corte - delta and self.finales[m] >= fin:
+                siguiente = m + 1
+                break
+
+        self._reemplazar(k, siguiente, nuevas, delta)
+        self.cierre = (self.cierre[0] + delta, self.cierre[1] + delta, self.cierre[2])
+        return self._resultado()
+
+    def _limpiar(self) -> None:
+        self.inicios, self.finales = array('I'), array('I')
+        self.lexemas, self.desplazamientos = [], []
+        self.errores_locales = array('i')
+        self.apertura = self.cierre = self.completo = None
+
+    def _reemplazar(self, desde: int, hasta: int, nuevas: list, delta: int = 0) -> None:
+        # Cambia las instrucciones [desde, hasta) por las nuevas, analizándolas, y corre las siguientes
+        tokens, rangos = [], []
+        for _inicio, _fin, lexemas, _desplazamientos, _cerrada in nuevas:
+            rangos.append((len(tokens), len(tokens) + len(lexemas)))
+            tokens.extend(lexemas)
+
+        errores_locales = array('i', [-1] * len(nuevas))
+        if nuevas:
+            errores = dict(AnalizadorParalelo.analizar_instrucciones((tokens, rangos)))
+            for n, (a, _b) in enumerate(rangos):
+                if a in errores:
+                    errores_locales[n] = errores[a] - a
+
+        if delta:
+            self.inicios[hasta:] = array('I', [x + delta for x in self.inicios[hasta:]])
+            self.finales[hasta:] = array('I', [x + delta for x in self.finales[hasta:]])
+        self.inicios[desde:hasta] = array('I', [instruccion[0] for instruccion in nuevas])
+        self.finales[desde:hasta] = array('I', [instruccion[1] for instruccion in nuevas])
+        self.lexemas[desde:hasta] = [instruccion[2] for instruccion in nuevas]
+        self.desplazamientos[desde:hasta] = [instruccion[3] for instruccion in nuevas]
+        self.errores_locales[desde:hasta] = errores_locales
+        self.reanalizadas = len(nuevas)
+
+    def _resultado(self) -> bool:
+        if self.completo is not None:
+            tokens, exito, indice = self.completo
+            self.errores = [] if exito else [(0, indice)]
+            self.indice_mas_lejano = len(tokens) if exito else indice
+            return exito
+
+        self.errores = []
+        indice = 1
+        for lexemas, error in zip(self.lexemas, self.errores_locales):
+            if error >= 0:
+                self.errores.append((indice, indice + error))
+            indice += len(lexemas)
+        if not self.lexemas:
+            self.errores.append((1, 1))     # <-- lista_instrucciones necesita al menos una instrucción
+
+        self.indice_mas_lejano = self.errores[0][1] if self.errores else indice + 1
+        return not self.errores
+
+    #================== TOKENS ===================
+    @staticmethod
+    def _escanear(texto: str, desde: int, hasta: int):
+        """Genera (inicio, fin, lexema) de los tokens de texto[desde:hasta], como TokenStream."""
+        for match in PATRON_FASES.finditer(texto, desde, hasta):
+            if match.lastgroup not in ("NUEVA_LINEA", "ESPACIO"):
+                yield match.start(), match.end(), match.group()
+
+    @staticmethod
+    def _inicio_de_linea(texto: str, posicion: int) -> int:
+        while posicion > 0 and not AnalizadorIncremental._SALTO.match(texto, posicion - 1):
+            posicion -= 1
+        return posicion
+
+    def _dividir(self, tokens):
+        """
+        Agrupa los tokens en instrucciones con el criterio de AnalizadorParalelo: hasta cada ';'
+        o un comentario al principio. Genera (inicio, fin, lexemas, desplazamientos, cerrada);
+        la última puede quedar sin cerrar (dará error).
+        """
+        lexemas, desplazamientos = [], []
+        inicio = fin = 0
+        for inicio_token, fin_token, lexema in tokens:
+            if not lexemas:
+                inicio = inicio_token
+            lexemas.append(lexema)
+            desplazamientos.append(inicio_token - inicio)
+            fin = fin_token
+
+            mascara = self.clasificar(lexema)
+            if mascara & self.bit_separador or (len(lexemas) == 1 and mascara & self.bit_comentario):
+                yield inicio, fin, tuple(lexemas), array('I', desplazamientos), True
+                lexemas, desplazamientos = [], []
+        if lexemas:
+            yield inicio, fin, tuple(lexemas), array('I', desplazamientos), False
+
+    #================== CONSULTAS ===================
+    def cantidad_tokens(self) -> int:
+        if self.completo is not None:
+            return len(self.completo[0])
+        return 2 + sum(len(lexemas) for lexemas in self.lexemas)
+
+    def token(self, indice: int):
+        """(offset, lexema) del token indice del programa."""
+        if self.completo is not None:
+            inicio, _fin, lexema = self.completo[0][indice]
+            return inicio, lexema
+        if indice == 0:
+            return self.apertura[0], self.apertura[2]
+
+        resto = indice - 1
+        for k, lexemas in enumerate(self.lexemas):
+            if resto < len(lexemas):
+                return self.inicios[k] + self.desplazamientos[k][resto], lexemas[resto]
+            resto -= len(lexemas)
+        if resto == 0:
+            return self.cierre[0], self.cierre[2]
+        raise IndexError("Índice de token fuera de rango")
+
+    @property
+    def fuente(self) -> SourceFile:
+        if self._fuente is None:
+            self._fuente = SourceFile(self.texto)
+        return self._fuente
+
+    def posicion_error(self):
+        """(indice, token, linea, columna) del primer error, como AnalizadorSintactico.posicion_error()."""
+        indice = self.indice_mas_lejano
+        if indice < self.cantidad_tokens():
+            offset, token = self.token(indice)
+        else:
+            offset, token = len(self.texto), None
+        linea, columna = self.fuente.posicion(offset)
+        return indice, token, linea, columna
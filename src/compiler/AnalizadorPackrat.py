@@ -0,0 +1,189 @@
+from src.models.Estado import Estado
+from src.models.Pila import Pila, VACIA
+from src.models.TrazaSintactica import TrazaSintactica
+from src.util.ClasificadorTerminales import ClasificadorTerminales
+from src.util.Gramatica import Gramatica
+
+
+class AnalizadorPackrat:
+    """
+    Analizador descendente con retroceso y memorización (packrat).
+
+    El resultado de cada no terminal en cada posición se guarda en memo[(no_terminal, indice)]:
+    (fin, alternativa) si tuvo éxito o FALLO si no. Cada par se explora una sola vez, así que un
+    no terminal que ya se analizó desde un token (por ejemplo la primera instruccion de
+    lista_instrucciones -> instruccion | instruccion lista_instrucciones) no se vuelve a analizar
+    al probar la siguiente alternativa, y el análisis es lineal en la cantidad de tokens.
+
+    Como cada par guarda un solo resultado, las alternativas se prueban en orden y gana la primera
+    que tiene éxito. Para que una alternativa corta no le gane a otra que la extiende, una
+    producción que es prefijo de otra se prueba después de ella (instruccion lista_instrucciones
+    antes que instruccion). La entrada se acepta solo si se consumieron todos los tokens.
+
+    La traza (registrar_estados=True) es la derivación encontrada, con las reglas 1 (expansión),
+    2 (concordancia) y 3 (terminación) de la traza con retroceso; si el análisis falla tiene el
+    estado inicial y un estado de error en el token más lejano al que se llegó.
+    """
+
+    FALLO = None
+
+    def __init__(self, tokens: list, gramatica: Gramatica = None, inicial: str = "programa",
+                 registrar_estados: bool = False, archivo_traza: str = None) -> None:
+        """
+        :param tokens: Secuencia de lexemas (lista o VistaPlana de un TokenStream).
+        :param gramatica: Gramática a usar; por defecto la del lenguaje.
+        :param inicial: Símbolo inicial.
+        :param registrar_estados: Guarda la derivación en una TrazaSintactica.
+        :param archivo_traza: Base SQLite donde volcar la traza (None la deja en memoria).
+        """
+        self.tokens = tokens
+        self.gramatica = gramatica or Gramatica()
+        self.inicial = inicial
+        self.producciones = {
+            no_terminal: self.ordenar_alternativas(expansiones)
+            for no_terminal, expansiones in self.gramatica.obtener_gramatica().items()
+        }
+
+        self.registrar_estados = registrar_estados
+        self.archivo_traza = archivo_traza
+        self.traza = TrazaSintactica(archivo=archivo_traza) if registrar_estados else None
+
+        self.memo = {}
+        self.indice_mas_lejano = 0  #<- Mayor cantidad de tokens consumidos en algún momento (ubica el error)
+
+        clasificador = ClasificadorTerminales.obtener(self.gramatica)
+        self.bits_terminales = clasificador.bits
+        self.mascaras = clasificador.clasificar_tokens(tokens)
+
+    @staticmethod
+    def ordenar_alternativas(expansiones: list) -> list:
+        """
+        Conserva el orden de la gramática salvo que una producción sea prefijo de otra: en ese
+        caso la más larga pasa adelante.
+        """
+        ordenadas = []
+        for produccion in expansiones:
+            for k, previa in enumerate(ordenadas):
+                if len(previa) < len(produccion) and produccion[:len(previa)] == previa:
+                    ordenadas.insert(k, produccion)
+                    break
+            else:
+                ordenadas.append(produccion)
+        return ordenadas
+
+    #================== ANALISIS ===================
+    def analizar(self) -> bool:
+        resultado = self.reconocer(self.inicial, 0)
+        exito = resultado is not self.FALLO and resultado[0] == len(self.tokens)
+
+        if self.traza is not None:
+            if exito:
+                self._registrar_derivacion()
+            else:
+                inicio = Estado("n", 0, "null", [], [self.inicial, '#'], [])
+                self.traza.registrar(inicio)
+                self.traza.registrar(Estado("e", self.indice_mas_lejano, "6b", inicio.a, inicio.b, inicio.a_copy))
+            if self.archivo_traza is not None:
+                self.traza.cerrar()
+
+        return exito
+
+    def reconocer(self, no_terminal: str, indice: int):
+        """
+        Analiza no_terminal desde el token indice y devuelve (fin, alternativa) o FALLO.
+
+        Calcula memo[(no_terminal, indice)] sin recursión: cada no terminal pendiente es un
+        generador que pide los resultados que le faltan y se apila hasta que el memo los tenga.
+        Se puede llamar varias veces sobre los mismos tokens (el memo se comparte).
+        """
+        memo = self.memo
+        clave_inicial = (no_terminal, indice)
+        if clave_inicial in memo:
+            return memo[clave_inicial]
+
+        pendientes = [self._evaluar(*clave_inicial)]
+        claves = [clave_inicial]
+        en_curso = {clave_inicial}
+        valor = None
+
+        while pendientes:
+            try:
+                pedido = pendientes[-1].send(valor)
+            except StopIteration as fin:
+                clave = claves.pop()
+                pendientes.pop()
+                en_curso.discard(clave)
+                memo[clave] = valor = fin.value
+                continue
+
+            if pedido in memo:
+                valor = memo[pedido]
+            elif pedido in en_curso:
+                valor = self.FALLO      # <-- Recursión por la izquierda: esa rama falla
+            else:
+                pendientes.append(self._evaluar(*pedido))
+                claves.append(pedido)
+                en_curso.add(pedido)
+                valor = None
+
+        return memo[clave_inicial]
+
+    def _evaluar(self, no_terminal: str, indice: int):
+        # Generador: hace yield de (no_terminal, indice) cuando necesita un resultado que no está
+        # en el memo y termina devolviendo (fin, alternativa) o FALLO
+        mascaras, bits = self.mascaras, self.bits_terminales
+        total = len(mascaras)
+        producciones = self.producciones
+        memo = self.memo
+
+        for alternativa, produccion in enumerate(producciones[no_terminal]):
+            posicion = indice
+            for simbolo in produccion:
+                if simbolo in producciones:
+                    resultado = memo.get((simbolo, posicion), False)
+                    if resultado is False:
+                        resultado = yield (simbolo, posicion)
+                    if resultado is self.FALLO:
+                        break
+                    posicion = resultado[0]
+                elif posicion < total and mascaras[posicion] & bits[simbolo]:
+                    posicion += 1
+                    if posicion > self.indice_mas_lejano:
+                        self.indice_mas_lejano = posicion
+                else:
+                    break
+            else:
+                return posicion, alternativa
+
+        return self.FALLO
+
+    #================== TRAZA ===================
+    def _registrar_derivacion(self) -> None:
+        # Recorre la derivación encontrada (las alternativas que quedaron en el memo) como un
+        # analizador predictivo, con una sola pila
+        tokens = self.tokens
+        pila = ['#', self.inicial]
+        traza_a = VACIA
+        traza_b = Pila.desde_lista(pila)
+        i = 0
+        self.traza.registrar(Estado("n", i, "null", traza_a, traza_b, traza_a))
+
+        while len(pila) > 1:
+            simbolo = pila.pop()
+            if simbolo in self.producciones:
+                produccion = self.producciones[simbolo][self.memo[(simbolo, i)][1]]
+                pila.extend(reversed(produccion))
+                traza_a = traza_a.apilar(simbolo)
+                traza_b = traza_b.resto.anteponer(produccion)
+                self.traza.registrar(Estado("n", i, "1", traza_a, traza_b, traza_a))
+            else:
+                traza_a = traza_a.apilar(tokens[i])
+                traza_b = traza_b.resto
+                i += 1
+                self.traza.registrar(Estado("n", i, "2", traza_a, traza_b, traza_a))
+
+        self.traza.registrar(Estado("t", i, "3", traza_a, traza_b, traza_a))
+
+    def exportar_estados_tabla(self):
+        """Traza en el formato [S, I, REGLA, lista_A, lista_B] (vacía si no se registraron estados)."""
+        return self.traza if self.traza is not None else []
@@ -0,0 +1,153 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.compiler.AnalizadorPackrat import AnalizadorPackrat
+from src.util.ClasificadorTerminales import ClasificadorTerminales
+from src.util.Gramatica import Gramatica
+
+
+class AnalizadorParalelo:
+    """
+    Análisis sintáctico por instrucciones, repartido entre varios procesos.
+
+    Un programa es 'fin' lista_instrucciones 'inicio' y cada instruccion termina en ';' o es un
+    comentario suelto, así que la lista de tokens se puede cortar en instrucciones sin
+    analizarla. Cada instrucción se analiza por separado (AnalizadorPackrat desde 'instruccion')
+    y los errores se devuelven con los índices de token del programa completo. Como no se
+    detiene en el primer error, se obtienen los errores de todas las instrucciones.
+
+    Si el programa no empieza con 'fin' y termina con 'inicio', no se puede cortar y se
+    analiza completo en el proceso actual.
+    """
+
+    # Por debajo de esta cantidad de tokens no vale la pena repartir el trabajo entre procesos
+    TOKENS_MINIMOS = 50_000
+
+    def __init__(self, tokens: list, max_workers: int = None, tokens_minimos: int = TOKENS_MINIMOS) -> None:
+        """
+        :param tokens: Secuencia de lexemas (lista o VistaPlana de un TokenStream).
+        :param max_workers: Número de procesos; None usa os.cpu_count().
+        :param tokens_minimos: Tokens mínimos por proceso; un programa más chico se analiza en
+                               el proceso actual.
+        """
+        self.tokens = tokens
+        self.max_workers = max_workers
+        self.tokens_minimos = tokens_minimos
+
+        self.gramatica = Gramatica()
+        programa = self.gramatica.obtener_expansiones("programa")[0]
+        self.apertura, self.cierre = programa[0], programa[-1]                  # <-- 'fin' ... 'inicio'
+        self.separador = ";"
+        self.comentario = self.gramatica.obtener_expansiones("comentario")[0][0]
+
+        self.instrucciones = []     #<- (inicio, fin) de cada instrucción, en índices globales
+        self.errores = []           #<- (inicio de la instrucción, índice del token con error), en orden
+        self.indice_mas_lejano = 0  #<- Token del primer error (o len(tokens) si no hay errores)
+
+    def analizar(self) -> bool:
+        tokens = self.tokens
+        total = len(tokens)
+        clasificador = ClasificadorTerminales.obtener(self.gramatica)
+        bits = clasificador.bits
+        mascaras = clasificador.clasificar_tokens(tokens)
+
+        if total < 2 or not mascaras[0] & bits[self.apertura] or not mascaras[-1] & bits[self.cierre]:
+            # Sin 'fin' ... 'inicio' no hay instrucciones que cortar: análisis completo
+            packrat = AnalizadorPackrat(tokens, gramatica=self.gramatica)
+            exito = packrat.analizar()
+            self.indice_mas_lejano = total if exito else packrat.indice_mas_lejano
+            if not exito:
+                self.errores.append((0, packrat.indice_mas_lejano))
+            return exito
+
+        self.instrucciones = self.dividir_instrucciones(mascaras, bits)
+        if not self.instrucciones:
+            # lista_instrucciones necesita al menos una instrucción
+            self.errores.append((1, 1))
+            self.indice_mas_lejano = 1
+            return False
+
+        grupos = self._agrupar()
+        tareas = [
+            (list(tokens[grupo[0][0]:grupo[-1][1]]), [(a - grupo[0][0], b - grupo[0][0]) for a, b in grupo])
+            for grupo in grupos
+        ]
+
+        if len(tareas) == 1:
+            resultados = [self.analizar_instrucciones(tareas[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=len(tareas)) as executor:
+                resultados = list(executor.map(self.analizar_instrucciones, tareas))
+
+        for grupo, errores in zip(grupos, resultados):
+            desplazamiento = grupo[0][0]
+            self.errores.extend((inicio + desplazamiento, indice + desplazamiento) for inicio, indice in errores)
+
+        self.indice_mas_lejano = self.errores[0][1] if self.errores else total
+        return not self.errores
+
+    def dividir_instrucciones(self, mascaras, bits) -> list:
+        """
+        Corta los tokens entre 'fin' e 'inicio' en instrucciones: hasta cada ';', o un comentario
+        al principio de una instrucción. Lo que quede después del último ';' es una instrucción
+        incompleta (dará error).
+        """
+        separador, comentario = bits[self.separador], bits[self.comentario]
+        instrucciones = []
+        inicio = 1
+        for k in range(1, len(mascaras) - 1):
+            if mascaras[k] & separador or (k == inicio and mascaras[k] & comentario):
+                instrucciones.append((inicio, k + 1))
+                inicio = k + 1
+        if inicio < len(mascaras) - 1:
+            instrucciones.append((inicio, len(mascaras) - 1))
+        return instrucciones
+
+    def _agrupar(self) -> list:
+        # Instrucciones consecutivas en grupos de tamaño parecido, uno por proceso
+        total = self.instrucciones[-1][1] - self.instrucciones[0][0]
+        workers = self.max_workers or os.cpu_count() or 1
+        partes = max(1, min(workers, total // max(1, self.tokens_minimos)))
+        objetivo = total / partes
+
+        grupos = [[]]
+        inicio_grupo = self.instrucciones[0][0]
+        for instruccion in self.instrucciones:
+            if grupos[-1] and instruccion[0] - inicio_grupo >= objetivo and len(grupos) < partes:
+                grupos.append([])
+                inicio_grupo = instruccion[0]
+            grupos[-1].append(instruccion)
+        return grupos
+
+    @staticmethod
+    def analizar_instrucciones(tarea):
+        """
+        Analiza un grupo de instrucciones (en un proceso aparte).
+
+        Returns:
+            list: (inicio, indice_error) de cada instrucción con error, en índices del grupo.
+        """
+        tokens, instrucciones = tarea
+        packrat = AnalizadorPackrat(tokens)
+        errores = []
+        for inicio, fin in instrucciones:
+            packrat.indice_mas_lejano = inicio
+            resultado = packrat.reconocer("instruccion", inicio)
+            if resultado is AnalizadorPackrat.FALLO:
+                errores.append((inicio, packrat.indice_mas_lejano))
+            elif resultado[0] != fin:
+                errores.append((inicio, max(packrat.indice_mas_lejano, resultado[0])))
+        return errores
+
+    def exportar_estados_tabla(self):
+        """El análisis en paralelo no registra traza de estados."""
+        return []
+
+    def posicion_error(self):
+        """(indice, token, linea, columna) del primer error, como AnalizadorSintactico.posicion_error()."""
+        indice = self.indice_mas_lejano
+        token = self.tokens[indice] if indice < len(self.tokens) else None
+
+        posicion = getattr(self.tokens, "posicion", None)
+        linea, columna = posicion(indice) if posicion else (None, None)
+        return indice, token, linea, columna
@@ -0,0 +1,143 @@
+from src.models.Estado import Estado
+from src.models.Pila import Pila, VACIA
+from src.models.TrazaSintactica import TrazaSintactica
+from src.util.GramaticaLL1 import GramaticaLL1
+
+
+class AnalizadorPredictivo:
+    """
+    Analizador sintáctico predictivo LL(1), guiado por la tabla de GramaticaLL1.
+
+    Usa una sola pila y nunca retrocede: en cada paso el no terminal del tope y el token actual
+    eligen la producción en la tabla, así que el análisis es lineal en la cantidad de tokens.
+    A diferencia del analizador con retroceso, la entrada se acepta solo si se consumieron
+    todos los tokens, y un token igual a un literal de la gramática se toma siempre como ese
+    literal aunque también cumpla un patrón (ver GramaticaLL1.solapamientos): con la gramática
+    del lenguaje, las palabras reservadas no se pueden usar como identificadores.
+
+    Con registrar_estados=True guarda cada paso como un Estado, con las mismas reglas que la
+    traza del analizador con retroceso (1 expansión, 2 concordancia, 3 terminación, 4 no
+    concordancia) para que exportar_estados_tabla() se pueda mostrar en la misma tabla.
+    """
+
+    # Tabla de la gramática del lenguaje (se arma la primera vez que se pide)
+    _gramatica_ll1 = None
+
+    def __init__(self, tokens: list, gramatica: GramaticaLL1 = None, registrar_estados: bool = False,
+                 archivo_traza: str = None) -> None:
+        """
+        :param tokens: Secuencia de lexemas (lista o VistaPlana de un TokenStream).
+        :param gramatica: Tabla LL(1) a usar; por defecto la de la gramática del lenguaje.
+        :param registrar_estados: Guarda la traza de estados en una TrazaSintactica.
+        :param archivo_traza: Base SQLite donde volcar la traza (None la deja en memoria).
+        :raises ValueError: Si la tabla de la gramática tiene celdas con dos producciones (los
+                            solapamientos entre literales y patrones se resuelven por el literal).
+        """
+        self.tokens = tokens
+        self.gramatica = gramatica or self.obtener_gramatica_ll1()
+        if self.gramatica.conflictos:
+            raise ValueError("La gramática no es LL(1):\n" + self.gramatica.describir_conflictos())
+
+        self.registrar_estados = registrar_estados
+        self.archivo_traza = archivo_traza
+        self.traza = TrazaSintactica(archivo=archivo_traza) if registrar_estados else None
+        self.indice_mas_lejano = 0  #<- Token donde se detuvo el análisis (ubica el error)
+        self.esperados = []         #<- Terminales que se esperaban en el error
+
+    @classmethod
+    def obtener_gramatica_ll1(cls) -> GramaticaLL1:
+        if cls._gramatica_ll1 is None:
+            cls._gramatica_ll1 = GramaticaLL1()
+        return cls._gramatica_ll1
+
+    def analizar(self) -> bool:
+        gramatica = self.gramatica
+        tabla, producciones = gramatica.tabla, gramatica.producciones
+        terminales_de = gramatica.terminales_de
+        tokens = self.tokens
+        total = len(tokens)
+        registrar = self.registrar_estados
+
+        pila = [GramaticaLL1.FIN, gramatica.inicial]   # <-- El tope es el final de la lista
+        i = 0
+
+        # Pilas persistentes A y B de la traza (solo si se registra): los estados comparten celdas
+        traza_a = VACIA
+        traza_b = Pila.desde_lista(pila)
+
+        if registrar:
+            self._registrar("n", i, "null", traza_a, traza_b)
+
+        while True:
+            simbolo = pila.pop()
+
+            if simbolo in tabla:
+                fila = tabla[simbolo]
+                candidatos = (GramaticaLL1.FIN,) if i == total else terminales_de(tokens[i])
+                for terminal in candidatos:
+                    k = fila.get(terminal)
+                    if k is not None:
+                        break
+                else:
+                    pila.append(simbolo)
+                    self.esperados = sorted(fila)
+                    return self._fallar(i, traza_a, traza_b)
+
+                pila.extend(reversed(producciones[simbolo][k]))
+                if registrar:
+                    traza_a = traza_a.apilar(simbolo)
+                    traza_b = traza_b.resto.anteponer(producciones[simbolo][k])
+                    self._registrar("n", i, "1", traza_a, traza_b)
+
+            elif simbolo == GramaticaLL1.FIN:
+                if i < total:
+                    pila.append(simbolo)
+                    self.esperados = [GramaticaLL1.FIN]
+                    return self._fallar(i, traza_a, traza_b)
+
+                self.indice_mas_lejano = i
+                if registrar:
+                    self._registrar("t", i, "3", traza_a, traza_b)
+                return True
+
+            elif i < total and simbolo in terminales_de(tokens[i]):
+                i += 1
+                if registrar:
+                    traza_a = traza_a.apilar(tokens[i - 1])
+                    traza_b = traza_b.resto
+                    self._registrar("n", i, "2", traza_a, traza_b)
+
+            else:
+                pila.append(simbolo)
+                self.esperados = [simbolo]
+                return self._fallar(i, traza_a, traza_b)
+
+    def _fallar(self, i, traza_a, traza_b) -> bool:
+        self.indice_mas_lejano = i
+        if self.registrar_estados:
+            self._registrar("e", i, "4", traza_a, traza_b)
+        return False
+
+    def _registrar(self, s, i, regla, traza_a, traza_b) -> None:
+        self.traza.registrar(Estado(s, i, regla, traza_a, traza_b, traza_a))
+        if s in ("t", "e") and self.archivo_traza is not None:
+            self.traza.cerrar()
+
+    def exportar_estados_tabla(self):
+        """
+        Devuelve la traza en el formato del analizador con retroceso: [S, I, REGLA, lista_A, lista_B]
+        (vacía si no se registraron estados).
+        """
+        return self.traza if self.traza is not None else []
+
+    def posicion_error(self):
+        """
+        Igual que AnalizadorSintactico.posicion_error(): (indice, token, linea, columna) del token
+        donde se detuvo el análisis.
+        """
+        indice = self.indice_mas_lejano
+        token = self.tokens[indice] if indice < len(self.tokens) else None
+
+        posicion = getattr(self.tokens, "posicion", None)
+        linea, columna = posicion(indice) if posicion else (None, None)
+        return indice, token, linea, columna
@@ -1,32 +1,259 @@
+import time
+
+from src.compiler.AnalizadorEarley import AnalizadorEarley
+from src.compiler.AnalizadorPackrat import AnalizadorPackrat
+from src.compiler.AnalizadorParalelo import AnalizadorParalelo
+from src.compiler.AnalizadorPredictivo import AnalizadorPredictivo
+from src.models.ArbolSintactico import ArbolSintactico
+from src.models.EstadisticasSintacticas import EstadisticasSintacticas
 from src.models.Estado import Estado
+from src.models.TrazaSintactica import TrazaSintactica
+from src.util.ClasificadorTerminales import ClasificadorTerminales
 from src.util.Gramatica import Gramatica
-from src.util.Tokenizador import Tokenizador
+from src.util.GramaticaCompilada import GramaticaCompilada
+from src.util.GramaticaLL1 import GramaticaLL1
 
 
 class AnalizadorSintactico:
 
-    def __init__(self, tokens: list) -> None:
+    def __init__(self, tokens: list, modo: str = "retroceso", registrar_estados: bool = True,
+                 archivo_traza: str = None, gramatica: Gramatica = None, recuperar_errores: bool = False,
+                 max_pasos: int = None, tiempo_limite: float = None, max_profundidad: int = None) -> None:
+        """
+        :param tokens: Lista de tokens a analizar (o la VistaPlana de un TokenStream).
+        :param modo: "retroceso" es el analizador descendente con retroceso;
+                     "ll1" usa el analizador predictivo (AnalizadorPredictivo), lineal y sin retroceso
+                     (toma las palabras reservadas siempre como tales, así que no acepta todo lo
+                     que acepta el retroceso);
+                     "packrat" es el retroceso con memorización por (no_terminal, indice) (AnalizadorPackrat);
+                     "paralelo" analiza cada instrucción por separado en varios procesos (AnalizadorParalelo),
+                     sin traza, y junta los errores de todas las instrucciones en self.errores;
+                     "earley" reconoce cualquier gramática libre de contexto (ambigua, recursiva por
+                     la izquierda, con producciones vacías) sin traza (AnalizadorEarley).
+        :param registrar_estados: Guarda la traza para exportar_estados_tabla(). Sin traza solo se
+                                  conserva el estado actual (memoria proporcional a las pilas).
+        :param archivo_traza: Si se indica, la traza se vuelca a esa base SQLite en lugar de
+                              quedar en memoria.
+        :param gramatica: Gramática a usar, con símbolo inicial "programa" (por defecto la del
+                          lenguaje). El modo "paralelo" siempre usa la del lenguaje, que es la
+                          que sabe cortar en instrucciones.
+        :param recuperar_errores: En modo "retroceso", analiza instrucción por instrucción y
+                                  después de un error descarta tokens hasta el siguiente ';' o
+                                  'inicio' (modo pánico) y sigue: informa todos los errores en
+                                  self.errores en una sola pasada.
+        :param max_pasos: En modo "retroceso", detiene el análisis (como fallido) al llegar a esa
+                          cantidad de estados.
+        :param tiempo_limite: Segundos máximos de análisis en modo "retroceso".
+        :param max_profundidad: Símbolos máximos pendientes en la pila B en modo "retroceso".
+                                Cuando se detiene por un límite, estadisticas.detenido_por dice cuál.
+        """
+        if modo not in ("retroceso", "ll1", "packrat", "paralelo", "earley"):
+            raise ValueError(f"Modo de análisis sintáctico desconocido: '{modo}'")
 
         self.tokens = tokens  #<- Es la lista de tokens a analizar
-        self.lista_estados = []
+        self.modo = modo
+        self.recuperar_errores = recuperar_errores
+        self.inicial = "programa"  #<- No terminal que se está analizando (la raíz del estado inicial)
+        self.registrar_estados = registrar_estados
+        self.archivo_traza = archivo_traza
+        self.traza = TrazaSintactica(archivo=archivo_traza) if registrar_estados and modo == "retroceso" else None
+        self.ultimo_estado = None
         self.contador_global = 0
+        self.indice_mas_lejano = 0  #<- Mayor cantidad de tokens consumidos en algún momento (ubica el error)
         self.sin_alternativas = False #<- Indica si se han agotado las alternativas para un no terminal
+        self.errores = []           #<- (inicio de la instrucción, índice del error) en modo paralelo o con recuperación
+
+
+        self.gramatica = gramatica or Gramatica()
+        self.gramatica_propia = gramatica is not None
+        self.pasos = 0  #<- Estados generados (para medir pasos por segundo)
+
+        self.max_pasos = max_pasos
+        self.tiempo_limite = tiempo_limite
+        self.max_profundidad = max_profundidad
+        self._vencimiento = None    #<- perf_counter() en el que vence tiempo_limite
+        self.estadisticas = EstadisticasSintacticas(modo)
 
+        # Lo necesario para armar el árbol del análisis exitoso (obtener_arbol()): las pilas A y
+        # de alternativas del estado final (una por instrucción con recuperación) o el packrat
+        self._derivaciones = []
+        self._packrat = None
 
-        self.gramatica = Gramatica()
+        self.agregar_estado(Estado("n", 0, "null", [], ['programa', '#'], []))
 
-        self.lista_estados.append(Estado("n", 0, "null", [], ['programa', '#'], []))
 
+        #self.agregar_estado(Estado("n", 0, "null",  [], ['programa', '#'], [] ))
 
-        #self.lista_estados.append(Estado("n", 0, "null",  [], ['programa', '#'], [] ))
 
 
+    def agregar_estado(self, estado: Estado) -> None:
+        # Solo el último estado hace falta para seguir; los anteriores quedan en la traza (si se registra)
+        self.ultimo_estado = estado
+        self.pasos += 1
+        self.estadisticas.registrar(estado)
+        if self.traza is not None:
+            self.traza.registrar(estado)
 
     def analizar(self) -> bool:
+        """
+        Ejecuta el análisis en el modo elegido. El tiempo y los contadores quedan en
+        self.estadisticas (ver resultado()).
+        """
         #print(self.tokens)
+        inicio = time.perf_counter()
+        if self.tiempo_limite is not None:
+            self._vencimiento = inicio + self.tiempo_limite
+        try:
+            if self.modo == "ll1":
+                return self.analizar_predictivo()
+            if self.modo == "packrat":
+                return self.analizar_packrat()
+            if self.modo == "paralelo":
+                return self.analizar_paralelo()
+            if self.modo == "earley":
+                return self.analizar_earley()
+
+            if self.recuperar_errores:
+                exito = self.analizar_con_recuperacion()
+            else:
+                exito = self.analizar_con_retroceso()
+            if self.traza is not None and self.archivo_traza is not None:
+                self.traza.cerrar()     # <-- Escribe lo pendiente y libera la base (se reabre al leer filas)
+            return exito
+        finally:
+            self.estadisticas.segundos = time.perf_counter() - inicio
+
+    def resultado(self):
+        """Analiza y devuelve (exito, estadisticas)."""
+        return self.analizar(), self.estadisticas
+
+    def analizar_con_retroceso(self) -> bool:
+        self.preparar_retroceso()
+        if self.ejecutar_retroceso():
+            self._derivaciones = [(self.ultimo_estado.a, self.ultimo_estado.alternativas)]
+            print("Analiis concluido exitosamente.")
+            return True #<- Indica que el análisis fue exitoso
+
+        print("ERROR: Análisis sintáctico fallido.")
+        return False # <- Indica que el análisis falló
+
+    def analizar_con_recuperacion(self) -> bool:
+        """
+        Análisis con retroceso y recuperación de errores en modo pánico.
+
+        Después de 'fin' se analiza una instruccion por vez, cada una desde su primer token (el
+        retroceso nunca sale de la instrucción, así que un error no obliga a volver a probar
+        todo el programa). Si una instrucción falla se guarda (inicio, token más lejano) en
+        self.errores, se descartan tokens hasta el siguiente ';' y se sigue con la instrucción
+        que viene.
+
+        'inicio' también cumple el patrón de identificador ('inicio = 1 ;' es una asignación para
+        el retroceso), así que solo termina el programa si es el último token o si el token que
+        le sigue no continúa una instrucción; si quedan tokens después de él, el primero es un
+        error. El descarte tampoco se detiene en un 'inicio' salvo que sea el último token o que
+        no quede ningún ';' después.
+
+        Returns:
+            bool: True si no hubo errores. self.indice_mas_lejano queda en el primer error.
+        """
+        self.preparar_retroceso()
+        tokens, mascaras, bits = self.tokens, self.mascaras, self.bits_terminales
+        total = len(tokens)
+        programa = self.expansiones["programa"][0]
+        bit_apertura, bit_cierre, bit_separador = bits[programa[0]], bits[programa[-1]], bits[";"]
+
+        self.errores = []
+        self._derivaciones = []
+        i = 0
+        if total and mascaras[0] & bit_apertura:
+            i = 1
+        else:
+            self.errores.append((0, 0))
+
+        instrucciones = 0
+        while i < total:
+            cierre = mascaras[i] & bit_cierre
+            if cierre and i == total - 1:
+                break
+            if self.analizar_desde("instruccion", i):
+                instrucciones += 1
+                self._derivaciones.append((self.ultimo_estado.a, self.ultimo_estado.alternativas))
+                i = self.contador_global
+                continue
+            if cierre and self.estadisticas.detenido_por is None and self.indice_mas_lejano <= i + 1:
+                break       # <-- Lo que sigue a 'inicio' no continúa una instrucción: es el final del programa
+
+            instrucciones += 1
+            if (i, self.indice_mas_lejano) not in self.errores[-1:]:
+                self.errores.append((i, self.indice_mas_lejano))
+            if self.estadisticas.detenido_por is not None:
+                self.indice_mas_lejano = self.errores[0][1]
+                return False
+
+            # Modo pánico: descartar hasta el ';' que cierra la instrucción; sin ningún ';' por
+            # delante, hasta el primer 'inicio' (o hasta el último token si es 'inicio')
+            j = self.indice_mas_lejano
+            while j < total - 1 and not mascaras[j] & bit_separador:
+                j += 1
+            if j < total and mascaras[j] & bit_separador:
+                i = j + 1
+            elif j < total and mascaras[j] & bit_cierre:
+                i = j
+            else:
+                i = next((k for k in range(self.indice_mas_lejano, total) if mascaras[k] & bit_cierre), total)
+
+        if instrucciones == 0:
+            self.errores.append((i, i))         # <-- lista_instrucciones necesita al menos una instrucción
+        if i >= total:
+            self.errores.append((total, total)) # <-- Falta 'inicio'
+        elif i < total - 1:
+            self.errores.append((i + 1, i + 1)) # <-- Tokens después de 'inicio'
+
+        self.indice_mas_lejano = self.errores[0][1] if self.errores else total
+        return not self.errores
+
+    def analizar_desde(self, no_terminal: str, indice: int) -> bool:
+        """
+        Analiza con retroceso un no_terminal desde el token indice (ya preparado con
+        preparar_retroceso()). Si tiene éxito, self.contador_global queda en el token siguiente.
+        """
+        self.inicial = no_terminal
+        self.contador_global = indice
+        self.indice_mas_lejano = indice
+        self.sin_alternativas = False
+        self.agregar_estado(Estado("n", indice, "null", [], [no_terminal, '#'], []))
+        return self.ejecutar_retroceso()
+
+    def preparar_retroceso(self) -> None:
+        # Cada token se clasifica una sola vez en la máscara de terminales que lo aceptan;
+        # la concordancia pasa a ser un AND entre la máscara y el bit del terminal
+        clasificador = ClasificadorTerminales.obtener(self.gramatica)
+        self.bits_terminales = clasificador.bits
+        self.mascaras = clasificador.clasificar_tokens(self.tokens)
+
+        # Las reglas consultan la gramática compilada (conjunto de no terminales y expansiones
+        # ya armadas) en lugar de llamar a Gramatica en cada paso
+        compilada = GramaticaCompilada.obtener(self.gramatica)
+        self.no_terminales = compilada.no_terminales
+        self.expansiones = compilada.expansiones
+
+    def ejecutar_retroceso(self) -> bool:
+        # Aplica las reglas desde el último estado hasta llegar a 't' (éxito), 'e' (error) o a un límite
+        max_pasos = self.max_pasos
+        max_profundidad = self.max_profundidad
+        vencimiento = self._vencimiento
+        vueltas = 0
 
         while True:
-            self.estado_actual = self.lista_estados[-1]
+            self.estado_actual = self.ultimo_estado
+
+            if max_pasos is not None and self.pasos >= max_pasos:
+                return self.detener("pasos")
+            if max_profundidad is not None and len(self.estado_actual.b) > max_profundidad:
+                return self.detener("profundidad")
+            vueltas += 1
+            if vencimiento is not None and not vueltas & 0x3FF and time.perf_counter() > vencimiento:
+                return self.detener("tiempo")
             #self.mostrar_estado_actual()
 
             if self.estado_actual.s == "n":
@@ -54,50 +281,80 @@ class AnalizadorSintactico:
                     continue
 
             elif self.estado_actual.s == "t":
-                print("Analiis concluido exitosamente.")
-                return True #<- Indica que el análisis fue exitoso
+                return True
                 #self.mostrar_estados()
-                break
 
             elif self.estado_actual.s == "e":
-                print("ERROR: Análisis sintáctico fallido.")
                 #self.mostrar_estados()
-                return False # <- Indica que el análisis falló
-                break
+                return False
 
             else:
                 print("ERROR INESPERADO NO SABEMOS QPDO")
                 break
 
-    def expansion_del_arbol(self) -> bool:
+    def analizar_predictivo(self) -> bool:
+        gramatica_ll1 = GramaticaLL1(self.gramatica) if self.gramatica_propia else None
+        predictivo = AnalizadorPredictivo(self.tokens, gramatica=gramatica_ll1, registrar_estados=self.registrar_estados,
+                                          archivo_traza=self.archivo_traza)
+        exito = predictivo.analizar()
 
-        # Verificamos si se puede aplicar la regla de expansión del árbol
-        if self.gramatica.es_no_terminal(self.estado_actual.b[0]):
+        # La traza y la posición del error quedan en este objeto, igual que en modo retroceso
+        self.traza = predictivo.traza
+        self.indice_mas_lejano = predictivo.indice_mas_lejano
+        return exito
+
+    def analizar_packrat(self) -> bool:
+        packrat = AnalizadorPackrat(self.tokens, gramatica=self.gramatica, registrar_estados=self.registrar_estados,
+                                    archivo_traza=self.archivo_traza)
+        exito = packrat.analizar()
 
-            # Obtenemos las listas copiadas
-            lista_a = self.estado_actual.a.copy()
-            lista_a_copy = self.estado_actual.a_copy.copy()
-            lista_b = self.estado_actual.b.copy()
+        self.traza = packrat.traza
+        self.indice_mas_lejano = packrat.indice_mas_lejano
+        self._packrat = packrat if exito else None
+        return exito
 
+    def analizar_paralelo(self) -> bool:
+        paralelo = AnalizadorParalelo(self.tokens)
+        exito = paralelo.analizar()
 
-            lista_alternativas = self.estado_actual.alternativas.copy()
+        self.traza = None
+        self.indice_mas_lejano = paralelo.indice_mas_lejano
+        self.errores = paralelo.errores
+        return exito
+
+    def analizar_earley(self) -> bool:
+        earley = AnalizadorEarley(self.tokens, gramatica=self.gramatica)
+        exito = earley.analizar()
+
+        self.traza = None
+        self.indice_mas_lejano = earley.indice_mas_lejano
+        return exito
+
+    def expansion_del_arbol(self) -> bool:
+
+        # Verificamos si se puede aplicar la regla de expansión del árbol
+        if self.estado_actual.b.tope in self.no_terminales:
+
+            # Las pilas son persistentes: cada operación devuelve una pila nueva que comparte
+            # el resto con la del estado actual (no hace falta copiarlas)
+            pila_b = self.estado_actual.b
+            token = pila_b.tope
 
             # Obtenemos las expansiones posibles de la gramática para el no terminal actual
-            alternativas_gramatica = self.gramatica.obtener_expansiones(lista_b[0])
+            alternativas_gramatica = self.expansiones[token]
 
-            token = lista_b.pop(0)
-            lista_a.append(token)  # Movemos el no terminal analizado a la lista A
-            lista_a_copy.append(token)
+            pila_a = self.estado_actual.a.apilar(token)  # Movemos el no terminal analizado a la lista A
+            pila_a_copy = self.estado_actual.a_copy.apilar(token)
 
             # Insertamos la primera alternativa (índice 0) en B
-            lista_b = alternativas_gramatica[0] + lista_b
+            pila_b = pila_b.resto.anteponer(alternativas_gramatica[0])
 
             # Registramos que estamos usando la alternativa 0 de este no terminal
-            lista_alternativas.append(0)
+            pila_alternativas = self.estado_actual.alternativas.apilar(0)
 
             # Creamos el nuevo estado y lo agregamos a la pila de estados
-            nuevo_estado = Estado("n", self.contador_global,"1", lista_a, lista_b,lista_a_copy, lista_alternativas)
-            self.lista_estados.append(nuevo_estado)
+            nuevo_estado = Estado("n", self.contador_global,"1", pila_a, pila_b, pila_a_copy, pila_alternativas)
+            self.agregar_estado(nuevo_estado)
 
             return True
 
@@ -106,42 +363,44 @@ class AnalizadorSintactico:
 
     #Aqui se aplica la regla 2 y 4
     def concordancia_de_un_simbolo(self) -> bool:
-        if self.estado_actual.s != "n" or self.estado_actual.i >= len(self.tokens):
+        if self.estado_actual.s != "n":
+            return False
+
+        if self.estado_actual.i >= len(self.tokens):
+            # Se acabó la entrada con un terminal pendiente en B: no concordancia (regla 4).
+            # Si solo queda '#' aplica la terminación.
+            b = self.estado_actual.b
+            if len(b) == 1 and b.tope == '#':
+                return False
+            self.agregar_estado(
+                Estado("r", self.contador_global, "4", self.estado_actual.a, b, self.estado_actual.a_copy,
+                       self.estado_actual.alternativas)
+            )
             return False
 
         token_de_la_lista = self.tokens[self.estado_actual.i]
-        token_de_la_pila = self.estado_actual.b[0]
+        token_de_la_pila = self.estado_actual.b.tope
 
         def aplicar_regla_concordancia():
-            lista_a = self.estado_actual.a.copy()
-            lista_a_copy = self.estado_actual.a_copy.copy()
-            lista_b = self.estado_actual.b.copy()
-
-            terminal = lista_b.pop(0)
-            lista_a.append(terminal)
-            lista_a_copy.append(self.tokens[self.estado_actual.i])
+            pila_a = self.estado_actual.a.apilar(token_de_la_pila)
+            pila_a_copy = self.estado_actual.a_copy.apilar(token_de_la_lista)
+            pila_b = self.estado_actual.b.resto
 
             self.contador_global += 1
-            self.lista_estados.append(
-                Estado("n", self.contador_global, "2", lista_a, lista_b, lista_a_copy, self.estado_actual.alternativas)
+            self.indice_mas_lejano = max(self.indice_mas_lejano, self.contador_global)
+            self.agregar_estado(
+                Estado("n", self.contador_global, "2", pila_a, pila_b, pila_a_copy, self.estado_actual.alternativas)
             )
 
         def aplicar_regla_no_concordancia():
-            self.lista_estados.append(
+            self.agregar_estado(
                 Estado("r", self.contador_global, "4", self.estado_actual.a, self.estado_actual.b, self.estado_actual.a_copy,
                        self.estado_actual.alternativas)
             )
 
-        # Caso terminal regex
-        if Tokenizador.es_regex_valida(token_de_la_pila) and \
-                Tokenizador.cumple_patron(token_de_la_lista, token_de_la_pila) and \
-                self.gramatica.es_terminal(token_de_la_pila):
-
-            aplicar_regla_concordancia()
-            return True
-
-        # Caso terminal literal
-        if self.gramatica.es_terminal(token_de_la_pila) and token_de_la_lista == token_de_la_pila:
+        # Terminal (regex o literal) que acepta el token: el bit del terminal está en la máscara del token
+        bit = self.bits_terminales.get(token_de_la_pila)
+        if bit is not None and self.mascaras[self.estado_actual.i] & bit:
             aplicar_regla_concordancia()
             return True
 
@@ -150,8 +409,8 @@ class AnalizadorSintactico:
         return False
 
     def terminacion_con_exito(self) -> None:
-        if self.estado_actual.s == "n" and self.estado_actual.b == ['#']:
-            self.lista_estados.append(
+        if self.estado_actual.s == "n" and len(self.estado_actual.b) == 1 and self.estado_actual.b.tope == '#':
+            self.agregar_estado(
                 Estado("t", self.contador_global, "3", self.estado_actual.a, self.estado_actual.b,self.estado_actual.a_copy, self.estado_actual.alternativas)
             )
             return True
@@ -161,20 +420,17 @@ class AnalizadorSintactico:
         if self.estado_actual.s != "r":
             return False
 
-        if not self.estado_actual.a or self.gramatica.es_no_terminal(self.estado_actual.a[-1]):
+        if not self.estado_actual.a or self.estado_actual.a.tope in self.no_terminales:
             return False
 
-        pila_a = self.estado_actual.a.copy()
-        pila_a_copy = self.estado_actual.a_copy.copy()
-        pila_b = self.estado_actual.b.copy()
-
-        token = pila_a.pop()
-        pila_a_copy.pop()
-        pila_b.insert(0, token)
+        token = self.estado_actual.a.tope
+        pila_a = self.estado_actual.a.resto
+        pila_a_copy = self.estado_actual.a_copy.resto
+        pila_b = self.estado_actual.b.apilar(token)
 
         self.contador_global -= 1
 
-        self.lista_estados.append(
+        self.agregar_estado(
             Estado("r", self.contador_global, "5", pila_a, pila_b,pila_a_copy, self.estado_actual.alternativas)
         )
         return True
@@ -187,35 +443,30 @@ class AnalizadorSintactico:
             return False
 
         # Revisar si es un no terminal
-        simbolo_actual = self.estado_actual.a[-1]
-        if not self.gramatica.es_no_terminal(simbolo_actual):
+        simbolo_actual = self.estado_actual.a.tope
+        if simbolo_actual not in self.no_terminales:
             return False
 
         # Producción actual y todas las alternativas del no terminal
-        produccion_actual = self.gramatica.obtener_expansiones(simbolo_actual)[self.estado_actual.alternativas[-1]]
-        todas_producciones = self.gramatica.obtener_expansiones(simbolo_actual)
-
-        # Copia de índice de alternativas
-        indice_alternativas = self.estado_actual.alternativas.copy()
+        indice_actual = self.estado_actual.alternativas.tope
+        todas_producciones = self.expansiones[simbolo_actual]
+        produccion_actual = todas_producciones[indice_actual]
 
         # Verificar si hay más alternativas
-        if indice_alternativas[-1] >= len(todas_producciones) - 1:
+        if indice_actual >= len(todas_producciones) - 1:
             self.sin_alternativas = True # No hay más alternativas para este no terminal
             return False
-        else:
-            indice_alternativas[-1] += 1 #Aumentar el índice de alternativas para pasar a la siguiente alternativa
 
-        # Eliminar tokens viejos de la pila B
-        lista_b = self.estado_actual.b.copy()
-        for _ in range(len(produccion_actual)):
-            lista_b.pop(0)
+        # Aumentar el índice de alternativas para pasar a la siguiente alternativa
+        pila_alternativas = self.estado_actual.alternativas.resto.apilar(indice_actual + 1)
 
-        # Agregar la nueva producción
-        lista_b = todas_producciones[indice_alternativas[-1]] + lista_b
+        # Eliminar tokens viejos de la pila B y agregar la nueva producción
+        pila_b = self.estado_actual.b.soltar(len(produccion_actual))
+        pila_b = pila_b.anteponer(todas_producciones[indice_actual + 1])
 
         # Nuevo estado
-        self.lista_estados.append(
-            Estado("n", self.contador_global, "6a", self.estado_actual.a, lista_b,self.estado_actual.a_copy, indice_alternativas)
+        self.agregar_estado(
+            Estado("n", self.contador_global, "6a", self.estado_actual.a, pila_b,self.estado_actual.a_copy, pila_alternativas)
         )
         return True
 
@@ -227,19 +478,25 @@ class AnalizadorSintactico:
         if not self.estado_actual.a:
             return False
 
-        no_terminal = self.estado_actual.a[-1]
+        no_terminal = self.estado_actual.a.tope
 
-        # Verificamos que sea un no terminal y que sea el token de inicio "programa"
-        if self.gramatica.es_no_terminal(no_terminal) and no_terminal == "programa":
+        # Verificamos que sea un no terminal y que sea el de inicio ("programa", o la instrucción
+        # que se está analizando con recuperación de errores)
+        if no_terminal in self.no_terminales and no_terminal == self.inicial:
             # Cambiamos el estado a error 'e'
-            self.lista_estados.append(
-                Estado("e", self.estado_actual.i,"6b", self.estado_actual.a.copy(), self.estado_actual.b.copy(), self.estado_actual.a_copy.copy(),
+            self.agregar_estado(
+                Estado("e", self.estado_actual.i,"6b", self.estado_actual.a, self.estado_actual.b, self.estado_actual.a_copy,
                        self.estado_actual.alternativas)
             )
             return True
 
         return False
 
+    def detener(self, limite: str) -> bool:
+        self.estadisticas.detenido_por = limite
+        print(f"ERROR: Análisis sintáctico detenido por límite de {limite}.")
+        return False
+
     def siguiente_alternativa_c(self) -> bool:
         if self.estado_actual.s != "r":
             return False
@@ -250,77 +507,121 @@ class AnalizadorSintactico:
         if not self.estado_actual.a:
             return False
 
-        pila_a = self.estado_actual.a.copy()
-        pila_a_copy = self.estado_actual.a_copy.copy()
-        pila_a_copy.pop()
-        no_terminal = pila_a.pop()
+        no_terminal = self.estado_actual.a.tope
+        pila_a = self.estado_actual.a.resto
+        pila_a_copy = self.estado_actual.a_copy.resto
 
         # Obtener todas las producciones del no terminal
-        todas_producciones = self.gramatica.obtener_expansiones(no_terminal)
+        todas_producciones = self.expansiones[no_terminal]
 
         # Obtener la alternativa que fue usada (última de lista alternativas)
-        lista_alternativas = self.estado_actual.alternativas.copy()
-        if lista_alternativas:
-            indice_actual = lista_alternativas[-1]
+        pila_alternativas = self.estado_actual.alternativas
+        if pila_alternativas:
+            indice_actual = pila_alternativas.tope
         else:
             # Por si no hay alternativa guardada, asumimos la 0 (o regresar False)
             indice_actual = 0
 
         produccion_usada = todas_producciones[indice_actual]
 
-        pila_b = self.estado_actual.b.copy()
-
         # ELIMINAR la producción usada completa de la pila B (tokens de la producción previa)
-        for _ in range(len(produccion_usada)):
-            if pila_b and pila_b[0] == produccion_usada[0]:
-                pila_b.pop(0)
-            else:
-                # Si el token no coincide, solo eliminamos de todos modos para evitar bucle
-                # (puedes ajustar lógica para ser más exacto)
-                pila_b.pop(0)
-
-        # Ahora insertamos el no terminal (sin alternativas) al inicio de pila B
-        pila_b.insert(0, no_terminal)
+        # y en su lugar insertamos el no terminal (sin alternativas) al inicio de pila B
+        pila_b = self.estado_actual.b.soltar(len(produccion_usada)).apilar(no_terminal)
 
         # Removemos la última alternativa usada de la lista de alternativas
-        if lista_alternativas:
-            lista_alternativas.pop()
+        if pila_alternativas:
+            pila_alternativas = pila_alternativas.resto
 
         # Agregamos nuevo estado con bandera sin_alternativas False para poder seguir reglas
         self.sin_alternativas = False
 
-        self.lista_estados.append(
-            Estado("r", self.estado_actual.i, "6c", pila_a, pila_b,pila_a_copy, lista_alternativas)
+        self.agregar_estado(
+            Estado("r", self.estado_actual.i, "6c", pila_a, pila_b,pila_a_copy, pila_alternativas)
         )
 
         return True
 
+    #================== ARBOL ===================
+    def obtener_arbol(self):
+        """
+        Árbol de sintaxis concreta (ArbolSintactico) del último análisis exitoso, armado a
+        partir de la derivación que aceptó el programa.
+
+        Returns:
+            ArbolSintactico | None: None si el análisis falló o si el modo no arma árbol
+            ("ll1" usa la gramática factorizada; "paralelo" y "earley" solo reconocen).
+        """
+        if self._packrat is not None:
+            packrat = self._packrat
+            return ArbolSintactico.construir(
+                self.tokens, packrat.producciones, packrat.producciones, packrat.inicial,
+                lambda no_terminal, indice: packrat.memo[(no_terminal, indice)][1]
+            )
+
+        if self.modo != "retroceso" or not self._derivaciones or self.errores:
+            return None
+
+        decisiones = []
+        if self.recuperar_errores:
+            # Cada instrucción se analizó por separado: se arma la derivación del programa
+            # completo como si lista_instrucciones las hubiera ido expandiendo
+            listas = self.expansiones["lista_instrucciones"]
+            una, varias = listas.index(("instruccion",)), listas.index(("instruccion", "lista_instrucciones"))
+            decisiones.append(("programa", 0))
+            for k, (a, alternativas) in enumerate(self._derivaciones):
+                decisiones.append(("lista_instrucciones", una if k == len(self._derivaciones) - 1 else varias))
+                decisiones.extend(self._decisiones(a, alternativas))
+        else:
+            decisiones.extend(self._decisiones(*self._derivaciones[0]))
+
+        siguientes = iter(decisiones)
+        return ArbolSintactico.construir(
+            self.tokens, self.expansiones, self.no_terminales, decisiones[0][0],
+            lambda no_terminal, indice: next(siguientes)[1]
+        )
+
+    def _decisiones(self, a, alternativas) -> list:
+        # (no_terminal, alternativa) en el orden en que se expandieron: los no terminales de A
+        # y la pila de alternativas van a la par, del fondo al tope
+        no_terminales = [simbolo for simbolo in a.como_lista() if simbolo in self.no_terminales]
+        return list(zip(no_terminales, alternativas.como_lista()))
+
+    def posicion_error(self):
+        """
+        Ubica el error de un análisis fallido en el token más lejano al que se llegó.
+
+        Returns:
+            tuple: (indice, token, linea, columna). token es None si el error está al final de la
+            entrada. linea y columna salen de tokens.posicion() (por ejemplo, una VistaPlana de un
+            TokenStream); con una lista simple de tokens quedan en None.
+        """
+        indice = self.indice_mas_lejano
+        token = self.tokens[indice] if indice < len(self.tokens) else None
+
+        posicion = getattr(self.tokens, "posicion", None)
+        linea, columna = posicion(indice) if posicion else (None, None)
+        return indice, token, linea, columna
+
     def mostrar_estado_actual(self) -> None:
         if self.estado_actual:
             print(self.estado_actual)
 
-    def exportar_estados_tabla(self) -> list:
+    def exportar_estados_tabla(self):
         """
         Devuelve la información de todos los estados en formato de lista de listas:
         [S, I, REGLA, lista_A, lista_B]
+
+        Es la TrazaSintactica misma (cada fila se reconstruye al pedirla), o [] si el análisis
+        se hizo sin registrar estados.
         """
-        tabla = []
-        for estado in self.lista_estados:
-            fila = [
-                estado.s,
-                estado.i,
-                estado.r,
-                estado.a_copy.copy(),
-                estado.b.copy()
-            ]
-            tabla.append(fila)
-
-        return tabla
+        if self.traza is None:
+            return []
+        return self.traza
 
     def mostrar_estados(self) -> None:
         print("Lista de tokens:")
         print(self.tokens)
 
         print("Estados generados:")
-        for estado in self.lista_estados:
-            print(estado)
\ No newline at end of file
+        for fila in self.exportar_estados_tabla():
+            print(fila)
@@ -1,26 +1,91 @@
+import codecs
+import os
 import re
-import difflib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.models.IndiceTokens import IndiceTokens
+from src.models.SourceFile import SourceFile
+from src.util.EspecificacionLexica import (
+    PALABRAS_RESERVADAS, CONSTANTES_ESPECIALES, OPERADORES_ARITMETICOS, DELIMITADORES, REGLAS_LEXICAS,
+    REGLAS_DE_PALABRA
+)
+from src.util.Fragmentador import Fragmentador
+from src.util.GeneradorLexico import GeneradorLexico
+from src.util.IndiceSugerencias import IndiceSugerencias
+
+# NumPy es opcional: solo lo necesita el modo "numpy"
+try:
+    import numpy as np
+
+    NUMPY_DISPONIBLE = True
+except ImportError:
+    np = None
+    NUMPY_DISPONIBLE = False
 
 
 class LexicalAnalizerForMy:
 
-    _instance = None
+    # Regex maestra del modo de un solo paso, armada con REGLAS_LEXICAS (las mismas reglas y en
+    # el mismo orden que el escáner "dfa"): cada regla es un grupo con nombre y match.lastgroup
+    # indica directamente de qué tipo de token se trata. Las reglas de REGLAS_DE_PALABRA llevan
+    # el borde de palabra que en el autómata da la coincidencia más larga.
+    _PATRON_MAESTRO = re.compile("|".join(
+        f"(?P<{nombre}>(?:{patron}){'(?![a-zA-Z0-9_])' if nombre in REGLAS_DE_PALABRA else ''})"
+        for nombre, patron, _tipo, _categoria in REGLAS_LEXICAS
+    ))
+
+    # Grupo de la regex maestra -> tipo del token en tokens_clasificados (las reglas con tipo
+    # None tienen tratamiento especial en el escáner)
+    _TIPO_POR_GRUPO = {nombre: tipo for nombre, _patron, tipo, _categoria in REGLAS_LEXICAS if tipo is not None}
+
+    # Grupo de error -> categoría que devolvería categorizar_error_lexico para ese token
+    _CATEGORIA_POR_GRUPO = {
+        nombre: categoria for nombre, _patron, _tipo, categoria in REGLAS_LEXICAS if categoria is not None
+    }
+
+    # Escáner de tabla generado desde REGLAS_LEXICAS (solo lectura, se comparte entre instancias)
+    _escaner_dfa = None
+
+    # Índice de sugerencias sobre reservadas, constantes y operadores (se arma una sola vez)
+    _indice_sugerencias = None
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            # Si no existe, crea la instancia normalmente
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    # Clases de byte del modo numpy
+    (_C_OTRO, _C_PALABRA, _C_PUNTO, _C_OPERADOR, _C_DELIMITADOR,
+     _C_ESPACIO, _C_SALTO, _C_COMILLA, _C_ALMOHADILLA) = range(9)
+
+    # Tabla de 256 entradas byte -> clase (se arma la primera vez que se usa el modo numpy)
+    _tabla_clases = None
+
+    def __init__(self, codigo, modo: str = "un_paso", max_errores: int = None):
+        """
+        :param codigo: Código fuente a analizar (str o SourceFile).
+        :param modo: "un_paso" usa la regex maestra (una sola pasada sobre el código);
+                     "dfa" usa el escáner de tabla generado desde la especificación léxica;
+                     "multipaso" usa el pipeline original de destructurar/limpiar/clasificar;
+                     "numpy" clasifica todos los bytes a la vez con NumPy (opcional, ver escanear_numpy).
+        :param max_errores: Si se indica, el análisis se detiene al juntar esa cantidad de errores.
+        """
+        if modo not in ("un_paso", "dfa", "multipaso", "numpy"):
+            raise ValueError(f"Modo de análisis léxico desconocido: '{modo}'")
+        if modo == "numpy" and not NUMPY_DISPONIBLE:
+            raise ValueError("El modo 'numpy' necesita NumPy instalado (pip install numpy)")
+
+        if max_errores is not None and max_errores < 1:
+            raise ValueError("max_errores debe ser al menos 1")
+
+        if isinstance(codigo, SourceFile):
+            self.fuente = codigo
+            codigo = codigo.texto
+        else:
+            self.fuente = None      # <-- Se arma en obtener_fuente() si alguien la pide
 
-    def __init__(self, codigo: str):
         self.codigo = codigo
-        self.PALABRAS_RESERVADAS = [
-            "fin", "inicio", "palabra", "entero", "decimal", "quiza",
-            "ocultar", "borrar", "AND", "OR", "NOT"
-        ]
-        self.CONSTANTES_ESPECIALES = ["verdadero", "falso"]
-        self.OPERADORES_ARITMETICOS = ["=", "+", "-", "*", "/"]
-        self.DELIMITADORES = [",", ";", "(", ")", '"', ".", "#"]
+        self.modo = modo
+        self.max_errores = max_errores
+        self.PALABRAS_RESERVADAS = list(PALABRAS_RESERVADAS)
+        self.CONSTANTES_ESPECIALES = list(CONSTANTES_ESPECIALES)
+        self.OPERADORES_ARITMETICOS = list(OPERADORES_ARITMETICOS)
+        self.DELIMITADORES = list(DELIMITADORES)
 
 
         
@@ -30,24 +95,38 @@ class LexicalAnalizerForMy:
         self.regex_numero = re.compile(r'\d+\.\d+|\d+')
         self.regex_identificador = re.compile(r'[a-z][a-z0-9_]*')
 
-        # Lista de errores léxicos
+        # Lista de errores léxicos y tokens clasificados, propios de cada instancia
         self.errores_lexicos = []  
+        self.tokens_clasificados = []
+        self.indice_tokens = IndiceTokens()     # <-- Apariciones de cada (token, tipo), se llena al validar
+
+    def obtener_fuente(self) -> SourceFile:
+        """SourceFile del código analizado (índice de líneas y hash compartidos con las otras fases)."""
+        if self.fuente is None:
+            self.fuente = SourceFile(self.codigo)
+        return self.fuente
 
     #===================== ZONA DE ANALISIS =========================
     def analizar_codigo(self):
 
-        # Primero: limpiar el código de espacios y saltos de línea innecesarios
-        lista_tokens = self.destructurar_codigo_en_tokens(self.codigo)
-        lista_tokens = self.limpiar_comentarios_linea(lista_tokens)
-        lista_tokens = self.limpiar_cadenas(lista_tokens)
+        if self.modo == "un_paso":
+            # Tokeniza, descarta comentarios/cadenas y clasifica en un solo recorrido
+            tokens = self.escanear_un_paso(self.codigo)
+        elif self.modo == "dfa":
+            tokens = self.escanear_dfa(self.codigo)
+        elif self.modo == "numpy":
+            tokens = self.escanear_numpy(self.codigo)
+        else:
+            # Primero: limpiar el código de espacios y saltos de línea innecesarios
+            lista_tokens = self.destructurar_codigo_en_tokens(self.codigo)
+            lista_tokens = self.limpiar_comentarios_linea(lista_tokens)
+            lista_tokens = self.limpiar_cadenas(lista_tokens)
 
-        # Luego: analizar los tokens aqui ya cambia la estructura a una tupla (linea, token, tipo) despues de la clasificación
-        self.analizar_lineas_de_tokens(lista_tokens)                # <-- Analiza los tokens y los clasifica
-        self.verificar_inicio_fin(self.tokens_clasificados)         # <-- Verifica que el código comience con 'fin' y termine con 'inicio'
-        self.buscar_operadores_invalidos(self.tokens_clasificados)  # <-- Busca secuencias de operadores inválidos como '++', '--', etc.
-        self.buscar_delimitadores_invalidos(self.tokens_clasificados)  # <-- Busca secuencias de delimitadores inválidos como ';;', '()', etc.
-        self.analizar_tokens_invalidos(self.tokens_clasificados)    # <-- Analiza los tokens inválidos y genera errores léxicos
+            # Luego: analizar los tokens aqui ya cambia la estructura a una tupla (linea, token, tipo) despues de la clasificación
+            self.analizar_lineas_de_tokens(lista_tokens)                # <-- Analiza los tokens y los clasifica
+            tokens = ((linea, token, tipo, None) for linea, token, tipo in self.tokens_clasificados)
 
+        self.validar_tokens(tokens)     # <-- inicio/fin, operadores, delimitadores e inválidos en una sola pasada
 
 
         if self.errores_lexicos:
@@ -55,7 +134,452 @@ class LexicalAnalizerForMy:
         else:
             return False                            # <-- Retorna los tokens clasificados si no hay errores léxicos
 
+    @classmethod
+    def obtener_escaner_dfa(cls):
+        """
+        Devuelve el escáner de tabla de la especificación léxica. Las tablas se leen de la caché
+        en disco y solo se regeneran si cambió REGLAS_LEXICAS.
+        """
+        if cls._escaner_dfa is None:
+            cls._escaner_dfa = GeneradorLexico(REGLAS_LEXICAS).generar_escaner()
+        return cls._escaner_dfa
+
+    def escanear_dfa(self, codigo, linea: int = 1):
+        """
+        Igual que escanear_un_paso, pero con el autómata generado: el tipo de token y la
+        categoría de error salen del estado de aceptación, sin listas ni regex adicionales.
+        """
+        escaner = self.obtener_escaner_dfa()
+        reglas = escaner.reglas
+
+        for indice_regla, inicio, fin in escaner.escanear(codigo):
+            nombre, _patron, tipo, categoria = reglas[indice_regla]
+
+            if nombre == "NUEVA_LINEA":
+                linea += 1
+            elif nombre == "COMENTARIO":
+                yield linea, "#", "DELIMITADOR", None
+            elif nombre == "CADENA":
+                yield linea, '"', "DELIMITADOR", None
+                yield linea, '"', "DELIMITADOR", None
+            elif nombre == "CADENA_ABIERTA":
+                yield linea, '"', "DELIMITADOR", None
+            else:
+                yield linea, codigo[inicio:fin], tipo, categoria
+
+    #==================ANALISIS POR LOTES ===================
+    @classmethod
+    def analizar_lote(cls, fuentes, max_workers: int = None, usar_procesos: bool = False, modo: str = "un_paso",
+                      max_errores: int = None):
+        """
+        Analiza muchos códigos fuente en paralelo y devuelve los resultados en el mismo orden.
+
+        Cada fuente se analiza con su propia instancia, así que no comparten estado entre sí.
+
+        Args:
+            fuentes: Iterable de códigos (str) o rutas de archivo (pathlib.Path / os.PathLike).
+            max_workers (int): Número de hilos o procesos; None deja el valor por defecto del executor.
+            usar_procesos (bool): True usa un ProcessPoolExecutor (aprovecha todos los núcleos),
+                                  False un ThreadPoolExecutor.
+            modo (str): Modo de análisis léxico de cada instancia.
+            max_errores (int): Tope de errores de cada fuente (None = sin tope).
+
+        Returns:
+            list: Una tupla (tokens_clasificados, errores_lexicos) por fuente, en orden de entrada.
+        """
+        fuentes = [(fuente, modo, max_errores) for fuente in fuentes]
+        if not fuentes:
+            return []
+
+        if usar_procesos:
+            # Se agrupan varias fuentes por envío para no pagar un viaje entre procesos por archivo
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(fuentes) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(cls._analizar_fuente, fuentes, chunksize=chunksize))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(cls._analizar_fuente, fuentes))
+
+    @staticmethod
+    def _analizar_fuente(fuente_y_opciones):
+        fuente, modo, max_errores = fuente_y_opciones
+        if isinstance(fuente, os.PathLike):
+            with open(fuente, "r", encoding="utf-8") as archivo:
+                fuente = archivo.read()
+
+        analizador = LexicalAnalizerForMy(fuente, modo=modo, max_errores=max_errores)
+        analizador.analizar_codigo()
+        return analizador.tokens_clasificados, analizador.errores_lexicos
+
+    #==================ANALISIS DE UN ARCHIVO EN PARALELO ===================
+    @classmethod
+    def analizar_en_paralelo(cls, origen, max_workers: int = None, modo: str = "un_paso", max_errores: int = None,
+                             tam_minimo: int = Fragmentador.TAM_MINIMO):
+        """
+        Analiza un solo código grande repartiéndolo entre varios procesos.
+
+        El código se corta en fragmentos de tamaño parecido que terminan en un salto de línea
+        (ver Fragmentador); cada proceso escanea y valida su fragmento con los números de línea
+        globales y los resultados se unen en orden. La revisión de 'fin' e 'inicio' se hace
+        sobre el resultado unido.
+
+        Args:
+            origen: Código (str) o ruta del archivo (pathlib.Path / os.PathLike). Con una ruta,
+                    cada proceso lee directamente su rango de bytes.
+            max_workers (int): Número de procesos; None usa os.cpu_count().
+            modo (str): "un_paso", "dfa" o "numpy".
+            max_errores (int): Tope de errores sobre el total del código.
+            tam_minimo (int): Tamaño mínimo de un fragmento; un código más chico se analiza en
+                              el proceso actual.
+
+        Returns:
+            LexicalAnalizerForMy: Instancia con tokens_clasificados y errores_lexicos llenos,
+            igual que después de analizar_codigo().
+        """
+        if modo not in ("un_paso", "dfa", "numpy"):
+            raise ValueError(f"El análisis en paralelo no admite el modo '{modo}'")
+        if modo == "numpy" and not NUMPY_DISPONIBLE:
+            raise ValueError("El modo 'numpy' necesita NumPy instalado (pip install numpy)")
+
+        workers = max_workers or os.cpu_count() or 1
+        fragmentos = Fragmentador.dividir(origen, workers, tam_minimo)
+        tareas = [(fragmento, modo, max_errores) for fragmento in fragmentos]
+
+        if len(tareas) == 1:
+            resultados = [cls._analizar_fragmento(tareas[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                resultados = list(executor.map(cls._analizar_fragmento, tareas))
+
+        analizador = cls("", modo=modo, max_errores=max_errores)
+        recorridos = []
+        contados = 0            # <-- Errores que ya contó el recorrido del código completo
+        pendientes = 0          # <-- Errores de fragmentos anteriores que todavía no se revisaron contra el tope
+        for tokens, indice, recorrido in resultados:
+            corte = None
+            if max_errores is not None:
+                # Cada fragmento aplicó el tope por su cuenta: se busca el punto donde el recorrido
+                # del código completo llega al máximo y el fragmento se corta ahí
+                cortes = recorrido["cortes"]
+                if pendientes and recorrido["primer_control"] is not None:
+                    if not cortes or cortes[0][1] != recorrido["primer_control"][0]:
+                        cortes = [(0,) + recorrido["primer_control"]] + cortes
+                    cortes = [(cantidad + pendientes,) + tuple(resto) for cantidad, *resto in cortes]
+                    pendientes = 0
+                corte = next((c for c in cortes if contados + c[0] >= max_errores), None)
+                if corte is None:
+                    contados += cortes[-1][0] if cortes else 0
+                    pendientes += recorrido["pendientes"]
+                else:
+                    tokens, indice, recorrido = cls._recortar_fragmento(tokens, recorrido, corte)
+
+            analizador.tokens_clasificados.extend(tokens)
+            analizador.indice_tokens.extender(indice)
+            recorridos.append(recorrido)
+            if corte is not None:
+                break       # <-- Lo que sigue al error que llegó al máximo no se usa
+        analizador.errores_lexicos.extend(analizador.unir_recorridos(recorridos))
+        return analizador
+
+    @staticmethod
+    def _recortar_fragmento(tokens, recorrido, corte):
+        """Deja el fragmento como estaba en el punto de corte (una tupla de recorrido["cortes"])."""
+        _cantidad, hasta, operadores, delimitadores, invalidos, linea, primera_linea, ultima_linea = corte
+        tokens = tokens[:hasta]
+        indice = IndiceTokens()
+        indice.agregar_tokens(tokens)
+        recorrido = dict(
+            recorrido,
+            operadores=recorrido["operadores"][:operadores],
+            delimitadores=recorrido["delimitadores"][:delimitadores],
+            invalidos=recorrido["invalidos"][:invalidos],
+            primera_linea=primera_linea,
+            ultima_linea=ultima_linea,
+            detenido=True,
+            linea=linea,
+        )
+        return tokens, indice, recorrido
+
+    @staticmethod
+    def _analizar_fragmento(tarea):
+        fragmento, modo, max_errores = tarea
+        texto, linea = Fragmentador.leer(fragmento)
+
+        analizador = LexicalAnalizerForMy(texto, modo=modo, max_errores=max_errores)
+        if modo == "un_paso":
+            tokens = analizador.escanear_un_paso(texto, linea)
+        elif modo == "numpy":
+            tokens = analizador.escanear_numpy(texto, linea)
+        else:
+            tokens = analizador.escanear_dfa(texto, linea)
+        recorrido = analizador.recorrer_tokens(tokens)
+        return analizador.tokens_clasificados, analizador.indice_tokens, recorrido
+
+    #==================LECTURA EN STREAMING ===================
+    @classmethod
+    def iter_tokens(cls, origen, tam_bloque: int = 1 << 20):
+        """
+        Genera los tokens de un archivo sin cargarlo completo en memoria.
+
+        El archivo se lee en bloques de tam_bloque caracteres (o bytes) y solo se analiza hasta
+        el último salto de línea de cada bloque; el resto se pasa al siguiente. Como en Pitufos
+        ni los comentarios ni las cadenas cruzan un salto de línea, cortar ahí no cambia los
+        tokens. La memoria usada depende del tamaño del bloque y de la línea más larga, no del
+        tamaño del archivo.
+
+        Args:
+            origen: Ruta del archivo o un objeto archivo abierto (texto o binario en UTF-8).
+            tam_bloque (int): Cantidad de datos que se leen en cada lectura.
+
+        Yields:
+            tuple: (linea, columna, token, tipo), con línea y columna empezando en 1. Los tipos
+            son los mismos de tokens_clasificados.
+        """
+        if isinstance(origen, (str, os.PathLike)):
+            with open(origen, "r", encoding="utf-8") as archivo:
+                yield from cls._iter_tokens_archivo(archivo, tam_bloque)
+        else:
+            yield from cls._iter_tokens_archivo(origen, tam_bloque)
+
+    @classmethod
+    def _iter_tokens_archivo(cls, archivo, tam_bloque):
+        decodificador = None
+        resto = ""
+        linea = 1
+
+        while True:
+            datos = archivo.read(tam_bloque)
+            fin_archivo = not datos
+
+            if isinstance(datos, bytes):
+                if decodificador is None:
+                    decodificador = codecs.getincrementaldecoder("utf-8")()
+                datos = decodificador.decode(datos, final=fin_archivo)
+
+            texto = resto + datos
+            if fin_archivo:
+                completo, resto = texto, ""
+            else:
+                corte = texto.rfind("\n") + 1      # <-- Solo se analizan líneas completas
+                completo, resto = texto[:corte], texto[corte:]
+
+            if completo:
+                yield from cls._escanear_bloque(completo, linea)
+                linea += completo.count("\n")
+
+            if fin_archivo:
+                return
+
+    @classmethod
+    def _escanear_bloque(cls, texto, linea):
+        """
+        Aplica la regex maestra sobre un bloque de líneas completas que empieza en la línea dada.
+        Produce tuplas (linea, columna, token, tipo).
+        """
+        tipo_por_grupo = cls._TIPO_POR_GRUPO
+        inicio_linea = 0    # <-- Posición donde empieza la línea actual dentro del bloque
+
+        for match in cls._PATRON_MAESTRO.finditer(texto):
+            grupo = match.lastgroup
+            columna = match.start() - inicio_linea + 1
+
+            if grupo == "NUEVA_LINEA":
+                linea += 1
+                inicio_linea = match.end()
+            elif grupo == "COMENTARIO":
+                yield linea, columna, "#", "DELIMITADOR"
+            elif grupo == "CADENA":
+                yield linea, columna, '"', "DELIMITADOR"
+                yield linea, match.end() - inicio_linea, '"', "DELIMITADOR"
+            elif grupo == "CADENA_ABIERTA":
+                yield linea, columna, '"', "DELIMITADOR"
+            else:
+                yield linea, columna, match.group(), tipo_por_grupo[grupo]
+
     #==================PROCESAMIENTO DE TOKENS Y LISTAS===================
+    def escanear_un_paso(self, codigo, linea: int = 1):
+        """
+        Recorre el código una sola vez con la regex maestra y genera los mismos tokens que el
+        pipeline de varias pasadas, como tuplas (linea, token, tipo, categoria).
+
+        Los comentarios y cadenas se resuelven en el mismo recorrido: de un comentario solo se
+        conserva el '#' y de una cadena solo sus comillas, igual que limpiar_comentarios_linea
+        y limpiar_cadenas. La categoría es el mensaje de error de los tokens INVALIDO (None en
+        los demás). Como es un generador, el código se deja de recorrer apenas validar_tokens
+        deja de pedir tokens.
+
+        :param linea: Número de la primera línea del código (para fragmentos de un archivo).
+        """
+        tipo_por_grupo = self._TIPO_POR_GRUPO
+        categoria_por_grupo = self._CATEGORIA_POR_GRUPO
+
+        for match in self._PATRON_MAESTRO.finditer(codigo):
+            grupo = match.lastgroup
+
+            if grupo == "NUEVA_LINEA":
+                linea += 1
+            elif grupo == "COMENTARIO":
+                yield linea, "#", "DELIMITADOR", None
+            elif grupo == "CADENA":
+                yield linea, '"', "DELIMITADOR", None
+                yield linea, '"', "DELIMITADOR", None
+            elif grupo == "CADENA_ABIERTA":
+                yield linea, '"', "DELIMITADOR", None
+            else:
+                yield linea, match.group(), tipo_por_grupo[grupo], categoria_por_grupo.get(grupo)
+
+    @classmethod
+    def obtener_tabla_clases(cls):
+        """
+        Tabla de 256 entradas (np.uint8) con la clase de cada byte ASCII para escanear_numpy:
+        letras, dígitos y '_' son _C_PALABRA; el '.' va aparte porque puede ser parte de un
+        número o un delimitador suelto.
+        """
+        if cls._tabla_clases is None:
+            # Los caracteres que la regla DELIMITADOR de REGLAS_LEXICAS acepta
+            regla = re.compile(next(patron for nombre, patron, _t, _c in REGLAS_LEXICAS if nombre == "DELIMITADOR"))
+            delimitadores = {chr(byte) for byte in range(128) if regla.fullmatch(chr(byte))}
+            tabla = np.zeros(256, dtype=np.uint8)       # <-- _C_OTRO: caracteres que no forman token
+            for byte in range(128):
+                caracter = chr(byte)
+                if caracter == "\n":
+                    tabla[byte] = cls._C_SALTO
+                elif caracter == '"':
+                    tabla[byte] = cls._C_COMILLA
+                elif caracter == "#":
+                    tabla[byte] = cls._C_ALMOHADILLA
+                elif caracter == ".":
+                    tabla[byte] = cls._C_PUNTO
+                elif caracter.isascii() and (caracter.isalnum() or caracter == "_"):
+                    tabla[byte] = cls._C_PALABRA
+                elif caracter in OPERADORES_ARITMETICOS:
+                    tabla[byte] = cls._C_OPERADOR
+                elif caracter in delimitadores:
+                    tabla[byte] = cls._C_DELIMITADOR
+                elif caracter.isspace():
+                    tabla[byte] = cls._C_ESPACIO
+            cls._tabla_clases = tabla
+        return cls._tabla_clases
+
+    def escanear_numpy(self, codigo, linea: int = 1):
+        """
+        Mismos tokens que escanear_un_paso, pero buscando los límites de los tokens con NumPy.
+
+        Cada byte se clasifica de una vez con obtener_tabla_clases y los inicios y finales de
+        los tramos de letras/dígitos/puntos salen de comparar cada clase con la del vecino. Solo
+        se recorren uno por uno los '#' y '"' (comentarios y cadenas dependen de lo que vino
+        antes) y solo los tramos raros, como '3.14hola' u '8.', pasan por la regex maestra; los
+        demás se clasifican con una búsqueda en diccionario, y el resultado de cada tramo
+        distinto se recuerda.
+
+        Un código con caracteres que no son ASCII se analiza con escanear_un_paso.
+        """
+        if not codigo:
+            return
+        if not codigo.isascii():
+            yield from self.escanear_un_paso(codigo, linea)
+            return
+
+        clases = self.obtener_tabla_clases()[np.frombuffer(codigo.encode("ascii"), dtype=np.uint8)]
+        n = len(clases)
+
+        # 1. Comentarios y cadenas: se marcan para que el resto del análisis los ignore
+        enmascarado = np.zeros(n, dtype=bool)
+        especiales = {}         # <-- posición -> comillas/'#' que se emiten ahí
+        cursor = 0
+        posiciones = np.flatnonzero((clases == self._C_COMILLA) | (clases == self._C_ALMOHADILLA))
+        for p in posiciones.tolist():
+            if p < cursor:
+                continue        # <-- Dentro de un comentario o cadena anterior
+            fin_linea = codigo.find("\n", p)
+            if fin_linea == -1:
+                fin_linea = n
+
+            if codigo[p] == "#":
+                especiales[p] = ("#",)
+                fin = fin_linea
+            else:
+                cierre = codigo.find('"', p + 1, fin_linea)
+                almohadilla = codigo.find("#", p + 1, fin_linea)
+                if cierre != -1 and (almohadilla == -1 or cierre < almohadilla):
+                    especiales[p] = ('"', '"')
+                    fin = cierre + 1
+                else:
+                    especiales[p] = ('"',)      # <-- Cadena sin cierre: se ignora el resto de la línea
+                    fin = fin_linea
+
+            enmascarado[p:fin] = True
+            cursor = fin
+
+        # 2. Límites de tokens comparando cada clase con la del vecino
+        libre = ~enmascarado
+        en_tramo = ((clases == self._C_PALABRA) | (clases == self._C_PUNTO)) & libre
+        anterior = np.empty(n, dtype=bool)
+        anterior[0] = False
+        anterior[1:] = en_tramo[:-1]
+        siguiente = np.empty(n, dtype=bool)
+        siguiente[-1] = False
+        siguiente[:-1] = en_tramo[1:]
+
+        inicio_tramo = en_tramo & ~anterior
+        fines_tramo = (np.flatnonzero(en_tramo & ~siguiente) + 1).tolist()
+        sueltos = ((clases == self._C_OPERADOR) | (clases == self._C_DELIMITADOR) | (clases == self._C_ESPACIO)) & libre
+
+        inicio_token = inicio_tramo | sueltos
+        if especiales:
+            inicio_token[np.fromiter(especiales, dtype=np.intp, count=len(especiales))] = True
+        inicios = np.flatnonzero(inicio_token)
+
+        saltos = np.flatnonzero(clases == self._C_SALTO)
+        lineas = np.searchsorted(saltos, inicios) + linea
+
+        # 3. Recorrido de los tokens ya delimitados
+        tramos = {}     # <-- Tramo -> sus tokens; los identificadores se repiten mucho
+        fin_tramo = iter(fines_tramo)
+        C_PALABRA, C_PUNTO, C_ESPACIO, C_OPERADOR = self._C_PALABRA, self._C_PUNTO, self._C_ESPACIO, self._C_OPERADOR
+        C_DELIMITADOR = self._C_DELIMITADOR
+
+        for p, linea_token, clase in zip(inicios.tolist(), lineas.tolist(), clases[inicios].tolist()):
+            if clase == C_PALABRA or clase == C_PUNTO:
+                texto = codigo[p:next(fin_tramo)]
+                partes = tramos.get(texto)
+                if partes is None:
+                    partes = tramos[texto] = self._partir_tramo(texto)
+                for token, tipo, categoria in partes:
+                    yield linea_token, token, tipo, categoria
+            elif clase == C_ESPACIO:
+                yield linea_token, codigo[p], "ESPACIO", None
+            elif clase == C_OPERADOR:
+                yield linea_token, codigo[p], "OPERADOR", None
+            elif clase == C_DELIMITADOR:
+                yield linea_token, codigo[p], "DELIMITADOR", None
+            else:
+                for simbolo in especiales[p]:
+                    yield linea_token, simbolo, "DELIMITADOR", None
+
+    def _partir_tramo(self, texto):
+        """Tokens (token, tipo, categoria) de un tramo de letras, dígitos, '_' y puntos."""
+        if texto.isdigit():
+            return ((texto, "NUMERO", None),)
+
+        if "." not in texto and not texto[0].isdigit():
+            # Una sola palabra: el tramo termina donde terminaría la regex
+            if texto in PALABRAS_RESERVADAS:
+                return ((texto, "RESERVADA", None),)
+            if texto in CONSTANTES_ESPECIALES:
+                return ((texto, "CONSTANTE", None),)
+            if self.regex_identificador.fullmatch(texto):
+                return ((texto, "IDENTIFICADOR", None),)
+            grupo = "ERR_CARACTER" if len(texto) == 1 else "ERR_PALABRA"
+            return ((texto, "INVALIDO", self._CATEGORIA_POR_GRUPO[grupo]),)
+
+        # Números con punto o letras: casos ambiguos, se resuelven con la regex maestra
+        return tuple(
+            (match.group(), self._TIPO_POR_GRUPO[match.lastgroup], self._CATEGORIA_POR_GRUPO.get(match.lastgroup))
+            for match in self._PATRON_MAESTRO.finditer(texto)
+        )
+
     def destructurar_codigo_en_tokens(self, codigo):
         lineas = codigo.split('\n')
         resultado = []
@@ -152,130 +676,274 @@ class LexicalAnalizerForMy:
             resultado.append(nueva_linea)
         return resultado
 
-    def analizar_tokens_invalidos(self, tokens_clasificados):
+    def error_token_invalido(self, linea, token, categoria):
         """
-        Recorre los tokens, detecta los 'INVALIDO', categoriza el error
-        y lo agrega a self.errores_lexicos.
+        Arma el error de un token 'INVALIDO'. Si el token es una palabra (por ejemplo 'Entero'
+        o 'FIN') y se parece a una reservada o constante, se agrega la sugerencia.
         """
-        for linea, token, tipo in tokens_clasificados:
-            if tipo == "INVALIDO":
-                categoria = self.categorizar_error_lexico(token)
-                self.errores_lexicos.append({
-                    "linea": linea,
-                    "token": token,
-                    "mensaje": f"Error: {categoria}."
-                })
+        error = {
+            "linea": linea,
+            "token": token,
+            "mensaje": f"Error: {categoria}."
+        }
+        if token.isidentifier():
+            # Las reservadas van en minúsculas: 'FIN' se compara también como 'fin'
+            sugerido = self.sugerencia_token(token) or self.sugerencia_token(token.lower())
+            if sugerido:
+                error["sugerencia"] = sugerido
+        return error
 
     #==================VERIFICACION DE ERRORES ====================
-    def verificar_inicio_fin(self, tokens_clasificados):
-        # Encuentra la primera y última línea útiles (ignorando líneas vacías o solo espacios/comentarios)
-        lineas_utiles = {}
-        for num_linea, token, tipo in tokens_clasificados:
-            # Omite espacios y comentarios como únicos tokens en la línea
-            if tipo not in ("ESPACIO", "DELIMITADOR") or (token in ("fin", "inicio")):
-                if num_linea not in lineas_utiles:
-                    lineas_utiles[num_linea] = []
-                lineas_utiles[num_linea].append((token, tipo))
-
-        if not lineas_utiles:
-            # No hay líneas útiles, error léxico global
-            self.errores_lexicos.append({
-                "linea": 1,
-                "token": "",
-                "mensaje": "No se encontró ningún código útil"
-            })
-            return
-
-        lineas_ordenadas = sorted(lineas_utiles.keys())
-        primera_linea = lineas_ordenadas[0]
-        ultima_linea = lineas_ordenadas[-1]
-
-        tokens_primera = [t for t, tipo in lineas_utiles[primera_linea] if tipo != "ESPACIO"]
-        tokens_ultima = [t for t, tipo in lineas_utiles[ultima_linea] if tipo != "ESPACIO"]
-
-        if tokens_primera != ["fin"]:
-            self.errores_lexicos.append({
-                "linea": primera_linea,
-                "token": " ".join(tokens_primera),
-                "mensaje": "La primera línea útil debe ser solo 'fin' no -->"
-            })
-        if tokens_ultima != ["inicio"]:
-            self.errores_lexicos.append({
-                "linea": ultima_linea,
-                "token": " ".join(tokens_ultima),
-                "mensaje": "La última línea útil debe ser solo 'inicio' -->"
-            })
+    def validar_tokens(self, tokens):
+        """
+        Máquina de estados que valida los tokens a medida que el escáner los produce y los
+        guarda en self.tokens_clasificados. En un solo recorrido revisa:
+            - que la primera línea útil sea solo 'fin' y la última solo 'inicio'
+            - secuencias de operadores inválidas ('++', '=-', ...)
+            - delimitadores que no pertenecen al lenguaje
+            - tokens INVALIDO
+        Los errores se agregan a self.errores_lexicos en ese mismo orden de categorías.
+
+        Si se juntan self.max_errores errores se dejan de pedir tokens (el escáner se detiene ahí),
+        se conservan los primeros max_errores y se agrega un aviso con la línea donde se cortó.
+        Sin tope, el resultado es el mismo que daban las cuatro verificaciones por separado.
+
+        :param tokens: Iterable de tuplas (linea, token, tipo, categoria); categoria puede ser
+                       None y en ese caso se calcula con categorizar_error_lexico.
+        """
+        recorrido = self.recorrer_tokens(tokens)
+        self.errores_lexicos.extend(self.unir_recorridos([recorrido]))
 
-    def sugerencia_token(self, token):
-        universo = (
-            self.PALABRAS_RESERVADAS +
-            self.CONSTANTES_ESPECIALES +
-            self.OPERADORES_ARITMETICOS 
-        )
-        sugeridas = difflib.get_close_matches(token, universo, n=1, cutoff=0.7)
-        return sugeridas[0] if sugeridas else None
-        
-    def buscar_operadores_invalidos(self, tokens_clasificados):
+    def recorrer_tokens(self, tokens):
+        """
+        Parte de validar_tokens que se puede hacer por fragmentos: guarda los tokens en
+        self.tokens_clasificados y en self.indice_tokens, y junta los errores de operadores,
+        delimitadores y tokens inválidos, junto con la primera y la última línea útil que vio.
 
-        # Agrupa los tokens por línea
-        lineas = {}
-        for linea, token, tipo in tokens_clasificados:
-            if linea not in lineas:
-                lineas[linea] = []
-            lineas[linea].append((token, tipo))
+        Con self.max_errores guarda también en "cortes" el estado de cada punto donde se revisó
+        el tope con algún error nuevo, para que analizar_en_paralelo pueda cortar el fragmento
+        donde el código completo llega al máximo.
 
-        # Recorre cada línea
-        for num_linea, tokens_tipos in lineas.items():
-            idx = 0
-            while idx < len(tokens_tipos):
-                token, tipo = tokens_tipos[idx]
-                # Si encuentro un operador, veo si le siguen más operadores
+        Returns:
+            dict: Resultado del recorrido, para pasarlo a unir_recorridos.
+        """
+        clasificados = self.tokens_clasificados = []
+        # Índice de apariciones para la tabla de tokens, llenado en el mismo recorrido
+        self.indice_tokens = IndiceTokens()
+        indexar = self.indice_tokens.agregar
+        operadores_validos = set(self.OPERADORES_ARITMETICOS)
+        delimitadores_validos = set(self.DELIMITADORES)
+        max_errores = self.max_errores
+
+        errores_operadores = []
+        errores_delimitadores = []
+        errores_invalidos = []
+        cantidad = 0
+
+        # Estado de las líneas útiles (sin espacios ni delimitadores)
+        primera_linea = None
+        tokens_primera = None
+        ultima_linea = None
+        tokens_ultima = None
+
+        # Estado de la secuencia de operadores en curso
+        secuencia = ""
+        linea_secuencia = None
+
+        detenido = False
+        linea = None
+
+        # Con tope, puntos donde se revisa el tope (para cortar igual al unir fragmentos en paralelo)
+        cortes = []
+        contados = 0
+        primer_control = None
+
+        for linea, token, tipo, categoria in tokens:
+            clasificados.append((linea, token, tipo))
+            indexar(linea, token, tipo)
+
+            # Cualquier token que no sea operador, o un cambio de línea, cierra la secuencia
+            if secuencia and (tipo != "OPERADOR" or linea != linea_secuencia):
+                if len(secuencia) > 1 and secuencia not in operadores_validos:
+                    errores_operadores.append(self.error_secuencia_operadores(linea_secuencia, secuencia))
+                    cantidad += 1
+                secuencia = ""
+
+            if tipo == "ESPACIO":
+                continue
+            if tipo == "DELIMITADOR":
+                if token not in delimitadores_validos:
+                    errores_delimitadores.append({
+                        "linea": linea,
+                        "token": token,
+                        "mensaje": f"Carácter delimitador no válido '{token}'."
+                    })
+                    cantidad += 1
+            else:
                 if tipo == "OPERADOR":
-                    secuencia = token
-                    j = idx + 1
-                    while j < len(tokens_tipos) and tokens_tipos[j][1] == "OPERADOR":
-                        secuencia += tokens_tipos[j][0]
-                        j += 1
-                    # Si la secuencia tiene más de un caracter y es inválida, reporta el error
-                    if len(secuencia) > 1 and secuencia not in self.OPERADORES_ARITMETICOS:
-                        sugerido = self.sugerencia_token(secuencia)
-                        if sugerido:
-                            mensaje = (
-                                f"Error línea {num_linea}: Secuencia de operadores inválida '{secuencia}'."
-                                f"  Sugerencia: ¿Quisiste decir --> '{sugerido}'?"
-                            )
-                        else:
-                            mensaje = (
-                                f"Error línea {num_linea}: Secuencia de operadores inválida '{secuencia}'."
-                                "  No se encontró sugerencia para esta secuencia."
-                            )
-                        self.errores_lexicos.append({
-                            "linea": num_linea,
-                            "token": secuencia,
-                            "mensaje": mensaje
-                        })
-                    # Avanza el índice
-                    idx = j
+                    if not secuencia:
+                        linea_secuencia = linea
+                    secuencia += token
+                elif tipo == "INVALIDO":
+                    errores_invalidos.append(
+                        self.error_token_invalido(linea, token, categoria or self.categorizar_error_lexico(token))
+                    )
+                    cantidad += 1
+
+                # Línea útil: la primera se guarda aparte, la última se va reemplazando
+                if linea != ultima_linea:
+                    ultima_linea = linea
+                    tokens_ultima = [token]
+                    if primera_linea is None:
+                        primera_linea = linea
+                        tokens_primera = tokens_ultima
                 else:
-                    idx += 1
+                    tokens_ultima.append(token)
+
+            if max_errores is not None:
+                corte = (len(clasificados), len(errores_operadores), len(errores_delimitadores),
+                         len(errores_invalidos), linea, primera_linea, ultima_linea)
+                if primer_control is None:
+                    primer_control = corte
+                if cantidad > contados:
+                    contados = cantidad
+                    cortes.append((cantidad,) + corte)
+                if cantidad >= max_errores:
+                    detenido = True
+                    break
+
+        # Errores que no llegaron a revisarse contra el tope (los que cerró un espacio al final y la
+        # secuencia que quedó abierta): en el código completo se revisan en el primer token que no
+        # sea espacio del fragmento siguiente
+        pendientes = 0 if detenido else cantidad - contados
+        if not detenido and len(secuencia) > 1 and secuencia not in operadores_validos:
+            errores_operadores.append(self.error_secuencia_operadores(linea_secuencia, secuencia))
+            pendientes += 1
+
+        return {
+            "operadores": errores_operadores,
+            "delimitadores": errores_delimitadores,
+            "invalidos": errores_invalidos,
+            "primera_linea": primera_linea,
+            "tokens_primera": tokens_primera,
+            "ultima_linea": ultima_linea,
+            "tokens_ultima": tokens_ultima,
+            "detenido": detenido,
+            "linea": linea,
+            "cortes": cortes,
+            "primer_control": primer_control,
+            "pendientes": pendientes,
+        }
+
+    def unir_recorridos(self, recorridos):
+        """
+        Junta los resultados de recorrer_tokens de fragmentos consecutivos del mismo código y
+        hace las verificaciones que dependen del código completo ('fin' al principio e 'inicio'
+        al final). Aplica self.max_errores sobre el total.
+
+        Returns:
+            list: Errores en el orden inicio/fin, operadores, delimitadores, inválidos.
+        """
+        max_errores = self.max_errores
+        errores_inicio_fin = []
+        errores_operadores = []
+        errores_delimitadores = []
+        errores_invalidos = []
+
+        primera = None
+        ultima = None
+        detenido = False
+        linea = 1
+        cantidad = 0
+
+        for recorrido in recorridos:
+            errores_operadores.extend(recorrido["operadores"])
+            errores_delimitadores.extend(recorrido["delimitadores"])
+            errores_invalidos.extend(recorrido["invalidos"])
+
+            if recorrido["primera_linea"] is not None:
+                if primera is None:
+                    primera = (recorrido["primera_linea"], recorrido["tokens_primera"])
+                ultima = (recorrido["ultima_linea"], recorrido["tokens_ultima"])
+            if recorrido["linea"] is not None:
+                linea = recorrido["linea"]
+
+            cantidad = len(errores_operadores) + len(errores_delimitadores) + len(errores_invalidos)
+            if recorrido["detenido"]:
+                detenido = True
+                break
+
+        # Sin corte, el tope también se alcanza con la secuencia que quedó abierta al final
+        if max_errores is not None and cantidad >= max_errores:
+            detenido = True
+
+        if primera is None:
+            if not detenido:
+                # No hay líneas útiles, error léxico global
+                errores_inicio_fin.append({
+                    "linea": 1,
+                    "token": "",
+                    "mensaje": "No se encontró ningún código útil"
+                })
+        else:
+            # Si el análisis se cortó, la primera línea solo se revisa si se llegó a leer completa
+            if not detenido or ultima[0] != primera[0]:
+                if primera[1] != ["fin"]:
+                    errores_inicio_fin.append({
+                        "linea": primera[0],
+                        "token": " ".join(primera[1]),
+                        "mensaje": "La primera línea útil debe ser solo 'fin' no -->"
+                    })
+            if not detenido and ultima[1] != ["inicio"]:
+                errores_inicio_fin.append({
+                    "linea": ultima[0],
+                    "token": " ".join(ultima[1]),
+                    "mensaje": "La última línea útil debe ser solo 'inicio' -->"
+                })
 
-    def buscar_delimitadores_invalidos(self, tokens_clasificados):
-        # Agrupa los tokens por línea
-        lineas = {}
-        for linea, token, tipo in tokens_clasificados:
-            if linea not in lineas:
-                lineas[linea] = []
-            lineas[linea].append((token, tipo))
-
-        for num_linea, tokens_tipos in lineas.items():
-            for token, tipo in tokens_tipos:
-                if tipo == "DELIMITADOR":
-                    if token not in self.DELIMITADORES:
-                        self.errores_lexicos.append({
-                            "linea": num_linea,
-                            "token": token,
-                            "mensaje": f"Carácter delimitador no válido '{token}'."
-                        })
+        errores = errores_inicio_fin + errores_operadores + errores_delimitadores + errores_invalidos
+        # Los errores que se agregan al cerrar el recorrido también pueden pasar el tope
+        if detenido or (max_errores is not None and len(errores) > max_errores):
+            del errores[max_errores:]
+            errores.append({
+                "linea": linea,
+                "token": "",
+                "mensaje": f"Se alcanzó el máximo de {max_errores} errores léxicos, el análisis se detuvo en esta línea"
+            })
+        return errores
+
+    def error_secuencia_operadores(self, linea, secuencia):
+        sugerido = self.sugerencia_token(secuencia)
+        if sugerido:
+            mensaje = (
+                f"Error línea {linea}: Secuencia de operadores inválida '{secuencia}'."
+                f"  Sugerencia: ¿Quisiste decir --> '{sugerido}'?"
+            )
+        else:
+            mensaje = (
+                f"Error línea {linea}: Secuencia de operadores inválida '{secuencia}'."
+                "  No se encontró sugerencia para esta secuencia."
+            )
+        return {
+            "linea": linea,
+            "token": secuencia,
+            "mensaje": mensaje
+        }
+
+    @classmethod
+    def obtener_indice_sugerencias(cls):
+        """Devuelve el índice de sugerencias de la especificación léxica, armándolo la primera vez."""
+        if cls._indice_sugerencias is None:
+            cls._indice_sugerencias = IndiceSugerencias(
+                PALABRAS_RESERVADAS + CONSTANTES_ESPECIALES + OPERADORES_ARITMETICOS,
+                cutoff=0.7
+            )
+        return cls._indice_sugerencias
+
+    def sugerencia_token(self, token):
+        # Mismo resultado que difflib.get_close_matches(token, universo, n=1, cutoff=0.7), pero
+        # consultando el árbol BK y con caché de respuestas
+        return self.obtener_indice_sugerencias().sugerir(token)
 
     def categorizar_error_lexico(self, token):
         patrones = [
@@ -294,33 +962,18 @@ class LexicalAnalizerForMy:
 
     #================== METODOS GET ===================
     def get_errores_lexicos(self):
-        return [
-            f"Línea {err['linea']}: {err['mensaje']} '{err['token']}'"
-            for err in sorted(self.errores_lexicos, key=lambda e: e['linea'])
-        ]
+        errores = []
+        for err in sorted(self.errores_lexicos, key=lambda e: e['linea']):
+            texto = f"Línea {err['linea']}: {err['mensaje']} '{err['token']}'"
+            # La sugerencia va después del token: el resaltador subraya el primer texto entre comillas
+            if "sugerencia" in err:
+                texto += f"  Sugerencia: ¿Quisiste decir --> '{err['sugerencia']}'?"
+            errores.append(texto)
+        return errores
 
     def get_tokens_clasificados(self):
         """
-        Devuelve los tokens clasificados en una lista de tuplas (linea, token, tipo).
-        """
-        return self.agrupar_tokens(self.tokens_clasificados)
-
-    #================== UTILS ===================
-    def agrupar_tokens(self, tokens_clasificados):
-        """
-        Recibe una lista de tuplas (linea, token, tipo)
-        Devuelve una lista de tuplas (token, tipo, primera_linea, [otras_lineas])
+        Devuelve el índice de tokens: una secuencia de filas (token, tipo, primera_linea, [otras_lineas]),
+        una por cada par (token, tipo) distinto, que además se puede consultar por token o por tipo.
         """
-        agrupados = {}
-        for linea, token, tipo in tokens_clasificados:
-            clave = (token, tipo)
-            if clave in agrupados:
-                agrupados[clave]['otras_lineas'].append(linea)
-            else:
-                agrupados[clave] = {'primera_linea': linea, 'otras_lineas': []}
-        
-        resultado = []
-        for (token, tipo), info in agrupados.items():
-            resultado.append((token, tipo, info['primera_linea'], info['otras_lineas']))
-        return resultado
-
+        return self.indice_tokens
@@ -1,24 +1,18 @@
 from src.compiler.AnalizadorSemantico import AnalizadorSemantico
+from src.models.TokenStream import TokenStream
+from src.util.EspecificacionLexica import PATRONES_FASES
 from src.util.Tokenizador import Tokenizador
 
 
 class Optimizacion:
     def __init__(self, codigo_cochino, tabla_de_variables):
-        patrones = [
-            r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con punto (ej: 3.14hola)
-            r'\d+[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con número (ej: 8hola)
-            r'\d+(\.\d+){2,}',  # número con más de un punto (ej: 3.14.15)
-            r'\d+\.\d+',  # decimal válido (3.14)
-            r'\d+\.',  # decimal incompleto (8.)
-            r'[a-zA-Z_][a-zA-Z0-9_]*',  # identificador válido
-            r'\d+',  # entero válido
-            r'"[^"]*"',  # ✅ cadena entre comillas
-            r'#.*?#',  # comentario entre almohadillas
-            r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])',  # delimitadores clásicos
-            r'(\s)'  # espacio en blanco
-        ]
         self.tabla_de_variables = tabla_de_variables # Esta contiene variable y valores asignados
-        self.codigo_cochino = Tokenizador.obtener_tokens_del_codigo_linea_por_linea(codigo_cochino, patrones)
+
+        # Si ya viene tokenizado se lee la vista por líneas del flujo sin volver a tokenizar
+        if isinstance(codigo_cochino, TokenStream):
+            self.codigo_cochino = codigo_cochino.vista_lineas()
+        else:
+            self.codigo_cochino = Tokenizador.obtener_tokens_del_codigo_linea_por_linea(codigo_cochino, PATRONES_FASES)
         print(tabla_de_variables)
 
     def optimizar_codigo(self):
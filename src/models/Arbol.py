@@ -10,7 +10,19 @@ class Arbol:
         identificador_token = operacion_tokens[0]
         igual_token = operacion_tokens[1]
         expresion_infix = operacion_tokens[2:-1]
+        return self._construir_asignacion(identificador_token, igual_token, expresion_infix)
 
+    def construir_desde_cst(self, asignacion):
+        """
+        Como construir(), a partir de un nodo 'asignacion' del ArbolSintactico del parser: el
+        identificador, el '=' y los tokens de la expresión son sus hojas, sin separar la línea.
+        La gramática no tiene precedencia, así que la expresión se sigue ordenando aquí.
+        """
+        identificador, igual, expresion = asignacion.hijos
+        expresion_infix = [nodo.valor_lexema for nodo in expresion.recorrer() if not nodo.hijos]
+        return self._construir_asignacion(identificador.hijos[0].valor_lexema, igual.valor_lexema, expresion_infix)
+
+    def _construir_asignacion(self, identificador_token, igual_token, expresion_infix):
         expresion_postfix = self._convertir_a_postfix(expresion_infix)
         if not expresion_postfix:
             return None
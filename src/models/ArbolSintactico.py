@@ -0,0 +1,75 @@
+from src.models.Nodo import Nodo
+
+
+class ArbolSintactico:
+    """
+    Árbol de sintaxis concreta que arma el analizador sintáctico al aceptar un programa.
+
+    Cada no terminal es un Nodo con un hijo por símbolo de la producción que se usó, y cada
+    terminal es una hoja con su lexema en valor_lexema. Todos los nodos guardan su rango de
+    tokens (inicio, fin), así que las fases siguientes pueden recorrer el árbol y leer los
+    lexemas o la posición de cualquier parte sin volver a tokenizar ni a analizar el código.
+
+    El árbol sigue la forma de la gramática: lista_instrucciones queda anidada por la derecha y
+    una expresion no tiene precedencia de operadores (eso lo resuelve Arbol).
+    """
+
+    def __init__(self, raiz: Nodo, tokens) -> None:
+        self.raiz = raiz
+        self.tokens = tokens
+
+    @classmethod
+    def construir(cls, tokens, expansiones, no_terminales, inicial: str, elegir, inicio: int = 0) -> "ArbolSintactico":
+        """
+        Arma el árbol de una derivación por la izquierda.
+
+        :param tokens: Tokens analizados.
+        :param expansiones: no_terminal -> producciones, con los índices de alternativa del analizador.
+        :param no_terminales: Conjunto de no terminales.
+        :param inicial: No terminal de la raíz.
+        :param elegir: elegir(no_terminal, indice) -> alternativa usada para ese no terminal
+                       desde ese token. Se llama en preorden.
+        :param inicio: Token donde empieza la raíz.
+        """
+        raiz = Nodo(inicial, inicio=inicio)
+        pendientes = [(raiz, iter(expansiones[inicial][elegir(inicial, inicio)]))]
+        indice = inicio
+
+        # Sin recursión: lista_instrucciones anida una instrucción por nivel
+        while pendientes:
+            nodo, simbolos = pendientes[-1]
+            simbolo = next(simbolos, None)
+            if simbolo is None:
+                nodo.fin = indice
+                pendientes.pop()
+            elif simbolo in no_terminales:
+                hijo = Nodo(simbolo, inicio=indice)
+                nodo.hijos.append(hijo)
+                pendientes.append((hijo, iter(expansiones[simbolo][elegir(simbolo, indice)])))
+            else:
+                nodo.hijos.append(Nodo(simbolo, tokens[indice], inicio=indice, fin=indice + 1))
+                indice += 1
+
+        return cls(raiz, tokens)
+
+    #================== CONSULTAS ===================
+    def lexemas(self, nodo: Nodo = None) -> list:
+        """Lexemas que cubre el nodo (por defecto, todo el árbol)."""
+        nodo = nodo or self.raiz
+        return list(self.tokens[nodo.inicio:nodo.fin])
+
+    def posicion(self, nodo: Nodo):
+        """(linea, columna) del primer token del nodo; (None, None) si los tokens no tienen posición."""
+        posicion = getattr(self.tokens, "posicion", None)
+        return posicion(nodo.inicio) if posicion else (None, None)
+
+    def buscar(self, tipo_gramatical: str):
+        """Nodos de ese tipo, en el orden del programa."""
+        return self.raiz.buscar(tipo_gramatical)
+
+    def instrucciones(self):
+        """Los nodos instruccion del programa, en orden (sin el anidamiento de lista_instrucciones)."""
+        return self.buscar("instruccion")
+
+    def __str__(self) -> str:
+        return str(self.raiz)   # <-- Nodo.__str__ no usa recursión: sirve para árboles de cualquier profundidad
@@ -0,0 +1,98 @@
+class EstadisticasSintacticas:
+    """
+    Contadores de un análisis sintáctico, para encontrar los puntos caros de una gramática.
+
+    Se actualizan con cada estado que registra el analizador con retroceso (registrar()), según
+    la regla que lo generó:
+        1 -> expansiones        2 -> concordancias      4 -> no_concordancias
+        5, 6c -> retrocesos     6a -> alternativas (siguiente alternativa probada)
+    además de la profundidad máxima de las pilas A y B y las expansiones por no terminal.
+    Los otros modos solo llenan el tiempo (no tienen esos pasos).
+
+    Si el análisis se detiene por un límite, detenido_por dice cuál ("pasos", "tiempo" o
+    "profundidad").
+    """
+
+    __slots__ = (
+        "modo", "pasos", "por_regla", "profundidad_maxima_a", "profundidad_maxima_b",
+        "expansiones_por_no_terminal", "segundos", "detenido_por"
+    )
+
+    def __init__(self, modo: str = "retroceso") -> None:
+        self.modo = modo
+        self.pasos = 0
+        self.por_regla = {}                     # <-- Regla -> estados generados con ella
+        self.profundidad_maxima_a = 0
+        self.profundidad_maxima_b = 0
+        self.expansiones_por_no_terminal = {}
+        self.segundos = 0.0
+        self.detenido_por = None
+
+    def registrar(self, estado) -> None:
+        """Cuenta un estado nuevo del analizador con retroceso (se llama en cada paso: debe ser barato)."""
+        self.pasos += 1
+        regla = estado.r
+        por_regla = self.por_regla
+        por_regla[regla] = por_regla.get(regla, 0) + 1
+        if regla == "1":
+            por_nt = self.expansiones_por_no_terminal
+            no_terminal = estado.a.tope
+            por_nt[no_terminal] = por_nt.get(no_terminal, 0) + 1
+
+        profundidad_a, profundidad_b = len(estado.a), len(estado.b)
+        if profundidad_a > self.profundidad_maxima_a:
+            self.profundidad_maxima_a = profundidad_a
+        if profundidad_b > self.profundidad_maxima_b:
+            self.profundidad_maxima_b = profundidad_b
+
+    #================== CONTADORES ===================
+    @property
+    def expansiones(self) -> int:
+        return self.por_regla.get("1", 0)
+
+    @property
+    def concordancias(self) -> int:
+        return self.por_regla.get("2", 0)
+
+    @property
+    def no_concordancias(self) -> int:
+        return self.por_regla.get("4", 0)
+
+    @property
+    def retrocesos(self) -> int:
+        return self.por_regla.get("5", 0) + self.por_regla.get("6c", 0)
+
+    @property
+    def alternativas(self) -> int:
+        return self.por_regla.get("6a", 0)
+
+    @property
+    def pasos_por_segundo(self) -> float:
+        return self.pasos / self.segundos if self.segundos > 0 else 0.0
+
+    def mas_expandidos(self, cantidad: int = 5) -> list:
+        """Los no terminales con más expansiones, como (no_terminal, expansiones)."""
+        return sorted(self.expansiones_por_no_terminal.items(), key=lambda par: par[1], reverse=True)[:cantidad]
+
+    def como_filas(self) -> list:
+        """(nombre, valor) para mostrar en una tabla o en texto."""
+        filas = [
+            ("Modo", self.modo),
+            ("Pasos", self.pasos),
+            ("Expansiones", self.expansiones),
+            ("Concordancias", self.concordancias),
+            ("No concordancias", self.no_concordancias),
+            ("Retrocesos", self.retrocesos),
+            ("Alternativas probadas", self.alternativas),
+            ("Profundidad máxima A", self.profundidad_maxima_a),
+            ("Profundidad máxima B", self.profundidad_maxima_b),
+            ("Tiempo", f"{self.segundos:.3f} s"),
+            ("Pasos por segundo", f"{self.pasos_por_segundo:,.0f}"),
+        ]
+        if self.detenido_por is not None:
+            filas.append(("Detenido por límite de", self.detenido_por))
+        filas.extend((f"Expansiones de {no_terminal}", veces) for no_terminal, veces in self.mas_expandidos())
+        return filas
+
+    def __str__(self) -> str:
+        return "\n".join(f"{nombre}: {valor}" for nombre, valor in self.como_filas())
@@ -1,12 +1,42 @@
+from src.models.Pila import Pila, VACIA
+
+
 class Estado:
-    def __init__(self, s: str, i: int,r: str, a: list[str], b: list[str], a_copy: list[int],  alternativas: list[int] = None) -> None:
+    """
+    Estado del analizador sintáctico.
+
+    a, a_copy, b y alternativas son Pilas persistentes: crear un estado no copia nada y los
+    estados consecutivos comparten las celdas que no cambiaron. Se aceptan también listas (se
+    convierten una vez): a, a_copy y alternativas con el tope al final, b con el tope al principio.
+    lista_a(), lista_a_copy(), lista_b() y lista_alternativas() devuelven las listas con esa
+    misma orientación.
+    """
+
+    __slots__ = ("r", "s", "i", "a", "a_copy", "b", "alternativas")
+
+    def __init__(self, s: str, i: int, r: str, a, b, a_copy, alternativas=None) -> None:
         self.r = r
         self.s = s
         self.i = i
-        self.a = a[:]
-        self.a_copy = a_copy[:]
-        self.b = b[:]
-        self.alternativas = alternativas[:] if alternativas else []
+        self.a = a if isinstance(a, Pila) else Pila.desde_lista(a)
+        self.a_copy = a_copy if isinstance(a_copy, Pila) else Pila.desde_lista(a_copy)
+        self.b = b if isinstance(b, Pila) else Pila.desde_lista(b, tope_al_final=False)
+        if isinstance(alternativas, Pila):
+            self.alternativas = alternativas
+        else:
+            self.alternativas = Pila.desde_lista(alternativas) if alternativas else VACIA
+
+    def lista_a(self) -> list:
+        return self.a.como_lista()
+
+    def lista_a_copy(self) -> list:
+        return self.a_copy.como_lista()
+
+    def lista_b(self) -> list:
+        return self.b.como_lista(tope_al_final=False)
+
+    def lista_alternativas(self) -> list:
+        return self.alternativas.como_lista()
 
     def __str__(self) -> str:
         RESET = "\033[0m"
@@ -19,6 +49,6 @@ class Estado:
         return (f"R: {RED}{self.r}{RESET}\t"
                 f"S: {GREEN}{self.s}{RESET}\t"
                 f"I: {YELLOW}{self.i}{RESET}\t"
-                f"A_copy: {CYAN}{self.a_copy}{RESET}\t"
-                f"A: {CYAN}{self.a}{RESET}\t"
-                f"B: {MAGENTA}{self.b}{RESET}")
+                f"A_copy: {CYAN}{self.lista_a_copy()}{RESET}\t"
+                f"A: {CYAN}{self.lista_a()}{RESET}\t"
+                f"B: {MAGENTA}{self.lista_b()}{RESET}")
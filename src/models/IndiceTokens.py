@@ -0,0 +1,157 @@
+from collections.abc import Sequence
+
+
+class IndiceTokens(Sequence):
+    """
+    Índice de apariciones de los tokens, armado mientras el analizador léxico recorre el código.
+
+    Cada par (token, tipo) distinto es una entrada, en el orden en que aparece por primera vez.
+    Por entrada se guarda:
+        - primeras: línea de la primera aparición.
+        - ultimas:  línea de la última aparición (para calcular el siguiente delta).
+        - conteos:  cantidad de apariciones.
+        - deltas:   un bytearray con la diferencia entre cada línea y la anterior, codificada en
+                    base 128 (un byte si la diferencia es menor a 128, que es lo normal).
+    Las entradas son pocas (una por token distinto); lo que crece con el código son los deltas,
+    que ocupan casi siempre un byte por aparición.
+
+    Como secuencia, cada elemento es la fila (token, tipo, primera_linea, [otras_lineas]) que
+    devolvía agrupar_tokens, así que se puede paginar con cortes (indice[a:b]) sin decodificar
+    el resto.
+    """
+
+    def __init__(self):
+        self.claves = []            # <-- (token, tipo) de cada entrada
+        self._id_por_clave = {}
+
+        self.primeras = []
+        self.ultimas = []
+        self.conteos = []
+        self.deltas = []
+
+    #================== CONSTRUCCION ===================
+    def agregar(self, linea: int, token: str, tipo: str) -> None:
+        """Registra una aparición; las líneas deben llegar en orden no decreciente."""
+        clave = (token, tipo)
+        k = self._id_por_clave.get(clave)
+
+        if k is None:
+            self._id_por_clave[clave] = len(self.claves)
+            self.claves.append(clave)
+            self.primeras.append(linea)
+            self.ultimas.append(linea)
+            self.conteos.append(1)
+            self.deltas.append(bytearray())
+            return
+
+        delta = linea - self.ultimas[k]
+        self.ultimas[k] = linea
+        self.conteos[k] += 1
+        if delta < 0x80:
+            self.deltas[k].append(delta)    # <-- Caso común: un byte, sin llamar a _codificar
+        else:
+            self._codificar(self.deltas[k], delta)
+
+    def agregar_tokens(self, tokens) -> None:
+        """Llama agregar() con cada tupla (linea, token, tipo)."""
+        agregar = self.agregar
+        for linea, token, tipo in tokens:
+            agregar(linea, token, tipo)
+
+    def extender(self, otro: "IndiceTokens") -> None:
+        """
+        Agrega las apariciones de otro índice que cubre líneas posteriores (fragmentos en paralelo).
+        Los deltas del otro índice siguen valiendo tal cual; solo se codifica el salto entre la
+        última línea de este índice y la primera del otro.
+        """
+        for k, clave in enumerate(otro.claves):
+            propio = self._id_por_clave.get(clave)
+
+            if propio is None:
+                self._id_por_clave[clave] = len(self.claves)
+                self.claves.append(clave)
+                self.primeras.append(otro.primeras[k])
+                self.ultimas.append(otro.ultimas[k])
+                self.conteos.append(otro.conteos[k])
+                self.deltas.append(bytearray(otro.deltas[k]))
+                continue
+
+            datos = self.deltas[propio]
+            self._codificar(datos, otro.primeras[k] - self.ultimas[propio])
+            datos.extend(otro.deltas[k])
+
+            self.ultimas[propio] = otro.ultimas[k]
+            self.conteos[propio] += otro.conteos[k]
+
+    #================== CONSULTAS ===================
+    def __len__(self) -> int:
+        return len(self.claves)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._fila(k) for k in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de entrada fuera de rango")
+        return self._fila(indice)
+
+    def lineas(self, token: str, tipo: str) -> list:
+        """Líneas donde aparece el token con ese tipo (con repeticiones), o [] si no aparece."""
+        k = self._id_por_clave.get((token, tipo))
+        return [] if k is None else self._lineas_de(k)
+
+    def buscar(self, token: str) -> list:
+        """
+        Todas las entradas de un token, sin importar su tipo.
+
+        Returns:
+            list: Tuplas (tipo, [lineas]).
+        """
+        return [(tipo, self._lineas_de(k)) for k, (t, tipo) in enumerate(self.claves) if t == token]
+
+    def por_tipo(self, tipo: str) -> list:
+        """Tokens distintos de un tipo, en orden de primera aparición."""
+        return [token for token, t in self.claves if t == tipo]
+
+    def conteo_por_tipo(self, distintos: bool = False) -> dict:
+        """
+        Cantidad de apariciones por tipo, o de tokens distintos por tipo si distintos=True.
+        """
+        conteo = {}
+        for k, (_token, tipo) in enumerate(self.claves):
+            conteo[tipo] = conteo.get(tipo, 0) + (1 if distintos else self.conteos[k])
+        return conteo
+
+    def total_apariciones(self) -> int:
+        return sum(self.conteos)
+
+    #================== UTILS ===================
+    @staticmethod
+    def _codificar(datos: bytearray, valor: int) -> None:
+        # Base 128: 7 bits por byte, el bit alto indica que sigue otro byte
+        while valor >= 0x80:
+            datos.append((valor & 0x7F) | 0x80)
+            valor >>= 7
+        datos.append(valor)
+
+    def _lineas_de(self, k: int) -> list:
+        linea = self.primeras[k]
+        lineas = [linea]
+        delta = 0
+        desplazamiento = 0
+        for byte in self.deltas[k]:
+            delta |= (byte & 0x7F) << desplazamiento
+            if byte & 0x80:
+                desplazamiento += 7
+                continue
+            linea += delta
+            lineas.append(linea)
+            delta = 0
+            desplazamiento = 0
+        return lineas
+
+    def _fila(self, k: int):
+        token, tipo = self.claves[k]
+        lineas = self._lineas_de(k)
+        return token, tipo, lineas[0], lineas[1:]
@@ -1,19 +1,46 @@
 class Nodo:
     """
     Representa un nodo en el Parse Tree con valor semántico calculado.
+
+    Los nodos del árbol de sintaxis concreta (ArbolSintactico) guardan además el rango de
+    tokens que cubren: tokens[inicio:fin].
     """
-    def __init__(self, tipo_gramatical, valor_lexema="", valor_calculado=None, hijos=None):
+    def __init__(self, tipo_gramatical, valor_lexema="", valor_calculado=None, hijos=None, inicio=None, fin=None):
         self.tipo_gramatical = tipo_gramatical
         self.valor_lexema = valor_lexema
         self.valor_calculado = valor_calculado  # El resultado numérico o valor inicial
         self.hijos = hijos if hijos is not None else []
+        self.inicio = inicio    # <-- Primer token del nodo (None si no viene del parser)
+        self.fin = fin          # <-- Token siguiente al último
+
+    def recorrer(self):
+        """Genera el nodo y sus descendientes en preorden (sin recursión: el árbol puede ser muy profundo)."""
+        pendientes = [self]
+        while pendientes:
+            nodo = pendientes.pop()
+            yield nodo
+            pendientes.extend(reversed(nodo.hijos))
+
+    def buscar(self, tipo_gramatical):
+        """Genera, en orden, los nodos de ese tipo (sin entrar en ellos)."""
+        pendientes = [self]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo_gramatical == tipo_gramatical:
+                yield nodo
+            else:
+                pendientes.extend(reversed(nodo.hijos))
 
     def __str__(self, nivel=0):
-        # ... (el método __str__ se puede mantener para depuración en consola) ...
-        indentacion = "\t" * nivel
-        valor_lex_str = f" ('{self.valor_lexema}')" if self.valor_lexema else ""
-        valor_calc_str = f" [valor={self.valor_calculado}]" if self.valor_calculado is not None else ""
-        ret = f"{indentacion}{self.tipo_gramatical}{valor_lex_str}{valor_calc_str}\n"
-        for hijo in self.hijos:
-            ret += hijo.__str__(nivel + 1)
-        return ret
\ No newline at end of file
+        # Con una pila explícita: lista_instrucciones anida un nivel por instrucción y la
+        # recursión no alcanza para programas largos
+        lineas = []
+        pendientes = [(self, nivel)]
+        while pendientes:
+            nodo, nivel_nodo = pendientes.pop()
+            indentacion = "\t" * nivel_nodo
+            valor_lex_str = f" ('{nodo.valor_lexema}')" if nodo.valor_lexema else ""
+            valor_calc_str = f" [valor={nodo.valor_calculado}]" if nodo.valor_calculado is not None else ""
+            lineas.append(f"{indentacion}{nodo.tipo_gramatical}{valor_lex_str}{valor_calc_str}\n")
+            pendientes.extend((hijo, nivel_nodo + 1) for hijo in reversed(nodo.hijos))
+        return "".join(lineas)
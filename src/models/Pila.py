@@ -0,0 +1,79 @@
+class Pila:
+    """
+    Pila persistente (lista enlazada de celdas inmutables).
+
+    apilar() y resto devuelven otra Pila en O(1) sin tocar la original, así que dos estados
+    consecutivos del analizador comparten todas las celdas salvo las que cambiaron. Guardar
+    toda la historia cuesta una celda por símbolo apilado, no una copia completa por estado.
+
+    Al recorrerla se va del tope hacia el fondo.
+    """
+
+    __slots__ = ("tope", "resto", "_tamano")
+
+    def __init__(self, tope=None, resto: "Pila" = None):
+        # Pila() es la pila vacía; en otro caso usar apilar()
+        self.tope = tope
+        self.resto = resto
+        self._tamano = 0 if resto is None else resto._tamano + 1
+
+    @classmethod
+    def desde_lista(cls, elementos, tope_al_final: bool = True) -> "Pila":
+        """
+        :param elementos: Lista de elementos.
+        :param tope_al_final: True si el último elemento es el tope (como la lista A del
+                              analizador); False si el tope es el primero (como la lista B).
+        """
+        pila = VACIA
+        for elemento in (elementos if tope_al_final else reversed(elementos)):
+            pila = Pila(elemento, pila)
+        return pila
+
+    #================== OPERACIONES ===================
+    def apilar(self, elemento) -> "Pila":
+        return Pila(elemento, self)
+
+    def anteponer(self, elementos) -> "Pila":
+        """Apila una secuencia de forma que elementos[0] quede en el tope (una producción en B)."""
+        pila = self
+        for elemento in reversed(elementos):
+            pila = Pila(elemento, pila)
+        return pila
+
+    def soltar(self, cantidad: int) -> "Pila":
+        """La pila sin sus primeros `cantidad` elementos (o vacía si tiene menos)."""
+        pila = self
+        while cantidad > 0 and pila._tamano:
+            pila = pila.resto
+            cantidad -= 1
+        return pila
+
+    #================== CONSULTAS ===================
+    def __len__(self) -> int:
+        return self._tamano
+
+    def __iter__(self):
+        pila = self
+        while pila._tamano:
+            yield pila.tope
+            pila = pila.resto
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, Pila):
+            return self is otra or (len(self) == len(otra) and all(a == b for a, b in zip(self, otra)))
+        return NotImplemented
+
+    __hash__ = None
+
+    def como_lista(self, tope_al_final: bool = True) -> list:
+        """Copia en lista, con el tope al final (orientación de A) o al principio (orientación de B)."""
+        lista = list(self)
+        if tope_al_final:
+            lista.reverse()
+        return lista
+
+    def __repr__(self) -> str:
+        return f"Pila({list(self)!r})"
+
+
+VACIA = Pila()
@@ -0,0 +1,82 @@
+import hashlib
+from array import array
+from bisect import bisect_right
+
+from src.util.Cache import Cache
+
+
+class SourceFile:
+    """
+    Código fuente con su índice de líneas, compartido por todas las fases.
+
+    Guarda el texto, un array('I') con el offset donde empieza cada línea y un hash del
+    contenido. Con el índice, pasar de un offset a (línea, columna) es una búsqueda binaria en
+    lugar de volver a partir el código; con el hash, cualquier resultado derivado del código
+    (tokens, árboles, tablas) se puede guardar en caché bajo clave_cache().
+
+    Las líneas se cortan en '\\n', igual que el analizador léxico.
+    """
+
+    def __init__(self, texto: str, ruta: str = None):
+        self.texto = texto
+        self.ruta = ruta
+        self._hash = None
+
+        # inicios_linea[k] es el offset del primer carácter de la línea k + 1
+        self.inicios_linea = array('I', [0])
+        posicion = texto.find("\n")
+        while posicion != -1:
+            self.inicios_linea.append(posicion + 1)
+            posicion = texto.find("\n", posicion + 1)
+
+    @classmethod
+    def desde_archivo(cls, ruta) -> "SourceFile":
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            return cls(archivo.read(), str(ruta))
+
+    #================== POSICIONES ===================
+    def numero_lineas(self) -> int:
+        return len(self.inicios_linea)
+
+    def posicion(self, offset: int):
+        """
+        Convierte un offset del texto en (linea, columna), las dos empezando en 1.
+        """
+        if not 0 <= offset <= len(self.texto):
+            raise IndexError(f"Offset fuera del código: {offset}")
+        linea = bisect_right(self.inicios_linea, offset)
+        return linea, offset - self.inicios_linea[linea - 1] + 1
+
+    def offset(self, linea: int, columna: int = 1) -> int:
+        """Offset del texto que corresponde a (linea, columna), las dos empezando en 1."""
+        if not 1 <= linea <= len(self.inicios_linea):
+            raise IndexError(f"Línea fuera del código: {linea}")
+        return self.inicios_linea[linea - 1] + columna - 1
+
+    def linea(self, numero: int) -> str:
+        """Texto de la línea (base 1), sin el salto de línea."""
+        inicio = self.offset(numero)
+        if numero < len(self.inicios_linea):
+            return self.texto[inicio:self.inicios_linea[numero] - 1]
+        return self.texto[inicio:]
+
+    #================== HASH ===================
+    @property
+    def hash(self) -> str:
+        """SHA-256 del contenido (se calcula la primera vez que se pide)."""
+        if self._hash is None:
+            self._hash = hashlib.sha256(self.texto.encode("utf-8", "surrogatepass")).hexdigest()
+        return self._hash
+
+    def clave_cache(self, *partes) -> str:
+        """
+        Clave para guardar un resultado derivado de este código: combina el hash del contenido
+        con lo que distinga al resultado (nombre de la fase, versión, opciones...).
+        """
+        return Cache.hash_de(self.hash, *partes)
+
+    def __len__(self) -> int:
+        return len(self.texto)
+
+    def __repr__(self) -> str:
+        return f"SourceFile(ruta={self.ruta!r}, lineas={self.numero_lineas()}, hash={self.hash[:12]})"
@@ -0,0 +1,303 @@
+import sys
+from array import array
+from collections.abc import Sequence
+
+from src.models.SourceFile import SourceFile
+from src.util.EspecificacionLexica import (
+    PALABRAS_RESERVADAS, CONSTANTES_ESPECIALES, OPERADORES_ARITMETICOS, PATRON_FASES, PATRON_FASES_PLANO
+)
+
+
+class TokenStream:
+    """
+    Flujo de tokens compacto que comparten las fases del compilador.
+
+    En lugar de guardar una tupla o una lista de strings por token, cada token ocupa una
+    posición en arreglos paralelos:
+        - tipos:    array('B') con el tipo del token como entero pequeño (índice en TIPOS).
+        - inicios:  array('I') con el offset donde empieza el token en el código.
+        - finales:  array('I') con el offset donde termina.
+        - lineas:   array('I') con la línea (base 1) del token.
+
+    El texto de cada token (lexema) no se guarda: se corta del código fuente cuando se pide, y
+    la columna se calcula con el índice de líneas del SourceFile (posicion()).
+    Los identificadores y palabras reservadas se internan en una tabla de símbolos, así cada
+    nombre existe una sola vez en memoria aunque aparezca millones de veces.
+
+    Las vistas vista_plana() y vista_lineas() reemplazan a las listas de
+    Tokenizador.obtener_tokens_del_codigo y obtener_tokens_del_codigo_linea_por_linea sin copiar
+    los tokens. Las dos listas solo difieren cuando una cadena o un comentario cruza un salto de
+    línea (o contiene '\r', '\x85'...): ahí la vista plana sale de una segunda tokenización del
+    código completo.
+    """
+
+    TIPOS = (
+        "RESERVADA", "CONSTANTE", "IDENTIFICADOR", "NUMERO", "CADENA",
+        "COMENTARIO", "OPERADOR", "DELIMITADOR", "INVALIDO"
+    )
+
+    PALABRAS_RESERVADAS = frozenset(PALABRAS_RESERVADAS)
+    CONSTANTES_ESPECIALES = frozenset(CONSTANTES_ESPECIALES)
+    OPERADORES_ARITMETICOS = frozenset(OPERADORES_ARITMETICOS)
+
+    # Los mismos patrones que usan las fases, precompilados en la especificación léxica
+    _PATRON_FASES = PATRON_FASES
+    _PATRON_FASES_PLANO = PATRON_FASES_PLANO
+
+    _TIPO_POR_GRUPO = {
+        "ERR_DECIMAL_LETRAS": "INVALIDO",
+        "ERR_ID_NUMERO": "INVALIDO",
+        "ERR_MULTIPUNTO": "INVALIDO",
+        "DECIMAL": "NUMERO",
+        "ERR_DECIMAL_INCOMPLETO": "INVALIDO",
+        "ENTERO": "NUMERO",
+        "CADENA": "CADENA",
+        "COMENTARIO": "COMENTARIO",
+    }
+
+    # Último flujo construido desde un SourceFile: (hash del contenido, flujo). Si las fases
+    # piden los tokens del mismo código otra vez, se reutiliza en lugar de tokenizar de nuevo.
+    _ultimo = None
+
+    def __init__(self, codigo: str, fuente: SourceFile = None):
+        self.codigo = codigo
+        self._fuente = fuente
+
+        self.tipos = array('B')
+        self.inicios = array('I')
+        self.finales = array('I')
+        self.lineas = array('I')
+
+        # Índice del símbolo internado de cada token (0 si el token no es una palabra)
+        self.id_simbolo = array('I')
+        self.simbolos = []
+        self._indice_simbolo = {}
+
+        # primer_token_linea[k] es el índice del primer token de la línea k + 1;
+        # el último elemento es el total de tokens
+        self.primer_token_linea = array('I')
+
+        self._plano = None      # <-- Flujo de vista_plana() (el mismo flujo si no cambia nada)
+
+    #================== CONSTRUCCION ===================
+    @classmethod
+    def desde_codigo(cls, codigo) -> "TokenStream":
+        """
+        Tokeniza el código una sola vez con los patrones de las fases.
+
+        :param codigo: Código fuente completo (str o SourceFile). Con un SourceFile, el flujo
+                       queda asociado al hash del contenido y se reutiliza si se vuelve a pedir
+                       el mismo código.
+        :return: Un TokenStream con los mismos tokens que Tokenizador.obtener_tokens_del_codigo_linea_por_linea
+                 (los espacios no se guardan).
+        """
+        fuente = None
+        if isinstance(codigo, SourceFile):
+            fuente = codigo
+            ultimo = cls._ultimo
+            if ultimo is not None and ultimo[0] == fuente.hash:
+                return ultimo[1]
+            codigo = fuente.texto
+
+        flujo = cls(codigo, fuente)
+        flujo._tokenizar()
+        if fuente is not None:
+            cls._ultimo = (fuente.hash, flujo)
+        return flujo
+
+    def _tokenizar(self, patron=None) -> None:
+        cls = type(self)
+        codigo = self.codigo
+        patron = patron or cls._PATRON_FASES
+        plano = patron is cls._PATRON_FASES_PLANO     # <-- Cadenas y comentarios pueden cruzar de línea
+        id_tipo = {tipo: i for i, tipo in enumerate(cls.TIPOS)}
+        tipo_por_grupo = {grupo: id_tipo[tipo] for grupo, tipo in cls._TIPO_POR_GRUPO.items()}
+
+        tipos, inicios, finales, lineas = self.tipos, self.inicios, self.finales, self.lineas
+        id_simbolo, primer_token_linea = self.id_simbolo, self.primer_token_linea
+        linea = 1
+
+        if codigo:
+            primer_token_linea.append(0)
+
+        for match in patron.finditer(codigo):
+            grupo = match.lastgroup
+
+            if grupo == "NUEVA_LINEA":
+                # splitlines() no genera una línea vacía después del último salto
+                if match.end() < len(codigo):
+                    primer_token_linea.append(len(tipos))
+                linea += 1
+                continue
+            if grupo == "ESPACIO":
+                continue
+
+            if grupo == "PALABRA":
+                texto = match.group()
+                if texto in cls.PALABRAS_RESERVADAS:
+                    tipo = id_tipo["RESERVADA"]
+                elif texto in cls.CONSTANTES_ESPECIALES:
+                    tipo = id_tipo["CONSTANTE"]
+                else:
+                    tipo = id_tipo["IDENTIFICADOR"]
+                id_simbolo.append(self._internar(texto))
+            elif grupo == "SIMBOLO":
+                tipo = id_tipo["OPERADOR"] if match.group() in cls.OPERADORES_ARITMETICOS else id_tipo["DELIMITADOR"]
+                id_simbolo.append(0)
+            else:
+                tipo = tipo_por_grupo[grupo]
+                id_simbolo.append(0)
+
+            tipos.append(tipo)
+            inicios.append(match.start())
+            finales.append(match.end())
+            lineas.append(linea)
+            if plano and grupo in ("CADENA", "COMENTARIO"):
+                linea += len(match.group().splitlines()) - 1
+
+        primer_token_linea.append(len(tipos))
+
+    def _internar(self, texto: str) -> int:
+        indice = self._indice_simbolo.get(texto)
+        if indice is None:
+            self.simbolos.append(sys.intern(texto))
+            indice = len(self.simbolos)
+            self._indice_simbolo[texto] = indice
+        return indice
+
+    #================== ACCESO ===================
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def lexema(self, k: int) -> str:
+        """Texto del token k, cortado del código fuente (o de la tabla de símbolos si es una palabra)."""
+        simbolo = self.id_simbolo[k]
+        if simbolo:
+            return self.simbolos[simbolo - 1]
+        return self.codigo[self.inicios[k]:self.finales[k]]
+
+    def tipo(self, k: int) -> str:
+        return self.TIPOS[self.tipos[k]]
+
+    def linea(self, k: int) -> int:
+        return self.lineas[k]
+
+    def numero_lineas(self) -> int:
+        return len(self.primer_token_linea) - 1
+
+    @property
+    def fuente(self) -> SourceFile:
+        """SourceFile del código (se arma la primera vez si el flujo se creó desde un str)."""
+        if self._fuente is None:
+            self._fuente = SourceFile(self.codigo)
+        return self._fuente
+
+    def posicion(self, k: int):
+        """
+        (linea, columna) del token k, las dos empezando en 1. Con k == len(self) devuelve la
+        posición del final del código (donde se ubica un error por falta de tokens).
+        """
+        offset = self.inicios[k] if k < len(self.tipos) else len(self.codigo)
+        return self.fuente.posicion(offset)
+
+    def vista_plana(self) -> "VistaPlana":
+        """
+        Vista de solo lectura con los lexemas de todos los tokens, en orden (entrada del parser):
+        los mismos que Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES).
+        """
+        plano = self._flujo_plano()
+        return VistaPlana(plano, 0, len(plano.tipos))
+
+    def _flujo_plano(self) -> "TokenStream":
+        if self._plano is None:
+            # Si cada '"' y cada '#' del código es el borde de una cadena o de un comentario de una
+            # línea, tokenizar el código completo da los mismos tokens. Si no (una comilla suelta,
+            # un comentario que sigue en otra línea...), se tokeniza de nuevo sin cortar en líneas.
+            id_tipo = type(self).TIPOS.index
+            if (self.codigo.count('"') == 2 * self.tipos.count(id_tipo("CADENA"))
+                    and self.codigo.count('#') == 2 * self.tipos.count(id_tipo("COMENTARIO"))):
+                self._plano = self
+            else:
+                self._plano = type(self)(self.codigo, self.fuente)
+                self._plano._tokenizar(type(self)._PATRON_FASES_PLANO)
+        return self._plano
+
+    def vista_lineas(self) -> "VistaLineas":
+        """Vista de solo lectura con una secuencia de lexemas por línea (semántico y optimización)."""
+        return VistaLineas(self)
+
+    def como_tuplas(self):
+        """Genera los tokens como tuplas (linea, token, tipo), el formato del analizador léxico."""
+        for k in range(len(self.tipos)):
+            yield self.lineas[k], self.lexema(k), self.TIPOS[self.tipos[k]]
+
+    def memoria_aproximada(self) -> int:
+        """Bytes ocupados por los arreglos del flujo (sin contar el código fuente)."""
+        arreglos = (self.tipos, self.inicios, self.finales, self.lineas, self.id_simbolo, self.primer_token_linea)
+        return sum(a.itemsize * len(a) for a in arreglos) + sum(sys.getsizeof(s) for s in self.simbolos)
+
+
+class VistaPlana(Sequence):
+    """
+    Rango de tokens de un TokenStream visto como una secuencia de strings.
+    Los cortes (vista[a:b]) devuelven listas nuevas; los índices leen el lexema al vuelo.
+    """
+
+    def __init__(self, flujo: TokenStream, inicio: int, fin: int):
+        self.flujo = flujo
+        self.inicio = inicio
+        self.fin = fin
+
+    def __len__(self) -> int:
+        return self.fin - self.inicio
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.flujo.lexema(self.inicio + k) for k in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de token fuera de rango")
+        return self.flujo.lexema(self.inicio + indice)
+
+    def posicion(self, indice: int):
+        """(linea, columna) del token indice de la vista; indice == len(vista) es el final."""
+        if not 0 <= indice <= len(self):
+            raise IndexError("Índice de token fuera de rango")
+        return self.flujo.posicion(self.inicio + indice)
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, Sequence) and not isinstance(otra, str):
+            return len(self) == len(otra) and all(a == b for a, b in zip(self, otra))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self[:])
+
+
+class VistaLineas(Sequence):
+    """Secuencia de líneas de un TokenStream; cada línea es una VistaPlana de sus tokens."""
+
+    def __init__(self, flujo: TokenStream):
+        self.flujo = flujo
+
+    def __len__(self) -> int:
+        return self.flujo.numero_lineas()
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[k] for k in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de línea fuera de rango")
+        primeros = self.flujo.primer_token_linea
+        return VistaPlana(self.flujo, primeros[indice], primeros[indice + 1])
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, Sequence) and not isinstance(otra, str):
+            return len(self) == len(otra) and all(a == b for a, b in zip(self, otra))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr([linea[:] for linea in self])
@@ -0,0 +1,304 @@
+import sqlite3
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+
+class TrazaSintactica(Sequence):
+    """
+    Traza del analizador sintáctico guardada como diferencias entre estados consecutivos.
+
+    Por cada paso se guarda S, I, la regla, la alternativa en uso y los cambios de las pilas
+    A_copy y B: cuántos símbolos se sacaron y qué símbolos se apilaron. Los símbolos se
+    internan (cada uno se guarda una vez y los cambios usan su número) y los cambios se
+    codifican en base 128, como los deltas de IndiceTokens. Cada tanto se guarda un punto de
+    control con las dos pilas completas: cuando pasaron al menos `cada` pasos y los cambios
+    acumulados desde el anterior ya ocupan tanto como las pilas. Así los puntos de control nunca
+    ocupan más que los cambios, aunque la pila A crezca con todo lo consumido.
+
+    Como secuencia, cada elemento es la fila [S, I, REGLA, lista_A, lista_B] de
+    exportar_estados_tabla(); se reconstruye al pedirla desde el punto de control anterior.
+    Leer las filas en orden (como hace la tabla) reutiliza la última reconstrucción.
+
+    Con `archivo`, los pasos se escriben en una base SQLite en lugar de quedar en memoria. Los
+    analizadores la cierran con cerrar() al terminar; si después se piden filas la conexión se
+    vuelve a abrir, y se puede usar como administrador de contexto (with) para cerrarla.
+    """
+
+    def __init__(self, cada: int = 1000, archivo: str = None):
+        """
+        :param cada: Mínimo de pasos entre puntos de control (más chico = filas más rápidas, más memoria).
+        :param archivo: Ruta de una base SQLite donde volcar la traza; None la deja en memoria.
+        """
+        if cada < 1:
+            raise ValueError("cada debe ser al menos 1")
+
+        self.cada = cada
+        self.archivo = archivo
+        self.total = 0
+
+        self.pasos_control = array('I')     # <-- Pasos que tienen punto de control, en orden
+        self._bytes_desde_control = 0
+
+        self.simbolos = []
+        self._id_simbolo = {}
+
+        # Estado anterior (para calcular el siguiente cambio) y última fila reconstruida
+        self._anterior = None
+        self._reconstruida = None
+
+        self._conexion = None
+        if archivo is not None:
+            self._conexion = sqlite3.connect(archivo)
+            self._conexion.executescript(
+                "DROP TABLE IF EXISTS pasos;"
+                "DROP TABLE IF EXISTS puntos_control;"
+                "DROP TABLE IF EXISTS simbolos;"
+                "CREATE TABLE pasos (paso INTEGER PRIMARY KEY, s INTEGER, i INTEGER, r INTEGER,"
+                " alternativa INTEGER, cambios BLOB);"
+                "CREATE TABLE puntos_control (paso INTEGER PRIMARY KEY, a BLOB, b BLOB);"
+                "CREATE TABLE simbolos (id INTEGER PRIMARY KEY, simbolo TEXT);"
+            )
+            self._pendientes = []
+            self._pendientes_control = []
+            self._simbolos_guardados = 0
+        else:
+            self.s = array('I')
+            self.i = array('I')
+            self.r = array('I')
+            self.alternativas = array('i')
+            self.inicios = array('I')       # <-- Dónde empiezan los cambios de cada paso
+            self.cambios = bytearray()
+            self.puntos_control = {}
+
+    #================== REGISTRO ===================
+    def registrar(self, estado) -> None:
+        """Agrega un paso a partir del Estado (con pilas persistentes) al que llegó el analizador."""
+        anterior = self._anterior
+        self._anterior = estado
+
+        if anterior is None:
+            sacados_a, apilados_a = 0, estado.lista_a_copy()
+            sacados_b, apilados_b = 0, estado.lista_b()[::-1]
+        else:
+            sacados_a, apilados_a = self._diferencia(anterior.a_copy, estado.a_copy)
+            sacados_b, apilados_b = self._diferencia(anterior.b, estado.b)
+
+        internar = self._internar
+        valores = [sacados_a, len(apilados_a)]
+        valores.extend(map(internar, apilados_a))
+        valores.append(sacados_b)
+        valores.append(len(apilados_b))
+        valores.extend(map(internar, apilados_b))
+
+        if max(valores) < 0x80:
+            cambios = bytes(valores)        # <-- Lo normal: todos los valores caben en un byte
+        else:
+            cambios = bytearray()
+            for valor in valores:
+                self._codificar(cambios, valor)
+
+        paso = self.total
+        alternativa = estado.alternativas.tope if estado.alternativas else -1
+        s, r = self._internar(estado.s), self._internar(estado.r)
+
+        self._bytes_desde_control += len(cambios)
+        if paso == 0 or (paso - self.pasos_control[-1] >= self.cada and
+                         self._bytes_desde_control >= len(estado.a_copy) + len(estado.b)):
+            pila_a = array('I', [self._internar(x) for x in estado.lista_a_copy()])
+            pila_b = array('I', [self._internar(x) for x in estado.lista_b()[::-1]])
+            self.pasos_control.append(paso)
+            self._bytes_desde_control = 0
+        else:
+            pila_a = pila_b = None
+
+        if self.archivo is None:
+            self.s.append(s)
+            self.i.append(estado.i)
+            self.r.append(r)
+            self.alternativas.append(alternativa)
+            self.inicios.append(len(self.cambios))
+            self.cambios.extend(cambios)
+            if pila_a is not None:
+                self.puntos_control[paso] = (pila_a, pila_b)
+        else:
+            self._pendientes.append((paso, s, estado.i, r, alternativa, bytes(cambios)))
+            if pila_a is not None:
+                self._pendientes_control.append((paso, pila_a.tobytes(), pila_b.tobytes()))
+            if len(self._pendientes) >= 4096:
+                self.volcar()
+
+        self.total += 1
+
+    @staticmethod
+    def _diferencia(anterior, nueva):
+        """
+        Cambios para pasar de una pila a otra: (sacados, apilados del fondo al tope). Como las
+        pilas comparten celdas, basta con avanzar hasta la primera celda en común.
+        """
+        sacados = 0
+        apilados = []
+        while anterior._tamano > nueva._tamano:
+            anterior = anterior.resto
+            sacados += 1
+        while nueva._tamano > anterior._tamano:
+            apilados.append(nueva.tope)
+            nueva = nueva.resto
+        while anterior is not nueva and anterior._tamano:
+            anterior = anterior.resto
+            sacados += 1
+            apilados.append(nueva.tope)
+            nueva = nueva.resto
+        apilados.reverse()
+        return sacados, apilados
+
+    def _internar(self, simbolo) -> int:
+        indice = self._id_simbolo.get(simbolo)
+        if indice is None:
+            indice = len(self.simbolos)
+            self.simbolos.append(simbolo)
+            self._id_simbolo[simbolo] = indice
+        return indice
+
+    @staticmethod
+    def _codificar(datos: bytearray, valor: int) -> None:
+        while valor >= 0x80:
+            datos.append((valor & 0x7F) | 0x80)
+            valor >>= 7
+        datos.append(valor)
+
+    def _conectar(self):
+        # La conexión se abre de nuevo si ya se había cerrado (para leer filas o seguir registrando)
+        if self._conexion is None:
+            self._conexion = sqlite3.connect(self.archivo)
+        return self._conexion
+
+    def volcar(self) -> None:
+        """Escribe en la base SQLite los pasos pendientes."""
+        if self.archivo is None or (self._conexion is None and not self._pendientes):
+            return
+        conexion = self._conectar()
+        conexion.executemany("INSERT INTO pasos VALUES (?, ?, ?, ?, ?, ?)", self._pendientes)
+        conexion.executemany("INSERT INTO puntos_control VALUES (?, ?, ?)", self._pendientes_control)
+        conexion.executemany(
+            "INSERT INTO simbolos VALUES (?, ?)",
+            [(k, str(self.simbolos[k])) for k in range(self._simbolos_guardados, len(self.simbolos))]
+        )
+        conexion.commit()
+        self._simbolos_guardados = len(self.simbolos)
+        self._pendientes = []
+        self._pendientes_control = []
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y cierra la base SQLite (si la hay). Pedir filas después la vuelve a abrir."""
+        if self._conexion is not None:
+            self.volcar()
+            self._conexion.close()
+            self._conexion = None
+
+    def __enter__(self) -> "TrazaSintactica":
+        return self
+
+    def __exit__(self, *_excepcion) -> None:
+        self.cerrar()
+
+    #================== CONSULTAS ===================
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._fila(k) for k in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de paso fuera de rango")
+        return self._fila(indice)
+
+    def _fila(self, paso: int) -> list:
+        s, i, r, _alternativa, _cambios = self._paso(paso)
+        pila_a, pila_b = self._pilas(paso)
+        simbolos = self.simbolos
+        return [
+            simbolos[s], i, simbolos[r],
+            [simbolos[x] for x in pila_a],
+            [simbolos[x] for x in reversed(pila_b)]
+        ]
+
+    def _pilas(self, paso: int):
+        # Pilas como listas de ids con el tope al final, reconstruidas desde el punto de control
+        reconstruida = self._reconstruida
+        control = self.pasos_control[bisect_right(self.pasos_control, paso) - 1]
+        if reconstruida is not None and control <= reconstruida[0] <= paso:
+            desde, pila_a, pila_b = reconstruida
+        else:
+            desde = control
+            a, b = self._punto_control(control)
+            pila_a, pila_b = list(a), list(b)
+
+        for k in range(desde + 1, paso + 1):
+            self._aplicar(self._paso(k)[4], pila_a, pila_b)
+
+        self._reconstruida = (paso, pila_a, pila_b)
+        return pila_a, pila_b
+
+    @staticmethod
+    def _aplicar(cambios, pila_a, pila_b) -> None:
+        valores = []
+        valor = desplazamiento = 0
+        for byte in cambios:
+            valor |= (byte & 0x7F) << desplazamiento
+            if byte & 0x80:
+                desplazamiento += 7
+                continue
+            valores.append(valor)
+            valor = desplazamiento = 0
+
+        k = 0
+        for pila in (pila_a, pila_b):
+            sacados, cantidad = valores[k], valores[k + 1]
+            if sacados:
+                del pila[-sacados:]
+            pila.extend(valores[k + 2:k + 2 + cantidad])
+            k += 2 + cantidad
+
+    def _paso(self, paso: int):
+        if self.archivo is None:
+            fin = self.inicios[paso + 1] if paso + 1 < self.total else len(self.cambios)
+            return (self.s[paso], self.i[paso], self.r[paso], self.alternativas[paso],
+                    self.cambios[self.inicios[paso]:fin])
+
+        if self._pendientes and paso >= self._pendientes[0][0]:
+            return self._pendientes[paso - self._pendientes[0][0]][1:]
+        return self._conectar().execute(
+            "SELECT s, i, r, alternativa, cambios FROM pasos WHERE paso = ?", (paso,)
+        ).fetchone()
+
+    def _punto_control(self, paso: int):
+        if self.archivo is None:
+            return self.puntos_control[paso]
+
+        for pendiente in self._pendientes_control:
+            if pendiente[0] == paso:
+                _paso, a, b = pendiente
+                break
+        else:
+            a, b = self._conectar().execute(
+                "SELECT a, b FROM puntos_control WHERE paso = ?", (paso,)
+            ).fetchone()
+        pila_a, pila_b = array('I'), array('I')
+        pila_a.frombytes(a)
+        pila_b.frombytes(b)
+        return pila_a, pila_b
+
+    def alternativa(self, paso: int) -> int:
+        """Índice de la alternativa en uso en ese paso (-1 si no había ninguna)."""
+        return self._paso(paso)[3]
+
+    def memoria_aproximada(self) -> int:
+        """Bytes ocupados en memoria por los pasos (sin contar los símbolos)."""
+        if self.archivo is not None:
+            return sum(len(p[5]) + 48 for p in self._pendientes)
+        arreglos = (self.s, self.i, self.r, self.alternativas, self.inicios)
+        control = sum(a.itemsize * len(a) + b.itemsize * len(b) for a, b in self.puntos_control.values())
+        return sum(a.itemsize * len(a) for a in arreglos) + len(self.cambios) + control
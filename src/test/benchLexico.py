@@ -0,0 +1,63 @@
+import gc
+import sys
+import time
+
+from src.compiler.LexicalAnalizer import LexicalAnalizerForMy, NUMPY_DISPONIBLE
+
+
+# Bloque de instrucciones que se repite para generar un programa grande
+bloque = [
+    "    entero a, b, suma;",
+    "    decimal precio;",
+    "    palabra saludo;",
+    "    a = 10;",
+    "    b = a * 2 + 3.14;",
+    '    saludo = "Hola Pitufo";',
+    "    # Este es un comentario #",
+    '    ocultar("La suma es: ", suma);',
+    "    borrar precio;",
+    "    x = 8hola + 3.14.15;",
+]
+
+# Número de líneas del programa generado (se puede pasar como argumento)
+num_lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+lineas = ["fin"]
+while len(lineas) < num_lineas - 1:
+    lineas.extend(bloque)
+lineas.append("inicio")
+codigo = "\n".join(lineas)
+
+print(f"Líneas generadas: {len(lineas)}")
+
+modos = ["multipaso", "un_paso", "dfa"]
+if NUMPY_DISPONIBLE:
+    modos.append("numpy")
+
+resultados = {}
+for modo in modos:
+    analizador = LexicalAnalizerForMy(codigo, modo=modo)
+
+    # El GC generacional recorre millones de tuplas vivas y distorsiona la medición
+    gc.collect()
+    gc.disable()
+    inicio = time.perf_counter()
+    analizador.analizar_codigo()
+    duracion = time.perf_counter() - inicio
+    gc.enable()
+
+    resultados[modo] = (list(analizador.tokens_clasificados), list(analizador.errores_lexicos))
+    print(f"{modo:<10} -> {duracion:.2f} s  ({len(analizador.tokens_clasificados)} tokens)")
+
+print("Mismos tokens y errores:", all(resultado == resultados["multipaso"] for resultado in resultados.values()))
+
+# Mismo código repartido en fragmentos entre todos los núcleos
+gc.collect()
+gc.disable()
+inicio = time.perf_counter()
+paralelo = LexicalAnalizerForMy.analizar_en_paralelo(codigo)
+duracion = time.perf_counter() - inicio
+gc.enable()
+
+print(f"{'paralelo':<10} -> {duracion:.2f} s  ({len(paralelo.tokens_clasificados)} tokens)")
+print("Paralelo igual a un_paso:", (paralelo.tokens_clasificados, paralelo.errores_lexicos) == resultados["un_paso"])
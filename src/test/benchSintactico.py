@@ -0,0 +1,69 @@
+import gc
+import sys
+import time
+
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.models.Estado import Estado
+from src.util.EspecificacionLexica import PATRONES_FASES
+from src.util.Tokenizador import Tokenizador
+
+
+class AnalizadorSintacticoRegex(AnalizadorSintactico):
+    """Concordancia como antes de los ids de terminales: compila y evalúa la regex en cada paso."""
+
+    def concordancia_de_un_simbolo(self) -> bool:
+        if self.estado_actual.s != "n" or self.estado_actual.i >= len(self.tokens):
+            return False
+
+        token_de_la_lista = self.tokens[self.estado_actual.i]
+        token_de_la_pila = self.estado_actual.b.tope
+
+        if (Tokenizador.es_regex_valida(token_de_la_pila) and
+                Tokenizador.cumple_patron(token_de_la_lista, token_de_la_pila) and
+                self.gramatica.es_terminal(token_de_la_pila)) or \
+                (self.gramatica.es_terminal(token_de_la_pila) and token_de_la_lista == token_de_la_pila):
+            self.contador_global += 1
+            self.indice_mas_lejano = max(self.indice_mas_lejano, self.contador_global)
+            self.agregar_estado(
+                Estado("n", self.contador_global, "2", self.estado_actual.a.apilar(token_de_la_pila),
+                       self.estado_actual.b.resto, self.estado_actual.a_copy.apilar(token_de_la_lista),
+                       self.estado_actual.alternativas)
+            )
+            return True
+
+        self.agregar_estado(
+            Estado("r", self.contador_global, "4", self.estado_actual.a, self.estado_actual.b, self.estado_actual.a_copy,
+                   self.estado_actual.alternativas)
+        )
+        return False
+
+
+# Bloque de instrucciones que se repite para generar el programa
+bloque = [
+    "entero a, b, suma;",
+    "a = 10;",
+    "b = a * 2 + 3.14;",
+    'ocultar("La suma es: ", suma);',
+    "# Este es un comentario #",
+    "borrar b;",
+]
+
+# Número de repeticiones del bloque (se puede pasar como argumento)
+repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+codigo = "fin\n" + "\n".join(bloque * repeticiones) + "\ninicio"
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+print(f"Tokens: {len(lista_tokens)}")
+
+for nombre, clase in (("regex por paso", AnalizadorSintacticoRegex), ("ids de terminales", AnalizadorSintactico)):
+    analizador = clase(lista_tokens, registrar_estados=False)
+
+    gc.collect()
+    gc.disable()
+    inicio = time.perf_counter()
+    resultado = analizador.analizar()
+    duracion = time.perf_counter() - inicio
+    gc.enable()
+
+    print(f"{nombre:<18} -> {resultado}  {analizador.pasos} pasos en {duracion:.2f} s "
+          f"({analizador.pasos / duracion:,.0f} pasos/s)")
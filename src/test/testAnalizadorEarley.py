@@ -0,0 +1,50 @@
+import time
+
+from src.compiler.AnalizadorEarley import AnalizadorEarley
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.util.EspecificacionLexica import PATRONES_FASES
+from src.util.Gramatica import Gramatica
+from src.util.Tokenizador import Tokenizador
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + numero2 * 2;
+ocultar ("Dame un numero", numero1);
+borrar numero2;
+# Este es un comentario #
+inicio"""
+
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+
+# Con la gramática del lenguaje acepta lo mismo que los otros modos
+print(AnalizadorSintactico(lista_tokens, modo="packrat").analizar())
+print(AnalizadorSintactico(lista_tokens, modo="earley").analizar())
+
+# Error: falta la expresión después del '+'
+lista_tokens = Tokenizador.obtener_tokens_del_codigo("fin\nnumero1 = 3 + ;\ninicio", PATRONES_FASES)
+earley = AnalizadorEarley(lista_tokens)
+print(earley.analizar(), earley.posicion_error(), earley.esperados)
+
+# Gramática ambigua y recursiva por la izquierda (el retroceso no termina con ella)
+gramatica = Gramatica()
+gramatica.establecer_gramatica({
+    "programa": [["expresion"]],
+    "expresion": [["expresion", "+", "expresion"], ["expresion", "*", "expresion"], ["[0-9]+"]],
+})
+for tokens in (["1", "+", "2", "*", "3"], ["1", "+", "*", "3"]):
+    analizador = AnalizadorSintactico(tokens, modo="earley", gramatica=gramatica)
+    print(tokens, analizador.analizar(), analizador.indice_mas_lejano)
+
+# Producciones vacías
+gramatica.establecer_gramatica({"programa": [["(", "lista", ")"]], "lista": [["lista", "x"], []]})
+for tokens in (["(", ")"], ["(", "x", "x", ")"], ["(", "x"]):
+    print(tokens, AnalizadorEarley(tokens, gramatica).analizar())
+
+# Programa largo: lineal gracias a los ítems de Leo en lista_instrucciones
+codigo = "fin\n" + "\n".join("entero x, y;\nx = 3 + y * 2;\nocultar (x, 3);" for _ in range(2000)) + "\ninicio"
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+for modo in ("packrat", "earley"):
+    inicio = time.perf_counter()
+    resultado = AnalizadorSintactico(lista_tokens, modo=modo, registrar_estados=False).analizar()
+    print(modo, resultado, f"{time.perf_counter() - inicio:.3f} s")
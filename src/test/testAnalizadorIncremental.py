@@ -0,0 +1,36 @@
+import time
+
+from src.compiler.AnalizadorIncremental import AnalizadorIncremental
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + numero2 * 2;
+ocultar ("Dame un numero", numero1);
+# Este es un comentario #
+inicio"""
+
+incremental = AnalizadorIncremental(codigo)
+print(incremental.analizar(), len(incremental.lexemas), "instrucciones")
+
+# Borrar el '2' de la asignación: solo se vuelve a analizar esa instrucción
+posicion = codigo.index("* 2")
+print(incremental.editar(posicion + 2, posicion + 3, ""), incremental.reanalizadas, incremental.posicion_error())
+
+# Volver a escribirlo
+print(incremental.editar(posicion + 2, posicion + 2, "2"), incremental.reanalizadas, incremental.errores)
+
+# Borrar un ';' une la instrucción con la siguiente
+posicion = incremental.texto.index(";")
+print(incremental.editar(posicion, posicion + 1, ""), incremental.reanalizadas, incremental.errores)
+
+# Programa largo: el tiempo de una edición depende de la edición, no del archivo
+codigo = "fin\n" + "\n".join("entero x, y;\nx = 3 + y * 2;\nocultar (x, 3);" for _ in range(5000)) + "\ninicio"
+incremental = AnalizadorIncremental(codigo)
+inicio = time.perf_counter()
+print("completo", incremental.analizar(), f"{time.perf_counter() - inicio:.3f} s")
+
+posicion = codigo.index("y * 2", len(codigo) // 2)
+inicio = time.perf_counter()
+print("edicion", incremental.editar(posicion, posicion + 1, "z"), incremental.reanalizadas,
+      f"{time.perf_counter() - inicio:.4f} s")
@@ -0,0 +1,37 @@
+import time
+
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.util.EspecificacionLexica import PATRONES_FASES
+from src.util.Tokenizador import Tokenizador
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + numero2 * 2;
+ocultar ("Dame un numero", numero1);
+borrar numero2;
+# Este es un comentario #
+inicio"""
+
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+
+# El modo packrat debe aceptar lo mismo que el retroceso normal
+print(AnalizadorSintactico(lista_tokens).analizar())
+packrat = AnalizadorSintactico(lista_tokens, modo="packrat")
+print(packrat.analizar())
+
+for fila in packrat.exportar_estados_tabla()[:10]:
+    print(fila)
+
+# Error: falta la expresión después del '+'
+lista_tokens = Tokenizador.obtener_tokens_del_codigo("fin\nnumero1 = 3 + ;\ninicio", PATRONES_FASES)
+packrat = AnalizadorSintactico(lista_tokens, modo="packrat")
+print(packrat.analizar(), packrat.posicion_error())
+
+# Programa largo: con memorización cada (no_terminal, indice) se analiza una sola vez
+codigo = "fin\n" + "\n".join("entero x, y;\nx = 3 + y * 2;\nocultar (x, 3);" for _ in range(300)) + "\ninicio"
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+for modo in ("retroceso", "packrat"):
+    inicio = time.perf_counter()
+    resultado = AnalizadorSintactico(lista_tokens, modo=modo, registrar_estados=False).analizar()
+    print(modo, resultado, f"{time.perf_counter() - inicio:.3f} s")
@@ -0,0 +1,32 @@
+import time
+
+from src.compiler.AnalizadorParalelo import AnalizadorParalelo
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.util.EspecificacionLexica import PATRONES_FASES
+from src.util.Tokenizador import Tokenizador
+
+
+if __name__ == "__main__":     # <-- Necesario para ProcessPoolExecutor en Windows
+    codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + ;
+ocultar ("Dame un numero", numero1);
+borrar ;
+# Este es un comentario #
+inicio"""
+
+    lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+
+    # Se informan los errores de todas las instrucciones, con índices del programa completo
+    paralelo = AnalizadorParalelo(lista_tokens, tokens_minimos=1)
+    print(paralelo.analizar(), paralelo.errores)
+    for inicio, indice in paralelo.errores:
+        print(lista_tokens[inicio:indice + 1])
+
+    # Programa largo: mismo resultado que packrat sobre el programa completo
+    codigo = "fin\n" + "\n".join("entero x, y;\nx = 3 + y * 2;\nocultar (x, 3);" for _ in range(5000)) + "\ninicio"
+    lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+    for modo in ("packrat", "paralelo"):
+        inicio = time.perf_counter()
+        resultado = AnalizadorSintactico(lista_tokens, modo=modo, registrar_estados=False).analizar()
+        print(modo, resultado, f"{time.perf_counter() - inicio:.3f} s")
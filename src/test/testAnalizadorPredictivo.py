@@ -0,0 +1,49 @@
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.util.EspecificacionLexica import PATRONES_FASES
+from src.util.GramaticaLL1 import GramaticaLL1
+from src.util.Tokenizador import Tokenizador
+
+
+gramatica = GramaticaLL1()
+
+# Gramática factorizada
+for no_terminal, producciones in gramatica.producciones.items():
+    print(no_terminal, "->", " | ".join(gramatica.mostrar_produccion(p) for p in producciones))
+
+# La tabla no tiene celdas dobles, pero las palabras reservadas también cumplen el patrón de
+# identificador: esos solapamientos se informan como conflictos y la gramática no es LL(1)
+print(gramatica.conflictos)
+print(gramatica.es_ll1())
+print(gramatica.describir_conflictos())
+
+print(gramatica.primeros["expresion"])
+print(gramatica.siguientes["expresion"])
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + numero2;
+ocultar ("Dame un numero", numero1);
+borrar numero2;
+# Este es un comentario #
+inicio"""
+
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
+
+# Los dos modos deben aceptar el mismo código
+print(AnalizadorSintactico(lista_tokens).analizar())
+predictivo = AnalizadorSintactico(lista_tokens, modo="ll1")
+print(predictivo.analizar())
+
+for fila in predictivo.exportar_estados_tabla()[:10]:
+    print(fila)
+
+# Error: falta la expresión después del '+'
+lista_tokens = Tokenizador.obtener_tokens_del_codigo("fin\nnumero1 = 3 + ;\ninicio", PATRONES_FASES)
+predictivo = AnalizadorSintactico(lista_tokens, modo="ll1")
+print(predictivo.analizar(), predictivo.posicion_error())
+
+# El modo ll1 toma 'entero' siempre como la palabra reservada: rechaza la asignación a una
+# variable llamada 'entero' que el retroceso sí acepta
+lista_tokens = Tokenizador.obtener_tokens_del_codigo("fin\nentero = x ;\ninicio", PATRONES_FASES)
+print(AnalizadorSintactico(lista_tokens).analizar(), AnalizadorSintactico(lista_tokens, modo="ll1").analizar())
@@ -1,5 +1,6 @@
 
 from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.util.EspecificacionLexica import PATRONES_FASES
 from src.util.Tokenizador import Tokenizador
 from src.view.components.TablaAnalizisSintactico import TablaAnalizisSintactico
 
@@ -28,22 +29,8 @@ codigo = """fin
 palabra suma, numero1, numero2
 inicio"""
 
-patrones = [
-    r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con punto (ej: 3.14hola)
-    r'\d+[a-zA-Z_][a-zA-Z0-9_]*',    # palabras con número (ej: 8hola)
-    r'\d+(\.\d+){2,}',               # número con más de un punto (ej: 3.14.15)
-    r'\d+\.\d+',                     # decimal válido (3.14)
-    r'\d+\.',                        # decimal incompleto (8.)
-    r'[a-zA-Z_][a-zA-Z0-9_]*',       # identificador válido
-    r'\d+',                          # entero válido
-    r'"[^"]*"',                      # ✅ cadena entre comillas
-    r'#.*?#',  # comentario entre almohadillas
-    r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])',  # delimitadores clásicos
-    r'(\s)'                          # espacio en blanco
-]
-
-
-lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, patrones)
+
+lista_tokens = Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES)
 #print(lista_tokens)
 
 
@@ -0,0 +1,38 @@
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.models.TokenStream import TokenStream
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + numero2 * 2; ocultar ("Dame un numero", numero1);
+borrar numero2;
+# Este es un comentario #
+inicio"""
+
+tokens = TokenStream.desde_codigo(codigo).vista_plana()
+
+# El parser arma el árbol de sintaxis concreta al aceptar el programa
+analizador = AnalizadorSintactico(tokens, registrar_estados=False)
+print(analizador.analizar())
+arbol = analizador.obtener_arbol()
+print(arbol)
+
+# Cada nodo guarda su rango de tokens: las fases siguientes leen lexemas y posiciones del árbol
+for instruccion in arbol.instrucciones():
+    print(arbol.posicion(instruccion), arbol.lexemas(instruccion))
+for asignacion in arbol.buscar("asignacion"):
+    print(asignacion.inicio, asignacion.fin, arbol.lexemas(asignacion))
+
+# El mismo árbol con recuperación de errores y en modo packrat
+for opciones in ({"recuperar_errores": True}, {"modo": "packrat"}):
+    otro = AnalizadorSintactico(tokens, registrar_estados=False, **opciones)
+    print(opciones, otro.analizar(), str(otro.obtener_arbol()) == str(arbol))
+
+# Sin análisis exitoso no hay árbol
+analizador = AnalizadorSintactico(TokenStream.desde_codigo("fin\nnumero1 = 3 + ;\ninicio").vista_plana())
+print(analizador.analizar(), analizador.obtener_arbol())
+
+# Un programa largo anida lista_instrucciones miles de niveles: el árbol se arma y se muestra sin recursión
+codigo = "fin\n" + "\n".join("x = 3 + y;" for _ in range(3000)) + "\ninicio"
+analizador = AnalizadorSintactico(TokenStream.desde_codigo(codigo).vista_plana(), modo="packrat", registrar_estados=False)
+print(analizador.analizar(), len(str(analizador.obtener_arbol()).splitlines()))
@@ -0,0 +1,21 @@
+from src.util.Gramatica import Gramatica
+from src.util.GramaticaCompilada import GramaticaCompilada
+
+# Gramática compilada: ids enteros, anulables, PRIMEROS y SIGUIENTES como bits (se guarda en la caché)
+compilada = GramaticaCompilada.obtener()
+print(compilada.es_no_terminal('identificador'), compilada.es_terminal('='))
+print(compilada.expansiones['lista_instrucciones'])
+print(compilada.primeros_de('instruccion'))
+print(compilada.siguientes_de('expresion'))
+
+# Con producciones vacías
+gramatica = Gramatica()
+gramatica.establecer_gramatica({"programa": [["(", "lista", ")"]], "lista": [["lista", "x"], []]})
+compilada = GramaticaCompilada.obtener(gramatica)
+print(compilada.es_anulable("lista"), compilada.primeros_de("programa"), compilada.siguientes_de("lista"))
+
+# Es inmutable
+try:
+    compilada.inicial = "otra"
+except AttributeError as error:
+    print(error)
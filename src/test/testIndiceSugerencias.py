@@ -0,0 +1,60 @@
+import difflib
+import random
+import string
+
+from src.compiler.LexicalAnalizer import LexicalAnalizerForMy
+from src.util.EspecificacionLexica import PALABRAS_RESERVADAS, CONSTANTES_ESPECIALES, OPERADORES_ARITMETICOS
+from src.util.IndiceSugerencias import IndiceSugerencias
+
+
+def esperado(token, universo, cutoff=0.7):
+    sugeridas = difflib.get_close_matches(token, universo, n=1, cutoff=cutoff)
+    return sugeridas[0] if sugeridas else None
+
+
+def mutar(palabra, alfabeto):
+    """Aplica de 0 a 3 cambios al azar: insertar, borrar, reemplazar o trasponer."""
+    letras = list(palabra)
+    for _ in range(random.randint(0, 3)):
+        k = random.randint(0, len(letras))
+        cambio = random.choice(("insertar", "borrar", "reemplazar", "trasponer"))
+        if cambio == "insertar" or not letras:
+            letras.insert(k, random.choice(alfabeto))
+        elif cambio == "borrar":
+            del letras[min(k, len(letras) - 1)]
+        elif cambio == "reemplazar":
+            letras[min(k, len(letras) - 1)] = random.choice(alfabeto)
+        elif len(letras) > 1:
+            k = min(k, len(letras) - 2)
+            letras[k], letras[k + 1] = letras[k + 1], letras[k]
+    return "".join(letras)
+
+
+random.seed(7)
+alfabeto = string.ascii_letters + string.digits + "_=+-*/"
+
+# Universo del analizador léxico: palabras reservadas, constantes y operadores
+universo = PALABRAS_RESERVADAS + CONSTANTES_ESPECIALES + OPERADORES_ARITMETICOS
+corpus = [mutar(palabra, alfabeto) for palabra in universo for _ in range(200)]
+corpus += ["".join(random.choices("=+-*/", k=random.randint(2, 4))) for _ in range(500)]  # secuencias de operadores
+corpus += ["".join(random.choices(alfabeto, k=random.randint(1, 12))) for _ in range(500)]
+corpus += ["", "fin", "inicio", "=="]
+
+analizador = LexicalAnalizerForMy("")
+diferentes = [t for t in corpus if analizador.sugerencia_token(t) != esperado(t, universo)]
+print(len(corpus), diferentes[:5])
+# 4604 []
+
+# Un universo más grande y otros cutoff (el radio del árbol BK depende del cutoff)
+palabras = list(dict.fromkeys("".join(random.choices(string.ascii_lowercase, k=random.randint(1, 10))) for _ in range(500)))
+consultas = [mutar(random.choice(palabras), string.ascii_lowercase) for _ in range(300)]
+for cutoff in (0.0, 0.4, 0.6, 0.7, 0.9, 1.0):
+    indice = IndiceSugerencias(palabras, cutoff=cutoff)
+    diferentes = [t for t in consultas if indice.sugerir(t) != esperado(t, palabras, cutoff)]
+    print(cutoff, diferentes[:5])
+# 0.0 []
+# 0.4 []
+# 0.6 []
+# 0.7 []
+# 0.9 []
+# 1.0 []
@@ -0,0 +1,30 @@
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.models.TokenStream import TokenStream
+from src.util.Gramatica import Gramatica
+
+
+# Gramática exponencial para el retroceso: s -> a s | a s b ... falla tarde y prueba todas las combinaciones
+class GramaticaExponencial(Gramatica):
+    def obtener_gramatica(self):
+        return {
+            "programa": [["s", "#"]],
+            "s": [["x", "s", "y"], ["x", "s"], ["x"]],
+        }
+
+tokens = ["x"] * 22 + ["z"]
+
+for limites in ({"max_pasos": 5000}, {"tiempo_limite": 0.05}, {"max_profundidad": 10}):
+    analizador = AnalizadorSintactico(tokens, gramatica=GramaticaExponencial(), registrar_estados=False, **limites)
+    exito, estadisticas = analizador.resultado()
+    print(limites, exito, estadisticas.detenido_por, estadisticas.pasos, f"{estadisticas.segundos:.3f} s")
+
+# Sin límites, en un programa correcto: contadores del análisis
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + 4;
+ocultar (numero1);
+inicio"""
+analizador = AnalizadorSintactico(TokenStream.desde_codigo(codigo).vista_plana(), max_pasos=100_000)
+exito, estadisticas = analizador.resultado()
+print(exito)
+print(estadisticas)
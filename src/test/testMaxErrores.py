@@ -0,0 +1,97 @@
+import random
+
+from src.compiler.LexicalAnalizer import LexicalAnalizerForMy
+
+
+def resumen(errores):
+    return [(e["linea"], e["token"]) for e in errores]
+
+
+if __name__ == "__main__":     # <-- Necesario para ProcessPoolExecutor en Windows
+    # Un token inválido cada dos líneas: líneas 2, 4, 6, 8, 10 y 12
+    lineas = ["fin"]
+    for k in range(12):
+        lineas.append(f"x{k} = {k}abc ;" if k % 2 == 0 else f"y{k} = {k} ;")
+    lineas.append("inicio")
+    codigo = "\n".join(lineas)
+
+    for modo in ("un_paso", "dfa", "multipaso", "numpy"):
+        completo = LexicalAnalizerForMy(codigo, modo=modo)
+        completo.analizar_codigo()
+        errores = completo.errores_lexicos
+
+        correctos = []
+        for tope in range(1, len(errores) + 2):
+            analizador = LexicalAnalizerForMy(codigo, modo=modo, max_errores=tope)
+            analizador.analizar_codigo()
+            truncados = analizador.errores_lexicos
+
+            if tope <= len(errores):
+                # Los primeros 'tope' errores y el aviso en la línea del último que se contó
+                aviso = truncados[-1]
+                correctos.append(
+                    truncados[:-1] == errores[:tope]
+                    and aviso["linea"] == errores[tope - 1]["linea"]
+                    and aviso["mensaje"].startswith(f"Se alcanzó el máximo de {tope} errores")
+                )
+            else:
+                correctos.append(truncados == errores)     # <-- Sin llegar al tope no hay aviso
+        print(modo, len(errores), all(correctos))
+    # un_paso 6 True
+    # dfa 6 True
+    # multipaso 6 True
+    # numpy 6 True
+
+    analizador = LexicalAnalizerForMy(codigo, max_errores=3)
+    analizador.analizar_codigo()
+    print(resumen(analizador.errores_lexicos))
+    # [(2, '0abc'), (4, '2abc'), (6, '4abc'), (6, '')]
+
+    # Los errores de la primera y la última línea se revisan al cerrar el recorrido y también respetan el tope
+    codigo_sin_inicio = "x = 1 ;\ny = 2abc ;\nz = 3abc ;"
+    analizador = LexicalAnalizerForMy(codigo_sin_inicio, max_errores=3)
+    analizador.analizar_codigo()
+    print(resumen(analizador.errores_lexicos))
+    # [(1, 'x = 1'), (3, 'z = 3abc'), (2, '2abc'), (3, '')]
+
+    # En paralelo el tope se aplica sobre el total de los fragmentos
+    for modo in ("un_paso", "dfa"):
+        paralelo = LexicalAnalizerForMy.analizar_en_paralelo(codigo, max_workers=3, modo=modo, max_errores=3, tam_minimo=10)
+        print(modo, resumen(paralelo.errores_lexicos))
+    # un_paso [(2, '0abc'), (4, '2abc'), (6, '4abc'), (6, '')]
+    # dfa [(2, '0abc'), (4, '2abc'), (6, '4abc'), (6, '')]
+
+    # Y corta donde lo haría el análisis del código completo: mismos tokens, índice y línea del aviso,
+    # aunque el error que llega al máximo esté a mitad de un fragmento o lo cierre el fragmento siguiente
+    # (una secuencia de operadores al final de una línea se cuenta en el primer token de la línea siguiente)
+    random.seed(3)
+    piezas = ["x", "y1", "3", "4.5", "3abc", "1.2.3", "++", "=-", "+", "=", "@", ";", ",", " ", "fin", "inicio", "$"]
+    codigos = [
+        "fin\nx = 1 ++\ny = 2abc ;\n\nz = 3 =-\n  \nw = @ ;\ninicio",
+        "fin\n" + "\n".join(f"x{k} = {k} ++" for k in range(10)) + "\ninicio",
+    ]
+    for _ in range(40):
+        lineas = [" ".join(random.choices(piezas, k=random.randint(0, 6))) for _ in range(random.randint(1, 20))]
+        codigos.append("\n".join(lineas))
+
+    iguales = []
+    for codigo_fuzz in codigos:
+        for modo in ("un_paso", "dfa", "numpy"):
+            for tope in (1, 2, 3, 5):
+                secuencial = LexicalAnalizerForMy(codigo_fuzz, modo=modo, max_errores=tope)
+                secuencial.analizar_codigo()
+                paralelo = LexicalAnalizerForMy.analizar_en_paralelo(codigo_fuzz, max_workers=4, modo=modo,
+                                                                     max_errores=tope, tam_minimo=1)
+                iguales.append(
+                    paralelo.tokens_clasificados == secuencial.tokens_clasificados
+                    and list(paralelo.indice_tokens) == list(secuencial.indice_tokens)
+                    and paralelo.errores_lexicos == secuencial.errores_lexicos     # <-- Incluye la línea del aviso
+                )
+    print(len(iguales), all(iguales))
+    # 504 True
+
+    try:
+        LexicalAnalizerForMy(codigo, max_errores=0)
+    except ValueError as error:
+        print(error)
+    # max_errores debe ser al menos 1
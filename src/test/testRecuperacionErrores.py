@@ -0,0 +1,48 @@
+import time
+
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.models.TokenStream import TokenStream
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + ;
+ocultar ("Dame un numero", numero1);
+borrar ;
+numero2 = numero1 * 2
+ocultar (numero2);
+inicio"""
+
+# Con recuperación se informan todos los errores, cada uno con su posición
+tokens = TokenStream.desde_codigo(codigo).vista_plana()
+analizador = AnalizadorSintactico(tokens, recuperar_errores=True)
+print(analizador.analizar())
+for inicio, indice in analizador.errores:
+    print(f"instrucción en el token {inicio}: error en '{tokens[indice]}'", tokens.posicion(indice))
+
+# Sin recuperación solo queda el primero, después de retroceder hasta 'programa'
+analizador = AnalizadorSintactico(tokens)
+print(analizador.analizar(), analizador.posicion_error())
+
+# Programa largo con un error: la recuperación no retrocede más allá de la instrucción
+codigo = "fin\n" + "\n".join("entero x, y;\nx = 3 + y * 2;\nocultar (x, 3);" for _ in range(300)) + "\nx = ;\ninicio"
+tokens = TokenStream.desde_codigo(codigo).vista_plana()
+for recuperar in (False, True):
+    inicio = time.perf_counter()
+    analizador = AnalizadorSintactico(tokens, registrar_estados=False, recuperar_errores=recuperar)
+    print(recuperar, analizador.analizar(), analizador.posicion_error(), f"{time.perf_counter() - inicio:.3f} s")
+
+# Tokens después de 'inicio': el programa no termina ahí, es un error (y no hay árbol)
+tokens = TokenStream.desde_codigo("fin\nx = 1 ;\ninicio\nx = = ;").vista_plana()
+analizador = AnalizadorSintactico(tokens, recuperar_errores=True)
+print(analizador.analizar(), analizador.errores, analizador.posicion_error(), analizador.obtener_arbol())
+
+# 'inicio' también es un identificador válido: solo cierra el programa si es el último token o si
+# lo que le sigue no continúa una instrucción (mismo resultado que el análisis sin recuperación)
+for codigo in ("fin\ninicio = 1 ;\ninicio", "fin\nx = = inicio ;\ny = 1 ;\ninicio", "fin\nx = 1 ;\ninicio = ;\ninicio"):
+    tokens = TokenStream.desde_codigo(codigo).vista_plana()
+    analizador = AnalizadorSintactico(tokens, recuperar_errores=True)
+    print(analizador.analizar(), analizador.errores, AnalizadorSintactico(tokens, modo="earley").analizar())
+# True [] True
+# False [(1, 3)] False
+# False [(5, 7)] False
@@ -0,0 +1,46 @@
+from src.models.SourceFile import SourceFile
+
+
+def posicion_lenta(texto, offset):
+    """(linea, columna) contando saltos de línea, para comparar con la búsqueda binaria."""
+    antes = texto[:offset]
+    return antes.count("\n") + 1, offset - (antes.rfind("\n") + 1) + 1
+
+
+for texto in ("", "\n", "fin", "fin\n", "fin\nx = 1 ;\n\ninicio", "fin\nx = 1 ;\n\ninicio\n", "\n\nfin\n\n"):
+    fuente = SourceFile(texto)
+
+    # Todos los offsets, incluidos los inicios de línea (justo después de '\n') y el fin del texto
+    posiciones = all(fuente.posicion(k) == posicion_lenta(texto, k) for k in range(len(texto) + 1))
+    inicios = [fuente.posicion(inicio) for inicio in fuente.inicios_linea]
+    fin = fuente.posicion(len(texto))
+
+    # offset() y posicion() son inversas, y linea() devuelve el texto sin el salto de línea
+    ida_y_vuelta = all(fuente.offset(*fuente.posicion(k)) == k for k in range(len(texto) + 1))
+    lineas = [fuente.linea(n) for n in range(1, fuente.numero_lineas() + 1)] == texto.split("\n")
+
+    print(repr(texto), fuente.numero_lineas(), posiciones, inicios, fin, ida_y_vuelta, lineas)
+# '' 1 True [(1, 1)] (1, 1) True True
+# '\n' 2 True [(1, 1), (2, 1)] (2, 1) True True
+# 'fin' 1 True [(1, 1)] (1, 4) True True
+# 'fin\n' 2 True [(1, 1), (2, 1)] (2, 1) True True
+# 'fin\nx = 1 ;\n\ninicio' 4 True [(1, 1), (2, 1), (3, 1), (4, 1)] (4, 7) True True
+# 'fin\nx = 1 ;\n\ninicio\n' 5 True [(1, 1), (2, 1), (3, 1), (4, 1), (5, 1)] (5, 1) True True
+# '\n\nfin\n\n' 5 True [(1, 1), (2, 1), (3, 1), (4, 1), (5, 1)] (5, 1) True True
+
+# Fuera del código
+fuente = SourceFile("fin\ninicio")
+for offset in (-1, len(fuente) + 1):
+    try:
+        fuente.posicion(offset)
+    except IndexError as error:
+        print(error)
+for linea in (0, fuente.numero_lineas() + 1):
+    try:
+        fuente.offset(linea)
+    except IndexError as error:
+        print(error)
+# Offset fuera del código: -1
+# Offset fuera del código: 11
+# Línea fuera del código: 0
+# Línea fuera del código: 3
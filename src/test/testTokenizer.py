@@ -1,3 +1,5 @@
+from src.models.TokenStream import TokenStream
+from src.util.EspecificacionLexica import PATRONES_FASES
 from src.util.Tokenizador import Tokenizador
 
 
@@ -23,3 +25,19 @@ codigo = """inicio
 tokens = Tokenizador.obtener_tokens_del_codigo_linea_por_linea(codigo, patrones)
 print(tokens)
 # [['inicio', 'x', '=', '3.14', ';', 'fin']]
+
+# La vista plana del TokenStream (entrada del parser) da los mismos tokens que
+# obtener_tokens_del_codigo sobre el código completo, aunque una cadena o un comentario cruce
+# un salto de línea o tenga un '\r' o '\x85'; la vista por líneas los corta como
+# obtener_tokens_del_codigo_linea_por_linea
+for codigo in ('fin\nx = "hola\nmundo";\ninicio', 'fin\n# comentario\r de dos líneas #\ninicio', 'fin\nx = "a\x85b";\ninicio'):
+    flujo = TokenStream.desde_codigo(codigo)
+    print(list(flujo.vista_plana()) == Tokenizador.obtener_tokens_del_codigo(codigo, PATRONES_FASES),
+          flujo.vista_lineas() == Tokenizador.obtener_tokens_del_codigo_linea_por_linea(codigo, PATRONES_FASES))
+    print(list(flujo.vista_plana()))
+# True True
+# ['fin', 'x', '=', '"hola\nmundo"', ';', 'inicio']
+# True True
+# ['fin', '# comentario\r de dos líneas #', 'inicio']
+# True True
+# ['fin', 'x', '=', '"a\x85b"', ';', 'inicio']
@@ -0,0 +1,64 @@
+import os
+import random
+import tempfile
+
+from src.compiler.AnalizadorSintactico import AnalizadorSintactico
+from src.models.TokenStream import TokenStream
+from src.models.TrazaSintactica import TrazaSintactica
+
+
+class ListaEstados:
+    """Junta los estados del analizador tal cual, para compararlos con la traza comprimida."""
+
+    def __init__(self):
+        self.estados = []
+
+    def registrar(self, estado):
+        self.estados.append(estado)
+
+
+codigo = """fin
+entero numero1, numero2;
+numero1 = 3 + numero2 * 2;
+ocultar ("Dame un numero", numero1);
+borrar numero2;
+numero2 = ;
+inicio"""
+
+# Estados de un análisis con muchos retrocesos (termina en error)
+analizador = AnalizadorSintactico(TokenStream.desde_codigo(codigo).vista_plana())
+analizador.traza = lista = ListaEstados()
+print(analizador.analizar(), len(lista.estados))
+
+filas = [[e.s, e.i, e.r, e.lista_a_copy(), e.lista_b()] for e in lista.estados]
+
+random.seed(1)
+with tempfile.TemporaryDirectory() as carpeta:
+    for nombre, archivo in (("memoria", None), ("sqlite", os.path.join(carpeta, "traza.db"))):
+        with TrazaSintactica(cada=50, archivo=archivo) as traza:
+            for estado in lista.estados:
+                traza.registrar(estado)
+            traza.volcar()
+
+            # Acceso al azar (desde el punto de control anterior), en orden, cortes y negativos
+            pasos = random.sample(range(len(filas)), min(300, len(filas)))
+            al_azar = all(traza[k] == filas[k] for k in pasos)
+            en_orden = list(traza) == filas
+            cortes = traza[10:40] == filas[10:40] and traza[-1] == filas[-1]
+            alternativas = all(
+                traza.alternativa(k) == (e.alternativas.tope if e.alternativas else -1)
+                for k, e in enumerate(lista.estados)
+            )
+            print(nombre, len(traza) == len(filas), al_azar, en_orden, cortes, alternativas)
+
+        # Después de cerrar, las filas se siguen pudiendo leer
+        print(nombre, "cerrada", traza[len(filas) // 2] == filas[len(filas) // 2])
+        traza.cerrar()
+
+    # El analizador cierra la base al terminar
+    archivo = os.path.join(carpeta, "analizador.db")
+    analizador = AnalizadorSintactico(TokenStream.desde_codigo(codigo).vista_plana(), archivo_traza=archivo)
+    analizador.analizar()
+    print("conexion abierta:", analizador.traza._conexion is not None,
+          analizador.exportar_estados_tabla()[-1] == filas[-1])
+    analizador.traza.cerrar()
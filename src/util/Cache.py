@@ -0,0 +1,80 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+
+class Cache:
+    """
+    Caché en disco para resultados que cuestan construir (tablas del autómata léxico,
+    gramáticas compiladas, ...). Cada entrada se guarda en un archivo pickle cuyo nombre es
+    la clave, normalmente un hash del contenido del que se derivó.
+
+    La carpeta se puede cambiar con la variable de entorno PITUFOS_CACHE_DIR.
+    """
+
+    @staticmethod
+    def directorio() -> Path:
+        ruta = os.environ.get("PITUFOS_CACHE_DIR")
+        if ruta:
+            return Path(ruta)
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(base) / "pitufos"
+
+    @staticmethod
+    def hash_de(*partes) -> str:
+        """
+        Calcula una clave estable a partir de los datos recibidos (su repr).
+
+        Returns:
+            str: Hash SHA-256 en hexadecimal.
+        """
+        h = hashlib.sha256()
+        for parte in partes:
+            h.update(repr(parte).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    @staticmethod
+    def cargar(espacio: str, clave: str):
+        """
+        Devuelve el objeto guardado bajo (espacio, clave) o None si no existe o está dañado.
+        """
+        ruta = Cache.directorio() / espacio / f"{clave}.pickle"
+        try:
+            with open(ruta, "rb") as archivo:
+                return pickle.load(archivo)
+        except Exception:
+            # Un archivo dañado o de otra versión puede fallar de muchas formas (TypeError,
+            # MemoryError, un módulo que ya no existe...): en todos los casos es como no tenerlo
+            return None
+
+    @staticmethod
+    def guardar(espacio: str, clave: str, datos) -> bool:
+        """
+        Guarda el objeto bajo (espacio, clave). La escritura es atómica (archivo temporal +
+        rename) para que dos procesos no dejen un archivo a medias.
+
+        Returns:
+            bool: False si no se pudo escribir (por ejemplo, carpeta sin permisos o datos que
+            no se pueden guardar con pickle).
+        """
+        carpeta = Cache.directorio() / espacio
+        temporal = None
+        try:
+            carpeta.mkdir(parents=True, exist_ok=True)
+            fd, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+            with os.fdopen(fd, "wb") as archivo:
+                pickle.dump(datos, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, carpeta / f"{clave}.pickle")
+            temporal = None
+            return True
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            return False
+        finally:
+            if temporal is not None:    # <-- No dejar el temporal si algo falló antes del rename
+                try:
+                    os.unlink(temporal)
+                except OSError:
+                    pass
@@ -0,0 +1,76 @@
+import re
+from functools import lru_cache
+
+from src.util.Gramatica import Gramatica
+from src.util.GramaticaCompilada import GramaticaCompilada
+
+
+class ClasificadorTerminales:
+    """
+    Terminales de la gramática con un número fijo, para comparar tokens con enteros.
+
+    Cada terminal (literal como "fin" o patrón como "[0-9]+") recibe un id y el bit 1 << id.
+    Un token se clasifica una sola vez en la máscara de bits de todos los terminales que lo
+    aceptan, con la misma regla que usaba concordancia_de_un_simbolo: el patrón lo cumple
+    completo (re.fullmatch) o el token es igual al terminal. Así, durante el análisis,
+    "el terminal t acepta el token i" es mascaras[i] & bits[t].
+
+    Los terminales, sus bits y los patrones salen de la GramaticaCompilada; los patrones se
+    compilan una vez. clasificar_tokens() recuerda las máscaras por lexema solo durante esa
+    llamada, y clasificar() en una caché LRU acotada: el clasificador se comparte por gramática
+    durante toda la vida del proceso (el editor) y no debe juntar cada lexema que se escribió.
+    """
+
+    FIN = "#"       # <-- Marca de fin de la pila B; también puede concordar con un token '#'
+
+    # Clasificadores ya armados, por gramática compilada
+    _por_gramatica = {}
+
+    def __init__(self, gramatica: Gramatica = None, compilada: GramaticaCompilada = None, tam_cache: int = 4096):
+        """
+        :param gramatica: Gramática de la que salen los terminales (por defecto la del lenguaje).
+        :param compilada: GramaticaCompilada ya armada (evita volver a buscarla).
+        :param tam_cache: Cantidad de lexemas recientes cuya máscara recuerda clasificar().
+        """
+        compilada = compilada or GramaticaCompilada.obtener(gramatica)
+
+        # Los ids y los patrones vienen de la tabla de la gramática compilada
+        self.terminales = list(compilada.terminales)
+        self.id_por_terminal = {terminal: k for k, terminal in enumerate(self.terminales)}
+        self.bits = dict(compilada.literales)
+        self._patrones = [(bit, re.compile(patron)) for bit, patron in compilada.patrones]
+        self.clasificar = lru_cache(maxsize=tam_cache)(self._clasificar)
+
+    @classmethod
+    def obtener(cls, gramatica: Gramatica = None) -> "ClasificadorTerminales":
+        """Clasificador compartido para una gramática (se arma una vez por contenido)."""
+        compilada = GramaticaCompilada.obtener(gramatica)
+        clasificador = cls._por_gramatica.get(id(compilada))
+        if clasificador is None:
+            clasificador = cls._por_gramatica[id(compilada)] = cls(compilada=compilada)
+        return clasificador
+
+    #================== CLASIFICACION ===================
+    def _clasificar(self, token: str) -> int:
+        """Máscara de bits de los terminales que aceptan el token (0 si ninguno)."""
+        mascara = self.bits.get(token, 0)
+        for bit, patron in self._patrones:
+            if patron.fullmatch(token):
+                mascara |= bit
+        return mascara
+
+    def clasificar_tokens(self, tokens) -> list:
+        """Máscara de cada token de la entrada, en orden (cada lexema distinto se clasifica una vez)."""
+        mascaras = {}       # <-- Solo para esta entrada: se descarta al terminar
+        clasificar = self._clasificar
+        resultado = []
+        for token in tokens:
+            mascara = mascaras.get(token)
+            if mascara is None:
+                mascara = mascaras[token] = clasificar(token)
+            resultado.append(mascara)
+        return resultado
+
+    def terminales_de(self, mascara: int) -> list:
+        """Nombres de los terminales de una máscara, en orden de id."""
+        return [terminal for terminal, bit in self.bits.items() if mascara & bit]
@@ -0,0 +1,106 @@
+"""
+Especificación léxica del lenguaje Pitufos.
+
+Es la única fuente de las palabras reservadas, constantes, operadores y delimitadores, y de las
+reglas con las que GeneradorLexico construye el autómata del analizador léxico.
+"""
+import re
+
+PALABRAS_RESERVADAS = [
+    "fin", "inicio", "palabra", "entero", "decimal", "quiza",
+    "ocultar", "borrar", "AND", "OR", "NOT"
+]
+CONSTANTES_ESPECIALES = ["verdadero", "falso"]
+OPERADORES_ARITMETICOS = ["=", "+", "-", "*", "/"]
+DELIMITADORES = [",", ";", "(", ")", '"', ".", "#"]
+
+
+def _alternativas(palabras):
+    return "|".join(re.escape(palabra) for palabra in palabras)
+
+
+# Reglas del autómata léxico: (nombre, patrón, tipo, categoría de error).
+#
+# El autómata toma siempre el token más largo posible; si dos reglas reconocen el mismo texto
+# gana la que aparece primero en la lista (por eso las reservadas van antes que los
+# identificadores). Las reglas con categoría son tokens INVALIDO y la categoría es el mensaje
+# que se reporta, así no hace falta volver a clasificar el token con otras regex.
+#
+# Tipo None indica una regla con tratamiento especial en el escáner:
+#   NUEVA_LINEA    -> solo avanza el contador de líneas
+#   COMENTARIO     -> se emite el '#' y se descarta el resto de la línea
+#   CADENA         -> se emiten las dos comillas y se descarta el contenido
+#   CADENA_ABIERTA -> se emite la comilla de apertura y se descarta el resto de la línea
+REGLAS_LEXICAS = [
+    ("NUEVA_LINEA", r"\n", None, None),
+    ("COMENTARIO", r"#[^\n]*", None, None),
+    ("CADENA", r'"[^"#\n]*"', None, None),
+    ("CADENA_ABIERTA", r'"[^"#\n]*(#[^\n]*)?', None, None),
+    ("ERR_DECIMAL_LETRAS", r"\d+\.[a-zA-Z_][a-zA-Z0-9_]*", "INVALIDO", "Decimal con letras después del punto"),
+    ("ERR_ID_NUMERO", r"\d+[a-zA-Z_][a-zA-Z0-9_]*", "INVALIDO", "Identificador no puede comenzar con número"),
+    ("ERR_MULTIPUNTO", r"\d+\.\d+(\.\d+)+", "INVALIDO", "Número decimal con múltiples puntos"),
+    ("DECIMAL", r"\d+\.\d+", "NUMERO", None),
+    ("ERR_DECIMAL_INCOMPLETO", r"\d+\.", "INVALIDO", "Decimal incompleto, falta la parte decimal"),
+    ("RESERVADA", _alternativas(PALABRAS_RESERVADAS), "RESERVADA", None),
+    ("CONSTANTE", _alternativas(CONSTANTES_ESPECIALES), "CONSTANTE", None),
+    ("IDENTIFICADOR", r"[a-z][a-z0-9_]*", "IDENTIFICADOR", None),
+    ("ERR_CARACTER", r"[A-Z_]", "INVALIDO", "Token no reconocido"),
+    ("ERR_PALABRA", r"[a-zA-Z_][a-zA-Z0-9_]*", "INVALIDO", "Error léxico desconocido"),
+    ("ENTERO", r"\d+", "NUMERO", None),
+    ("OPERADOR", "[" + "".join(re.escape(op) for op in OPERADORES_ARITMETICOS) + "]", "OPERADOR", None),
+    ("DELIMITADOR", r"[,.;:(){}\[\]<>!?%&|@^~]", "DELIMITADOR", None),
+    ("ESPACIO", r"[^\S\n]", "ESPACIO", None),
+]
+
+# Reglas que solo terminan en un borde de palabra cuando las reglas se juntan en una regex que
+# prueba las alternativas en orden (modo un_paso). El autómata ya se queda con la palabra más
+# larga; la regex, sin este borde, cortaría 'finito' en 'fin' + 'ito'.
+REGLAS_DE_PALABRA = {"RESERVADA", "CONSTANTE", "IDENTIFICADOR", "ERR_CARACTER"}
+
+
+# Patrones con los que las fases posteriores al léxico (sintáctico, semántico, optimización)
+# parten el código con Tokenizador. A diferencia del analizador léxico, aquí un comentario
+# '# ... #' y una cadena completa son un solo token y los espacios se descartan.
+PATRONES_FASES = [
+    r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con punto (ej: 3.14hola)
+    r'\d+[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con número (ej: 8hola)
+    r'\d+(\.\d+){2,}',  # número con más de un punto (ej: 3.14.15)
+    r'\d+\.\d+',  # decimal válido (3.14)
+    r'\d+\.',  # decimal incompleto (8.)
+    r'[a-zA-Z_][a-zA-Z0-9_]*',  # identificador válido
+    r'\d+',  # entero válido
+    r'"[^"]*"',  # cadena entre comillas
+    r'#.*?#',  # comentario entre almohadillas
+    r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])',  # delimitadores clásicos
+    r'(\s)'  # espacio en blanco
+]
+
+# Caracteres que str.splitlines() toma como salto de línea ('\r\n' cuenta como uno solo)
+SALTOS_DE_LINEA = r'\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029'
+
+
+def _compilar_patron_fases(cadena: str, comentario: str):
+    return re.compile(
+        r'(?P<NUEVA_LINEA>\r\n|[' + SALTOS_DE_LINEA + r'])'
+        r'|(?P<ERR_DECIMAL_LETRAS>\d+\.[a-zA-Z_][a-zA-Z0-9_]*)'   # <-- 3.14hola
+        r'|(?P<ERR_ID_NUMERO>\d+[a-zA-Z_][a-zA-Z0-9_]*)'          # <-- 8hola
+        r'|(?P<ERR_MULTIPUNTO>\d+(?:\.\d+){2,})'                  # <-- 3.14.15
+        r'|(?P<DECIMAL>\d+\.\d+)'                                # <-- 3.14
+        r'|(?P<ERR_DECIMAL_INCOMPLETO>\d+\.)'                    # <-- 8.
+        r'|(?P<PALABRA>[a-zA-Z_][a-zA-Z0-9_]*)'                  # <-- identificadores y reservadas
+        r'|(?P<ENTERO>\d+)'
+        r'|(?P<CADENA>' + cadena + r')'
+        r'|(?P<COMENTARIO>' + comentario + r')'
+        r'|(?P<SIMBOLO>[,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])'
+        r'|(?P<ESPACIO>\s)'
+    )
+
+
+# PATRONES_FASES ya compilados, con un grupo con nombre por alternativa para que TokenStream
+# sepa el tipo de cada token sin volver a clasificarlo. Las cadenas y comentarios no cruzan de
+# línea, igual que al tokenizar línea por línea.
+PATRON_FASES = _compilar_patron_fases(r'"[^"' + SALTOS_DE_LINEA + r']*"', r'#[^' + SALTOS_DE_LINEA + r']*?#')
+
+# Los mismos patrones con las cadenas y comentarios de PATRONES_FASES, que sí pueden cruzar de
+# línea: es lo que da Tokenizador.obtener_tokens_del_codigo sobre el código completo
+PATRON_FASES_PLANO = _compilar_patron_fases(r'"[^"]*"', r'#.*?#')
@@ -0,0 +1,97 @@
+import mmap
+import os
+
+
+class Fragmentador:
+    """
+    Divide un código fuente (o un archivo) en fragmentos de líneas completas para analizarlos
+    en paralelo.
+
+    En Pitufos ni los comentarios ni las cadenas cruzan un salto de línea, así que cortar justo
+    después de un '\\n' no cambia los tokens. Cada fragmento se describe con una tupla
+    (fuente, inicio, fin, linea):
+        - Si el origen es un archivo, fuente es su ruta e [inicio, fin) el rango de bytes; cada
+          proceso lee solo su parte del disco.
+        - Si el origen es un str, fuente es el texto del fragmento e inicio/fin son None.
+    linea es el número (base 1) de la primera línea del fragmento dentro del código completo.
+    """
+
+    # Por debajo de este tamaño no vale la pena repartir el trabajo entre procesos
+    TAM_MINIMO = 1 << 20
+
+    @staticmethod
+    def dividir(origen, partes: int, tam_minimo: int = TAM_MINIMO) -> list:
+        """
+        Args:
+            origen: Código (str) o ruta de archivo (pathlib.Path / os.PathLike).
+            partes (int): Cantidad de fragmentos deseada (se generan menos si el código es chico).
+            tam_minimo (int): Tamaño mínimo de cada fragmento, en caracteres o bytes.
+
+        Returns:
+            list: Tuplas (fuente, inicio, fin, linea) en orden; juntas cubren todo el código.
+        """
+        if isinstance(origen, os.PathLike):
+            ruta = os.fspath(origen)
+            with open(ruta, "rb") as archivo:
+                tam = os.fstat(archivo.fileno()).st_size
+                if tam == 0:
+                    return [(ruta, 0, 0, 1)]
+                with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                    cortes = Fragmentador._cortes(datos, tam, partes, tam_minimo, b"\n")
+                    fragmentos = []
+                    linea = 1
+                    for inicio, fin in cortes:
+                        fragmentos.append((ruta, inicio, fin, linea))
+                        linea += Fragmentador._contar_lineas(datos[inicio:fin])
+                    return fragmentos
+
+        cortes = Fragmentador._cortes(origen, len(origen), partes, tam_minimo, "\n")
+        fragmentos = []
+        linea = 1
+        for inicio, fin in cortes:
+            fragmentos.append((origen[inicio:fin], None, None, linea))
+            linea += origen.count("\n", inicio, fin)
+        return fragmentos
+
+    @staticmethod
+    def leer(fragmento):
+        """
+        Devuelve (texto, linea) de un fragmento generado por dividir().
+
+        Los rangos de un archivo se decodifican como UTF-8 y con los saltos de línea
+        normalizados a '\\n', igual que al abrir el archivo en modo texto.
+        """
+        fuente, inicio, fin, linea = fragmento
+        if inicio is None:
+            return fuente, linea
+
+        with open(fuente, "rb") as archivo:
+            archivo.seek(inicio)
+            datos = archivo.read(fin - inicio)
+        texto = datos.decode("utf-8")
+        if "\r" in texto:
+            texto = texto.replace("\r\n", "\n").replace("\r", "\n")
+        return texto, linea
+
+    @staticmethod
+    def _cortes(datos, tam, partes, tam_minimo, salto):
+        # Se busca el primer salto a partir de cada posición ideal y se corta justo después
+        partes = max(1, min(partes, tam // max(1, tam_minimo)))
+        cortes = []
+        inicio = 0
+        for k in range(1, partes):
+            objetivo = max(tam * k // partes, inicio)
+            posicion = datos.find(salto, objetivo)
+            if posicion == -1:
+                break
+            if posicion + 1 > inicio:
+                cortes.append((inicio, posicion + 1))
+                inicio = posicion + 1
+        if inicio < tam or not cortes:
+            cortes.append((inicio, tam))
+        return cortes
+
+    @staticmethod
+    def _contar_lineas(datos: bytes) -> int:
+        # Saltos en modo texto: '\n', '\r\n' y '\r' solo
+        return datos.count(b"\n") + datos.count(b"\r") - datos.count(b"\r\n")
@@ -0,0 +1,442 @@
+from src.util.Cache import Cache
+
+
+# Alfabeto del autómata: los 128 caracteres ASCII más tres símbolos que representan a todos los
+# caracteres no ASCII según cómo los trata el módulo re (\d y \s son Unicode en Python).
+NA_DIGITO = 128     # <-- dígito decimal no ASCII (str.isdecimal)
+NA_ESPACIO = 129    # <-- espacio no ASCII (str.isspace)
+NA_OTRO = 130       # <-- cualquier otro carácter no ASCII
+ALFABETO = frozenset(range(131))
+
+_DIGITOS = frozenset(range(ord("0"), ord("9") + 1)) | {NA_DIGITO}
+_ESPACIOS = frozenset(c for c in range(128) if chr(c).isspace()) | {NA_ESPACIO}
+
+
+class ErrorEspecificacion(ValueError):
+    """Patrón de la especificación léxica que el generador no puede interpretar."""
+
+
+class _ParserPatron:
+    """
+    Parser del subconjunto de regex que usa la especificación léxica: literales, escapes
+    (\\d \\D \\s \\S \\n \\t y caracteres escapados), clases [...] y [^...], '.', grupos (...) y
+    (?:...), alternativa '|' y los cuantificadores * + ? {m} {m,} {m,n}.
+
+    Produce un árbol de tuplas:
+        ("conjunto", frozenset) | ("concat", [nodos]) | ("alt", [nodos]) |
+        ("repetir", nodo, minimo, maximo_o_None)
+    """
+
+    def __init__(self, patron: str):
+        self.patron = patron
+        self.pos = 0
+
+    def parsear(self):
+        nodo = self._alternativa()
+        if self.pos != len(self.patron):
+            raise ErrorEspecificacion(f"Carácter inesperado en '{self.patron}' (posición {self.pos})")
+        return nodo
+
+    def _ver(self):
+        return self.patron[self.pos] if self.pos < len(self.patron) else None
+
+    def _tomar(self):
+        caracter = self.patron[self.pos]
+        self.pos += 1
+        return caracter
+
+    def _alternativa(self):
+        opciones = [self._concatenacion()]
+        while self._ver() == "|":
+            self.pos += 1
+            opciones.append(self._concatenacion())
+        return opciones[0] if len(opciones) == 1 else ("alt", opciones)
+
+    def _concatenacion(self):
+        partes = []
+        while self._ver() is not None and self._ver() not in "|)":
+            partes.append(self._repeticion())
+        return ("concat", partes)
+
+    def _repeticion(self):
+        nodo = self._atomo()
+        while True:
+            caracter = self._ver()
+            if caracter == "*":
+                self.pos += 1
+                nodo = ("repetir", nodo, 0, None)
+            elif caracter == "+":
+                self.pos += 1
+                nodo = ("repetir", nodo, 1, None)
+            elif caracter == "?":
+                self.pos += 1
+                nodo = ("repetir", nodo, 0, 1)
+            elif caracter == "{":
+                cierre = self.patron.index("}", self.pos)
+                partes = self.patron[self.pos + 1:cierre].split(",")
+                minimo = int(partes[0])
+                maximo = minimo if len(partes) == 1 else (int(partes[1]) if partes[1] else None)
+                self.pos = cierre + 1
+                nodo = ("repetir", nodo, minimo, maximo)
+            else:
+                return nodo
+
+    def _atomo(self):
+        caracter = self._tomar()
+        if caracter == "(":
+            if self.patron.startswith("?:", self.pos):
+                self.pos += 2
+            elif self._ver() == "?":
+                raise ErrorEspecificacion(f"Grupo especial no soportado en '{self.patron}'")
+            nodo = self._alternativa()
+            if self._ver() != ")":
+                raise ErrorEspecificacion(f"Falta ')' en '{self.patron}'")
+            self.pos += 1
+            return nodo
+        if caracter == "[":
+            return ("conjunto", self._clase())
+        if caracter == ".":
+            return ("conjunto", ALFABETO - {ord("\n")})
+        if caracter == "\\":
+            return ("conjunto", self._escape())
+        if caracter in "*+?{":
+            raise ErrorEspecificacion(f"Cuantificador sin operando en '{self.patron}'")
+        return ("conjunto", self._conjunto_literal(caracter))
+
+    def _escape(self):
+        caracter = self._tomar()
+        if caracter == "d":
+            return _DIGITOS
+        if caracter == "D":
+            return ALFABETO - _DIGITOS
+        if caracter == "s":
+            return _ESPACIOS
+        if caracter == "S":
+            return ALFABETO - _ESPACIOS
+        if caracter == "n":
+            return frozenset({ord("\n")})
+        if caracter == "t":
+            return frozenset({ord("\t")})
+        if caracter.isalnum():
+            raise ErrorEspecificacion(f"Escape '\\{caracter}' no soportado en '{self.patron}'")
+        return self._conjunto_literal(caracter)
+
+    def _conjunto_literal(self, caracter):
+        codigo = ord(caracter)
+        if codigo >= 128:
+            raise ErrorEspecificacion(f"Solo se admiten literales ASCII en '{self.patron}'")
+        return frozenset({codigo})
+
+    def _clase(self):
+        negada = self._ver() == "^"
+        if negada:
+            self.pos += 1
+
+        conjunto = set()
+        primero = True
+        while True:
+            caracter = self._tomar()
+            if caracter == "]" and not primero:
+                break
+            primero = False
+
+            if caracter == "\\":
+                elementos = self._escape()
+            else:
+                elementos = self._conjunto_literal(caracter)
+
+            # Rango a-z (solo entre dos caracteres sueltos)
+            if self._ver() == "-" and self.pos + 1 < len(self.patron) and self.patron[self.pos + 1] != "]" \
+                    and len(elementos) == 1:
+                self.pos += 1
+                hasta = self._tomar()
+                if hasta == "\\":
+                    hasta_conjunto = self._escape()
+                else:
+                    hasta_conjunto = self._conjunto_literal(hasta)
+                desde, = elementos
+                hasta_codigo, = hasta_conjunto
+                elementos = frozenset(range(desde, hasta_codigo + 1))
+
+            conjunto |= elementos
+
+        return ALFABETO - conjunto if negada else frozenset(conjunto)
+
+
+class GeneradorLexico:
+    """
+    Construye un analizador léxico de tabla a partir de una especificación declarativa.
+
+    Pasos:
+        1. Cada patrón se convierte en un AFN (construcción de Thompson).
+        2. Los AFN se unen y se determinizan por subconjuntos sobre clases de caracteres
+           (grupos de caracteres que ninguna regla distingue).
+        3. El AFD se minimiza (refinamiento de particiones de Moore), separando los estados
+           de aceptación por la regla que reconocen.
+
+    Las tablas resultantes se guardan en la caché en disco con un hash de la especificación
+    como clave, así solo se regeneran cuando cambian las reglas.
+    """
+
+    VERSION = 1     # <-- Subir si cambia el formato de las tablas para invalidar la caché
+
+    def __init__(self, reglas):
+        """
+        :param reglas: Lista de tuplas (nombre, patrón, tipo, categoría). El orden define la
+                       prioridad cuando dos reglas reconocen el mismo texto.
+        """
+        self.reglas = list(reglas)
+
+    #================== CACHE ===================
+    def obtener_tablas(self, usar_cache: bool = True) -> dict:
+        """
+        Devuelve las tablas del autómata minimizado, desde la caché si ya existen.
+        """
+        clave = Cache.hash_de(self.VERSION, self.reglas)
+        if usar_cache:
+            tablas = Cache.cargar("lexico", clave)
+            if tablas is not None:
+                return tablas
+
+        tablas = self.generar_tablas()
+        if usar_cache:
+            Cache.guardar("lexico", clave, tablas)
+        return tablas
+
+    def generar_escaner(self, usar_cache: bool = True) -> "EscanerDFA":
+        return EscanerDFA(self.obtener_tablas(usar_cache))
+
+    #================== CONSTRUCCION ===================
+    def generar_tablas(self) -> dict:
+        afn = _AFN()
+        inicio = afn.nuevo_estado()
+        for prioridad, (nombre, patron, _tipo, _categoria) in enumerate(self.reglas):
+            arbol = _ParserPatron(patron).parsear()
+            entrada, salida = afn.construir(arbol)
+            afn.epsilon[inicio].append(entrada)
+            afn.acepta[salida] = prioridad
+
+        representantes, clase_de_simbolo = self._clases_de_caracteres(afn)
+        transiciones, aceptacion = self._determinizar(afn, inicio, representantes)
+        transiciones, aceptacion = self._minimizar(transiciones, aceptacion)
+
+        return {
+            "version": self.VERSION,
+            "clases_ascii": [clase_de_simbolo[c] for c in range(128)],
+            "clase_na_digito": clase_de_simbolo[NA_DIGITO],
+            "clase_na_espacio": clase_de_simbolo[NA_ESPACIO],
+            "clase_na_otro": clase_de_simbolo[NA_OTRO],
+            "transiciones": transiciones,
+            "aceptacion": aceptacion,
+            "reglas": self.reglas,
+        }
+
+    @staticmethod
+    def _clases_de_caracteres(afn):
+        """
+        Parte el alfabeto en clases de símbolos que se comportan igual en todas las transiciones.
+        """
+        bloques = [ALFABETO]
+        for conjunto in set(conjunto for _estado, conjunto, _destino in afn.transiciones):
+            nuevos = []
+            for bloque in bloques:
+                dentro, fuera = bloque & conjunto, bloque - conjunto
+                nuevos.extend(parte for parte in (dentro, fuera) if parte)
+            bloques = nuevos
+
+        bloques.sort(key=min)
+        clase_de_simbolo = {}
+        for clase, bloque in enumerate(bloques):
+            for simbolo in bloque:
+                clase_de_simbolo[simbolo] = clase
+        return [min(bloque) for bloque in bloques], clase_de_simbolo
+
+    @staticmethod
+    def _determinizar(afn, inicio, representantes):
+        salidas = [[] for _ in range(afn.total)]
+        for origen, conjunto, destino in afn.transiciones:
+            salidas[origen].append((conjunto, destino))
+
+        def cerradura(estados):
+            pila = list(estados)
+            resultado = set(estados)
+            while pila:
+                for siguiente in afn.epsilon[pila.pop()]:
+                    if siguiente not in resultado:
+                        resultado.add(siguiente)
+                        pila.append(siguiente)
+            return frozenset(resultado)
+
+        inicial = cerradura([inicio])
+        indice = {inicial: 0}
+        pendientes = [inicial]
+        transiciones = []
+        aceptacion = []
+
+        while pendientes:
+            actual = pendientes.pop(0)
+            fila = []
+            for simbolo in representantes:
+                destino = {d for estado in actual for conjunto, d in salidas[estado] if simbolo in conjunto}
+                if not destino:
+                    fila.append(-1)
+                    continue
+                destino = cerradura(destino)
+                if destino not in indice:
+                    indice[destino] = len(indice)
+                    pendientes.append(destino)
+                fila.append(indice[destino])
+            transiciones.append(fila)
+
+            prioridades = [afn.acepta[e] for e in actual if e in afn.acepta]
+            aceptacion.append(min(prioridades) if prioridades else -1)
+
+        return transiciones, aceptacion
+
+    @staticmethod
+    def _minimizar(transiciones, aceptacion):
+        # Partición inicial: estados con la misma regla aceptada (o ninguna)
+        bloque = [aceptacion[e] for e in range(len(transiciones))]
+        while True:
+            firmas = {}
+            nuevo_bloque = []
+            for estado, fila in enumerate(transiciones):
+                firma = (bloque[estado], tuple(bloque[d] if d >= 0 else None for d in fila))
+                nuevo_bloque.append(firmas.setdefault(firma, len(firmas)))
+            if len(firmas) == len(set(bloque)):
+                break
+            bloque = nuevo_bloque
+
+        # Renumera para que el estado inicial (0) siga siendo el 0
+        orden = {}
+        for estado in range(len(transiciones)):
+            orden.setdefault(nuevo_bloque[estado], len(orden))
+
+        minimas = [None] * len(orden)
+        acepta_minimas = [-1] * len(orden)
+        for estado, fila in enumerate(transiciones):
+            nuevo = orden[nuevo_bloque[estado]]
+            if minimas[nuevo] is None:
+                minimas[nuevo] = [orden[nuevo_bloque[d]] if d >= 0 else -1 for d in fila]
+                acepta_minimas[nuevo] = aceptacion[estado]
+        return minimas, acepta_minimas
+
+
+class _AFN:
+    """AFN de Thompson: transiciones (origen, conjunto, destino) y transiciones vacías."""
+
+    def __init__(self):
+        self.total = 0
+        self.transiciones = []
+        self.epsilon = []
+        self.acepta = {}
+
+    def nuevo_estado(self):
+        self.epsilon.append([])
+        self.total += 1
+        return self.total - 1
+
+    def construir(self, nodo):
+        tipo = nodo[0]
+        if tipo == "conjunto":
+            entrada, salida = self.nuevo_estado(), self.nuevo_estado()
+            self.transiciones.append((entrada, nodo[1], salida))
+            return entrada, salida
+
+        if tipo == "concat":
+            entrada = actual = self.nuevo_estado()
+            for parte in nodo[1]:
+                sub_entrada, sub_salida = self.construir(parte)
+                self.epsilon[actual].append(sub_entrada)
+                actual = sub_salida
+            return entrada, actual
+
+        if tipo == "alt":
+            entrada, salida = self.nuevo_estado(), self.nuevo_estado()
+            for opcion in nodo[1]:
+                sub_entrada, sub_salida = self.construir(opcion)
+                self.epsilon[entrada].append(sub_entrada)
+                self.epsilon[sub_salida].append(salida)
+            return entrada, salida
+
+        # repetir: se copian las repeticiones obligatorias y luego las opcionales o el ciclo
+        _, sub, minimo, maximo = nodo
+        entrada = actual = self.nuevo_estado()
+        for _ in range(minimo):
+            sub_entrada, sub_salida = self.construir(sub)
+            self.epsilon[actual].append(sub_entrada)
+            actual = sub_salida
+
+        if maximo is None:
+            sub_entrada, sub_salida = self.construir(sub)
+            salida = self.nuevo_estado()
+            self.epsilon[actual].extend((sub_entrada, salida))
+            self.epsilon[sub_salida].extend((sub_entrada, salida))
+            return entrada, salida
+
+        salida = self.nuevo_estado()
+        for _ in range(maximo - minimo):
+            sub_entrada, sub_salida = self.construir(sub)
+            self.epsilon[actual].extend((sub_entrada, salida))
+            actual = sub_salida
+        self.epsilon[actual].append(salida)
+        return entrada, salida
+
+
+class EscanerDFA:
+    """
+    Escáner de tabla generado por GeneradorLexico. Recorre el texto con el AFD minimizado y
+    devuelve siempre el token más largo (con desempate por prioridad de regla). Los caracteres
+    que no inician ningún token se saltan, igual que hace re.finditer.
+    """
+
+    def __init__(self, tablas: dict):
+        self.clases_ascii = tablas["clases_ascii"]
+        self.clase_na_digito = tablas["clase_na_digito"]
+        self.clase_na_espacio = tablas["clase_na_espacio"]
+        self.clase_na_otro = tablas["clase_na_otro"]
+        self.transiciones = tablas["transiciones"]
+        self.aceptacion = tablas["aceptacion"]
+        self.reglas = tablas["reglas"]
+        self.nombres = [regla[0] for regla in self.reglas]
+
+    def _clase_no_ascii(self, caracter):
+        if caracter.isdecimal():
+            return self.clase_na_digito
+        if caracter.isspace():
+            return self.clase_na_espacio
+        return self.clase_na_otro
+
+    def escanear(self, texto: str):
+        """
+        Genera tuplas (indice_regla, inicio, fin) con cada token reconocido en el texto.
+        """
+        clases_ascii = self.clases_ascii
+        transiciones = self.transiciones
+        aceptacion = self.aceptacion
+        n = len(texto)
+        pos = 0
+
+        while pos < n:
+            estado = 0
+            i = pos
+            regla = -1
+            fin = pos
+
+            while i < n:
+                codigo = ord(texto[i])
+                clase = clases_ascii[codigo] if codigo < 128 else self._clase_no_ascii(texto[i])
+                estado = transiciones[estado][clase]
+                if estado < 0:
+                    break
+                i += 1
+                if aceptacion[estado] >= 0:
+                    regla = aceptacion[estado]
+                    fin = i
+
+            if regla < 0:
+                pos += 1        # <-- Carácter que no inicia ningún token: se ignora
+                continue
+
+            yield regla, pos, fin
+            pos = fin
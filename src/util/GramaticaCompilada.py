@@ -0,0 +1,234 @@
+from array import array
+from types import MappingProxyType
+
+from src.util.Cache import Cache
+from src.util.Gramatica import Gramatica
+from src.util.Tokenizador import Tokenizador
+
+
+class GramaticaCompilada:
+    """
+    Forma compilada e inmutable de una Gramatica, con las tablas que usan los analizadores.
+
+        - Símbolos con id entero: primero los no terminales (0..N-1, en el orden de la
+          gramática) y después los terminales (N..), con '#' (fin) al final.
+        - Producciones planas: cuerpos (ids de todos los símbolos, seguidos), inicios de cada
+          producción, lado izquierdo de cada una y primera producción de cada no terminal.
+        - anulables, primeros y siguientes como enteros usados como conjuntos de bits. En
+          primeros y siguientes el terminal t es el bit 1 << t (su índice en terminales), el
+          mismo que usa ClasificadorTerminales.
+        - Tabla para reconocer tokens: literales (terminal -> bit) y patrones (bit, regex).
+
+    Las tablas se guardan en la caché de disco con una clave que es el hash de la gramática, los
+    terminales y el símbolo inicial, así que al arrancar se cargan en lugar de volver a
+    calcularse. En el mismo proceso se comparte una sola instancia por clave (obtener()).
+    """
+
+    VERSION = 1     # <-- Subir si cambia el formato de las tablas para invalidar la caché
+    FIN = "#"
+
+    # Instancias ya cargadas en este proceso, por clave
+    _por_clave = {}
+
+    def __init__(self, tablas: dict):
+        object.__setattr__(self, "_tablas", tablas)
+
+        simbolos = tuple(tablas["simbolos"])
+        cantidad_nt = tablas["cantidad_no_terminales"]
+        nombres_nt = simbolos[:cantidad_nt]
+
+        valores = {
+            "inicial": tablas["inicial"],
+            "simbolos": simbolos,
+            "id_por_simbolo": MappingProxyType({simbolo: k for k, simbolo in enumerate(simbolos)}),
+            "cantidad_no_terminales": cantidad_nt,
+            "no_terminales": frozenset(nombres_nt),
+            "terminales": simbolos[cantidad_nt:],
+            "cuerpos": tablas["cuerpos"],
+            "inicios": tablas["inicios"],
+            "lado_izquierdo": tablas["lado_izquierdo"],
+            "primera_produccion": tablas["primera_produccion"],
+            "anulables": tablas["anulables"],
+            "primeros": tuple(tablas["primeros"]),
+            "siguientes": tuple(tablas["siguientes"]),
+            "literales": MappingProxyType(dict(tablas["literales"])),
+            "patrones": tuple(tablas["patrones"]),
+        }
+        # Expansiones por nombre, como Gramatica.obtener_expansiones (tuplas, no se pueden modificar)
+        valores["expansiones"] = MappingProxyType({
+            nombre: tuple(
+                tuple(simbolos[x] for x in tablas["cuerpos"][tablas["inicios"][p]:tablas["inicios"][p + 1]])
+                for p in range(tablas["primera_produccion"][k], tablas["primera_produccion"][k + 1])
+            )
+            for k, nombre in enumerate(nombres_nt)
+        })
+        for nombre, valor in valores.items():
+            object.__setattr__(self, nombre, valor)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("GramaticaCompilada es inmutable")
+
+    #================== CACHE ===================
+    @classmethod
+    def obtener(cls, gramatica: Gramatica = None, inicial: str = "programa",
+                usar_cache: bool = True) -> "GramaticaCompilada":
+        """
+        Gramática compilada, desde la memoria del proceso o la caché de disco si ya existe.
+        """
+        gramatica = gramatica or Gramatica()
+        producciones = gramatica.obtener_gramatica()
+        clave = Cache.hash_de(cls.VERSION, producciones, gramatica.obtener_terminales(), inicial)
+
+        compilada = cls._por_clave.get(clave)
+        if compilada is not None:
+            return compilada
+
+        tablas = Cache.cargar("gramatica", clave) if usar_cache else None
+        if tablas is None or tablas.get("version") != cls.VERSION:
+            tablas = cls.generar_tablas(producciones, inicial)
+            if usar_cache:
+                Cache.guardar("gramatica", clave, tablas)
+
+        compilada = cls._por_clave[clave] = cls(tablas)
+        return compilada
+
+    #================== CONSTRUCCION ===================
+    @classmethod
+    def generar_tablas(cls, producciones: dict, inicial: str = "programa") -> dict:
+        no_terminales = list(producciones)
+        terminales = []
+        for expansiones in producciones.values():
+            for produccion in expansiones:
+                for simbolo in produccion:
+                    if simbolo not in producciones and simbolo not in terminales:
+                        terminales.append(simbolo)
+        if cls.FIN not in terminales:
+            terminales.append(cls.FIN)
+
+        simbolos = no_terminales + terminales
+        id_por_simbolo = {simbolo: k for k, simbolo in enumerate(simbolos)}
+        cantidad_nt = len(no_terminales)
+
+        cuerpos, inicios, lado_izquierdo, primera_produccion = array('i'), array('I', [0]), array('I'), array('I')
+        for k, no_terminal in enumerate(no_terminales):
+            primera_produccion.append(len(lado_izquierdo))
+            for produccion in producciones[no_terminal]:
+                cuerpos.extend(id_por_simbolo[simbolo] for simbolo in produccion)
+                inicios.append(len(cuerpos))
+                lado_izquierdo.append(k)
+        primera_produccion.append(len(lado_izquierdo))
+
+        cuerpos_por_nt = [
+            [cuerpos[inicios[p]:inicios[p + 1]] for p in range(primera_produccion[k], primera_produccion[k + 1])]
+            for k in range(cantidad_nt)
+        ]
+        anulables = cls._calcular_anulables(cuerpos_por_nt, cantidad_nt)
+        primeros = cls._calcular_primeros(cuerpos_por_nt, cantidad_nt, anulables)
+        inicial_id = id_por_simbolo.get(inicial) if inicial in producciones else None
+        siguientes = cls._calcular_siguientes(
+            cuerpos_por_nt, cantidad_nt, anulables, primeros, inicial_id, 1 << terminales.index(cls.FIN)
+        )
+
+        return {
+            "version": cls.VERSION,
+            "inicial": inicial,
+            "simbolos": simbolos,
+            "cantidad_no_terminales": cantidad_nt,
+            "cuerpos": cuerpos,
+            "inicios": inicios,
+            "lado_izquierdo": lado_izquierdo,
+            "primera_produccion": primera_produccion,
+            "anulables": anulables,
+            "primeros": primeros,
+            "siguientes": siguientes,
+            "literales": {terminal: 1 << t for t, terminal in enumerate(terminales)},
+            "patrones": [
+                (1 << t, terminal) for t, terminal in enumerate(terminales) if Tokenizador.es_regex_valida(terminal)
+            ],
+        }
+
+    @staticmethod
+    def _calcular_anulables(cuerpos_por_nt, cantidad_nt) -> int:
+        anulables = 0
+        cambio = True
+        while cambio:
+            cambio = False
+            for k, cuerpos in enumerate(cuerpos_por_nt):
+                if anulables >> k & 1:
+                    continue
+                if any(all(x < cantidad_nt and anulables >> x & 1 for x in cuerpo) for cuerpo in cuerpos):
+                    anulables |= 1 << k
+                    cambio = True
+        return anulables
+
+    @staticmethod
+    def _primeros_de(cuerpo, cantidad_nt, anulables, primeros) -> int:
+        # PRIMEROS de una secuencia de ids (sin épsilon; si es anulable lo dice anulables)
+        resultado = 0
+        for x in cuerpo:
+            if x >= cantidad_nt:
+                return resultado | 1 << (x - cantidad_nt)
+            resultado |= primeros[x]
+            if not anulables >> x & 1:
+                return resultado
+        return resultado
+
+    @classmethod
+    def _calcular_primeros(cls, cuerpos_por_nt, cantidad_nt, anulables) -> list:
+        primeros = [0] * cantidad_nt
+        cambio = True
+        while cambio:
+            cambio = False
+            for k, cuerpos in enumerate(cuerpos_por_nt):
+                nuevos = primeros[k]
+                for cuerpo in cuerpos:
+                    nuevos |= cls._primeros_de(cuerpo, cantidad_nt, anulables, primeros)
+                if nuevos != primeros[k]:
+                    primeros[k] = nuevos
+                    cambio = True
+        return primeros
+
+    @classmethod
+    def _calcular_siguientes(cls, cuerpos_por_nt, cantidad_nt, anulables, primeros, inicial_id, bit_fin) -> list:
+        siguientes = [0] * cantidad_nt
+        if inicial_id is not None:
+            siguientes[inicial_id] = bit_fin
+        cambio = True
+        while cambio:
+            cambio = False
+            for k, cuerpos in enumerate(cuerpos_por_nt):
+                for cuerpo in cuerpos:
+                    for posicion, x in enumerate(cuerpo):
+                        if x >= cantidad_nt:
+                            continue
+                        resto = cuerpo[posicion + 1:]
+                        nuevos = cls._primeros_de(resto, cantidad_nt, anulables, primeros)
+                        if all(y < cantidad_nt and anulables >> y & 1 for y in resto):
+                            nuevos |= siguientes[k]
+                        if nuevos | siguientes[x] != siguientes[x]:
+                            siguientes[x] |= nuevos
+                            cambio = True
+        return siguientes
+
+    #================== CONSULTAS ===================
+    def es_no_terminal(self, simbolo: str) -> bool:
+        return simbolo in self.no_terminales
+
+    def es_terminal(self, simbolo: str) -> bool:
+        return simbolo not in self.no_terminales
+
+    def es_anulable(self, no_terminal: str) -> bool:
+        return bool(self.anulables >> self.id_por_simbolo[no_terminal] & 1)
+
+    def bit_terminal(self, terminal: str) -> int:
+        return 1 << (self.id_por_simbolo[terminal] - self.cantidad_no_terminales)
+
+    def terminales_de(self, conjunto: int) -> list:
+        """Nombres de los terminales de un conjunto de bits (primeros, siguientes, máscaras)."""
+        return [terminal for t, terminal in enumerate(self.terminales) if conjunto >> t & 1]
+
+    def primeros_de(self, no_terminal: str) -> list:
+        return self.terminales_de(self.primeros[self.id_por_simbolo[no_terminal]])
+
+    def siguientes_de(self, no_terminal: str) -> list:
+        return self.terminales_de(self.siguientes[self.id_por_simbolo[no_terminal]])
@@ -0,0 +1,245 @@
+import re
+
+from src.util.Gramatica import Gramatica
+from src.util.Tokenizador import Tokenizador
+
+
+class GramaticaLL1:
+    """
+    Tabla de análisis predictivo LL(1) generada a partir de una Gramatica.
+
+    Pasos:
+        1. Factoriza por la izquierda las producciones que comparten prefijo
+           (lista_instrucciones, lista_variables, entrada_salida, expresion...). Cada grupo de
+           producciones con prefijo común se reemplaza por prefijo + [nt'] y nt' recibe los
+           sufijos; un sufijo vacío es una producción épsilon ([]).
+        2. Calcula los conjuntos PRIMEROS y SIGUIENTES de cada no terminal.
+        3. Arma la tabla tabla[no_terminal][terminal] -> índice de la producción.
+
+    Si dos producciones caen en la misma celda se guarda un conflicto (la celda se queda con la
+    primera, que es la que probaría el analizador con retroceso) y la gramática no es LL(1).
+
+    Los terminales pueden ser literales ("fin", ";") o patrones regex ("[0-9]+"), igual que en
+    el analizador con retroceso. Un token puede corresponder a varios terminales (por ejemplo
+    "verdadero" es el literal y también cumple el patrón de identificador); terminales_de()
+    los devuelve con el literal primero y los patrones en el orden en que aparecen en la
+    gramática, y el analizador usa el primero que tenga entrada en la fila.
+
+    Si en una fila el literal y un patrón que lo cumple llevan a producciones distintas, la
+    tabla no decide sola: se guarda en solapamientos y la gramática tampoco es LL(1). El
+    analizador predictivo igual puede usarla, tomando siempre el literal (como si fuera una
+    palabra reservada), pero entonces rechaza programas que el retroceso acepta: con la
+    gramática del lenguaje, 'entero = x ;' no es una asignación a la variable 'entero'.
+    """
+
+    EPSILON = "ε"
+    FIN = "#"       # <-- Marca de fin de entrada (el mismo '#' con el que arranca la pila B)
+
+    def __init__(self, gramatica: Gramatica = None, inicial: str = "programa"):
+        """
+        :param gramatica: Gramática a analizar; por defecto la gramática del lenguaje.
+        :param inicial: Símbolo inicial.
+        """
+        gramatica = gramatica or Gramatica()
+        original = gramatica.obtener_gramatica()
+        if inicial not in original:
+            raise ValueError(f"No se encontró el símbolo inicial: '{inicial}'")
+
+        self.inicial = inicial
+        self.producciones = self.factorizar(original)
+
+        self.terminales = []
+        for expansiones in self.producciones.values():
+            for produccion in expansiones:
+                for simbolo in produccion:
+                    if simbolo not in self.producciones and simbolo not in self.terminales:
+                        self.terminales.append(simbolo)
+
+        self.literales = {t for t in self.terminales if not self.es_patron(t)}
+        self.patrones = [(t, re.compile(t)) for t in self.terminales if self.es_patron(t)]
+        self._terminales_por_token = {}
+
+        self.primeros = self.calcular_primeros()
+        self.siguientes = self.calcular_siguientes()
+        self.conflictos = []
+        self.tabla = self.construir_tabla()
+        self.solapamientos = self.calcular_solapamientos()
+
+    #================== FACTORIZACION ===================
+    @staticmethod
+    def factorizar(gramatica: dict) -> dict:
+        """
+        Factoriza por la izquierda hasta que ningún no terminal tenga dos producciones que
+        empiecen con el mismo símbolo.
+
+        :param gramatica: Diccionario no_terminal -> lista de producciones.
+        :return: Un diccionario nuevo con producciones en tuplas (los no terminales nuevos se
+                 llaman como el original con comillas: expresion', expresion'', ...).
+        """
+        resultado = {nt: [tuple(p) for p in expansiones] for nt, expansiones in gramatica.items()}
+        pendientes = list(resultado)
+
+        while pendientes:
+            no_terminal = pendientes.pop(0)
+
+            grupos = {}
+            for produccion in resultado[no_terminal]:
+                grupos.setdefault(produccion[0] if produccion else None, []).append(produccion)
+
+            nuevas = []
+            for primero, grupo in grupos.items():
+                if primero is None or len(grupo) == 1:
+                    nuevas.extend(grupo)
+                    continue
+
+                # Prefijo común más largo del grupo
+                largo = 0
+                while all(len(p) > largo and p[largo] == grupo[0][largo] for p in grupo):
+                    largo += 1
+
+                nombre = no_terminal + "'"
+                while nombre in resultado:
+                    nombre += "'"
+
+                resultado[nombre] = list(dict.fromkeys(p[largo:] for p in grupo))
+                nuevas.append(grupo[0][:largo] + (nombre,))
+                pendientes.append(nombre)
+
+            resultado[no_terminal] = nuevas
+
+        return resultado
+
+    #================== PRIMEROS Y SIGUIENTES ===================
+    def calcular_primeros(self) -> dict:
+        primeros = {nt: set() for nt in self.producciones}
+
+        cambio = True
+        while cambio:
+            cambio = False
+            for no_terminal, expansiones in self.producciones.items():
+                for produccion in expansiones:
+                    nuevos = self._primeros_de(produccion, primeros)
+                    if not nuevos <= primeros[no_terminal]:
+                        primeros[no_terminal] |= nuevos
+                        cambio = True
+        return primeros
+
+    def calcular_siguientes(self) -> dict:
+        siguientes = {nt: set() for nt in self.producciones}
+        siguientes[self.inicial].add(self.FIN)
+
+        cambio = True
+        while cambio:
+            cambio = False
+            for no_terminal, expansiones in self.producciones.items():
+                for produccion in expansiones:
+                    for k, simbolo in enumerate(produccion):
+                        if simbolo not in self.producciones:
+                            continue
+
+                        resto = self._primeros_de(produccion[k + 1:], self.primeros)
+                        nuevos = resto - {self.EPSILON}
+                        if self.EPSILON in resto:
+                            nuevos |= siguientes[no_terminal]
+
+                        if not nuevos <= siguientes[simbolo]:
+                            siguientes[simbolo] |= nuevos
+                            cambio = True
+        return siguientes
+
+    def primeros_de(self, secuencia) -> set:
+        """PRIMEROS de una secuencia de símbolos (incluye EPSILON si la secuencia puede ser vacía)."""
+        return self._primeros_de(tuple(secuencia), self.primeros)
+
+    def _primeros_de(self, secuencia, primeros) -> set:
+        resultado = set()
+        for simbolo in secuencia:
+            if simbolo not in self.producciones:
+                resultado.add(simbolo)
+                return resultado
+            resultado |= primeros[simbolo] - {self.EPSILON}
+            if self.EPSILON not in primeros[simbolo]:
+                return resultado
+        resultado.add(self.EPSILON)
+        return resultado
+
+    #================== TABLA ===================
+    def construir_tabla(self) -> dict:
+        tabla = {nt: {} for nt in self.producciones}
+
+        for no_terminal, expansiones in self.producciones.items():
+            fila = tabla[no_terminal]
+            for k, produccion in enumerate(expansiones):
+                primeros = self._primeros_de(produccion, self.primeros)
+                terminales = primeros - {self.EPSILON}
+                if self.EPSILON in primeros:
+                    terminales |= self.siguientes[no_terminal]
+
+                for terminal in sorted(terminales):
+                    previa = fila.get(terminal)
+                    if previa is None:
+                        fila[terminal] = k
+                    elif previa != k:
+                        self.conflictos.append((no_terminal, terminal, expansiones[previa], produccion))
+        return tabla
+
+    def calcular_solapamientos(self) -> list:
+        """
+        Celdas de un literal y de un patrón que lo cumple con producciones distintas en la misma
+        fila: un token igual al literal podría seguir cualquiera de las dos.
+
+        :return: Tuplas (no_terminal, literal, patron, produccion_literal, produccion_patron).
+        """
+        solapamientos = []
+        for no_terminal, fila in self.tabla.items():
+            expansiones = self.producciones[no_terminal]
+            for literal in sorted(self.literales):
+                k = fila.get(literal)
+                if k is None:
+                    continue
+                for terminal, patron in self.patrones:
+                    j = fila.get(terminal)
+                    if j is not None and j != k and patron.fullmatch(literal):
+                        solapamientos.append((no_terminal, literal, terminal, expansiones[k], expansiones[j]))
+        return solapamientos
+
+    def es_ll1(self) -> bool:
+        return not self.conflictos and not self.solapamientos
+
+    def describir_conflictos(self) -> str:
+        """Texto con un conflicto por línea, para mostrar o para el mensaje de error."""
+        lineas = []
+        for no_terminal, terminal, primera, segunda in self.conflictos:
+            lineas.append(
+                f"Conflicto LL(1) en M[{no_terminal}, {terminal}]: "
+                f"{no_terminal} -> {self.mostrar_produccion(primera)}  |  {no_terminal} -> {self.mostrar_produccion(segunda)}"
+            )
+        for no_terminal, literal, patron, primera, segunda in self.solapamientos:
+            lineas.append(
+                f"Conflicto LL(1) en M[{no_terminal}, {literal}] ('{literal}' también cumple {patron}): "
+                f"{no_terminal} -> {self.mostrar_produccion(primera)}  |  {no_terminal} -> {self.mostrar_produccion(segunda)}"
+            )
+        return "\n".join(lineas)
+
+    def mostrar_produccion(self, produccion) -> str:
+        return " ".join(produccion) if produccion else self.EPSILON
+
+    #================== TERMINALES ===================
+    @staticmethod
+    def es_patron(terminal: str) -> bool:
+        """True si el terminal es un patrón regex ("[0-9]+") y no un literal ("fin", "+")."""
+        return len(terminal) > 1 and re.escape(terminal) != terminal and Tokenizador.es_regex_valida(terminal)
+
+    def terminales_de(self, token: str) -> tuple:
+        """
+        Terminales de la gramática que acepta un token: el literal igual al token (si existe) y
+        luego los patrones que lo cumplen completo. El resultado se recuerda por lexema.
+        """
+        terminales = self._terminales_por_token.get(token)
+        if terminales is None:
+            terminales = tuple(
+                ([token] if token in self.literales else [])
+                + [terminal for terminal, patron in self.patrones if patron.fullmatch(token)]
+            )
+            self._terminales_por_token[token] = terminales
+        return terminales
@@ -0,0 +1,88 @@
+import difflib
+import math
+from functools import lru_cache
+
+
+class IndiceSugerencias:
+    """
+    Índice para sugerir la palabra más parecida a un token mal escrito ("¿Quisiste decir...?").
+
+    Las palabras se guardan en un árbol BK con la distancia de inserción/borrado
+    (len(a) + len(b) - 2 * LCS). Una consulta solo visita las ramas que pueden contener
+    palabras lo bastante parecidas, y los candidatos que quedan se ordenan con
+    difflib.get_close_matches, así que la sugerencia es la misma que daría difflib sobre todo
+    el universo. Las respuestas se guardan en una caché LRU.
+    """
+
+    def __init__(self, palabras, cutoff: float = 0.7, tam_cache: int = 4096):
+        """
+        :param palabras: Universo de palabras a sugerir (reservadas, constantes, operadores...).
+        :param cutoff: Parecido mínimo (ratio de difflib) para aceptar una sugerencia.
+        :param tam_cache: Cantidad de consultas recientes que se recuerdan.
+        """
+        self.cutoff = cutoff
+        self._raiz = None
+        for palabra in dict.fromkeys(palabras):     # <-- Sin repetidos, conservando el orden
+            self._insertar(palabra)
+
+        self.sugerir = lru_cache(maxsize=tam_cache)(self._sugerir)
+
+    @staticmethod
+    def distancia(a: str, b: str) -> int:
+        """Distancia de inserción/borrado entre dos palabras (es una métrica, como pide el árbol BK)."""
+        previa = [0] * (len(b) + 1)
+        for caracter_a in a:
+            actual = [0]
+            for j, caracter_b in enumerate(b):
+                if caracter_a == caracter_b:
+                    actual.append(previa[j] + 1)
+                else:
+                    actual.append(max(previa[j + 1], actual[j]))
+            previa = actual
+        return len(a) + len(b) - 2 * previa[-1]
+
+    def _insertar(self, palabra: str) -> None:
+        if self._raiz is None:
+            self._raiz = (palabra, {})
+            return
+
+        nodo = self._raiz
+        while True:
+            d = self.distancia(palabra, nodo[0])
+            hijo = nodo[1].get(d)
+            if hijo is None:
+                nodo[1][d] = (palabra, {})
+                return
+            nodo = hijo
+
+    def candidatos(self, token: str, radio: float) -> list:
+        """Palabras del índice a distancia <= radio del token."""
+        if self._raiz is None:
+            return []
+
+        encontrados = []
+        pendientes = [self._raiz]
+        while pendientes:
+            palabra, hijos = pendientes.pop()
+            d = self.distancia(token, palabra)
+            if d <= radio:
+                encontrados.append(palabra)
+            for distancia_hijo, hijo in hijos.items():
+                if d - radio <= distancia_hijo <= d + radio:
+                    pendientes.append(hijo)
+        return encontrados
+
+    def _sugerir(self, token: str):
+        """
+        Devuelve la palabra más parecida al token o None si ninguna alcanza el cutoff.
+        """
+        if self.cutoff <= 0:
+            radio = math.inf
+        else:
+            # ratio >= cutoff obliga a que len(b) <= len(a) * (2 / cutoff - 1) y a que la
+            # distancia sea <= (1 - cutoff) * (len(a) + len(b)); con eso se acota el radio.
+            radio = (1 - self.cutoff) * 2 * len(token) / self.cutoff
+
+        candidatos = self.candidatos(token, radio)
+        sugeridas = difflib.get_close_matches(token, candidatos, n=1, cutoff=self.cutoff)
+        return sugeridas[0] if sugeridas else None
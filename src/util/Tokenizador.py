@@ -1,6 +1,10 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
+from src.util.Fragmentador import Fragmentador
+
 class Tokenizador:
 
     @staticmethod
@@ -57,6 +61,48 @@ class Tokenizador:
 
         return tokens_por_linea
 
+    @staticmethod
+    def obtener_tokens_en_paralelo(origen, patrones: List[str], linea_por_linea: bool = False,
+                                   max_workers: int = None, tam_minimo: int = Fragmentador.TAM_MINIMO):
+        """
+        Tokeniza un código grande repartiéndolo entre varios procesos. El código se corta en
+        fragmentos que terminan en un salto de línea y los tokens de cada fragmento se unen en orden.
+
+        Args:
+            origen: Código (str) o ruta del archivo (pathlib.Path / os.PathLike).
+            patrones (List[str]): Lista de patrones regex como strings para identificar tokens.
+            linea_por_linea (bool): True devuelve una lista de tokens por línea, como
+                                    obtener_tokens_del_codigo_linea_por_linea.
+            max_workers (int): Número de procesos; None usa os.cpu_count().
+            tam_minimo (int): Tamaño mínimo de un fragmento.
+
+        Returns:
+            List[str] | List[List[str]]: Los mismos tokens que la versión secuencial, siempre que
+            ninguna cadena cruce un salto de línea.
+        """
+        workers = max_workers or os.cpu_count() or 1
+        fragmentos = Fragmentador.dividir(origen, workers, tam_minimo)
+        tareas = [(fragmento, patrones, linea_por_linea) for fragmento in fragmentos]
+
+        if len(tareas) == 1:
+            partes = [Tokenizador._tokenizar_fragmento(tareas[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partes = list(executor.map(Tokenizador._tokenizar_fragmento, tareas))
+
+        tokens = []
+        for parte in partes:
+            tokens.extend(parte)
+        return tokens
+
+    @staticmethod
+    def _tokenizar_fragmento(tarea):
+        fragmento, patrones, linea_por_linea = tarea
+        texto, _linea = Fragmentador.leer(fragmento)
+        if linea_por_linea:
+            return Tokenizador.obtener_tokens_del_codigo_linea_por_linea(texto, patrones)
+        return Tokenizador.obtener_tokens_del_codigo(texto, patrones)
+
     @staticmethod
     def es_regex_valida(cadena: str) -> bool:
         """
@@ -17,12 +17,16 @@ from src.view.components.FileExplorer import FileExplorer
 from src.view.components.VentanaOptimizacion import VentanaOptimizacion
 from src.compiler.LexicalAnalizer import LexicalAnalizerForMy
 from src.compiler.AnalizadorSintactico import AnalizadorSintactico
-from src.util.Tokenizador import Tokenizador
+from src.models.SourceFile import SourceFile
+from src.models.TokenStream import TokenStream
 from src.compiler.AnalizadorSemantico import AnalizadorSemantico
 from src.compiler.Optimizacion import Optimizacion
 from src.models.Arbol import Arbol
 from src.util.ArbolPDF import ArbolPDF
 
+# Segundos máximos de análisis sintáctico: una gramática que retrocede de más no congela la interfaz
+TIEMPO_LIMITE_SINTACTICO = 10
+
 
 class EditorApp:
     def __init__(self):
@@ -424,9 +428,10 @@ inicio"""
         main_window.show()
         sys.exit(self.app.exec())
 
-    def mostrar_tabla_analisis_sintactico(self, lista_estados):
+    def mostrar_tabla_analisis_sintactico(self, lista_estados, estadisticas=None):
         dialog = TablaAnalizisSintactico(
-            data_list=lista_estados
+            data_list=lista_estados,
+            estadisticas=estadisticas
         )
 
         # Conectar señal personalizada (opcional)
@@ -564,8 +569,11 @@ inicio"""
         self.current_analysis = tipo_analisis
         print(f"Ejecutando análisis: {tipo_analisis}")
 
+        # Índice de líneas y hash del código, compartidos por todas las fases
+        fuente = SourceFile(self.editor_widget.get_text())
+
         if tipo_analisis == "Léxico":
-            analizador = LexicalAnalizerForMy(self.editor_widget.get_text())
+            analizador = LexicalAnalizerForMy(fuente)
             resultado = analizador.analizar_codigo()
 
             if resultado:
@@ -585,28 +593,31 @@ inicio"""
             self.tab_widget.setCurrentIndex(0)
 
         elif tipo_analisis == "Sintáctico":
-            # Simular análisis semántico
-            patrones = [
-                r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con punto (ej: 3.14hola)
-                r'\d+[a-zA-Z_][a-zA-Z0-9_]*',  # palabras con número (ej: 8hola)
-                r'\d+(\.\d+){2,}',  # número con más de un punto (ej: 3.14.15)
-                r'\d+\.\d+',  # decimal válido (3.14)
-                r'\d+\.',  # decimal incompleto (8.)
-                r'[a-zA-Z_][a-zA-Z0-9_]*',  # identificador válido
-                r'\d+',  # entero válido
-                r'"[^"]*"',  # ✅ cadena entre comillas
-                r'#.*?#',  # comentario entre almohadillas
-                r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])',  # delimitadores clásicos
-                r'(\s)'  # espacio en blanco
-            ]
-
-            lista_tokens = Tokenizador.obtener_tokens_del_codigo(self.editor_widget.get_text(), patrones)
-            analizador_sintactico = AnalizadorSintactico(lista_tokens)
-
-            bandera = analizador_sintactico.analizar()
-            self.sintactico_tab.setPlainText("Analisis sintactico exitoso\n\n")
+            # El código se tokeniza una sola vez; el parser lee la vista plana del flujo
+            flujo_tokens = TokenStream.desde_codigo(fuente)
+            # Con recuperación de errores se informan todos los errores en una sola pasada
+            tokens = flujo_tokens.vista_plana()
+            analizador_sintactico = AnalizadorSintactico(tokens, recuperar_errores=True,
+                                                         tiempo_limite=TIEMPO_LIMITE_SINTACTICO)
+
+            bandera, estadisticas = analizador_sintactico.resultado()
+            if bandera:
+                self.sintactico_tab.setPlainText("Analisis sintactico exitoso\n\n")
+            else:
+                self.sintactico_tab.setPlainText(f"Errores sintácticos: {len(analizador_sintactico.errores)}\n\n")
+                for _inicio, indice in analizador_sintactico.errores:
+                    token = tokens[indice] if indice < len(tokens) else None
+                    linea, columna = tokens.posicion(indice)
+                    encontrado = f"'{token}'" if token is not None else "el final del código"
+                    self.sintactico_tab.append(
+                        f"Error sintáctico en la línea {linea}, columna {columna}: no se esperaba {encontrado}"
+                    )
+                if estadisticas.detenido_por is not None:
+                    self.sintactico_tab.append(
+                        f"\nEl análisis se detuvo por límite de {estadisticas.detenido_por}: puede haber más errores."
+                    )
             lista_estados = analizador_sintactico.exportar_estados_tabla()
-            self.mostrar_tabla_analisis_sintactico(lista_estados)
+            self.mostrar_tabla_analisis_sintactico(lista_estados, estadisticas)
 
         elif tipo_analisis == "Semántico":
 
@@ -616,7 +627,7 @@ inicio"""
 
             self.semantico_tab.append("FASE 1: Ejecutando análisis léxico...")
 
-            analizador_lexico = LexicalAnalizerForMy(self.editor_widget.get_text())
+            analizador_lexico = LexicalAnalizerForMy(fuente)
 
             hay_errores_lexicos = analizador_lexico.analizar_codigo()
 
@@ -637,26 +648,20 @@ inicio"""
 
             self.semantico_tab.append("FASE 2: Ejecutando análisis sintáctico...")
 
-            # Reutilizamos los patrones que ya tenías definidos
-
-            patrones = [
-
-                r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*', r'\d+[a-zA-Z_][a-zA-Z0-9_]*',
-
-                r'\d+(\.\d+){2,}', r'\d+\.\d+', r'\d+\.', r'[a-zA-Z_][a-zA-Z0-9_]*',
-
-                r'\d+', r'"[^"]*"', r'#.*?#', r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])', r'(\s)'
+            # El código se tokeniza una sola vez y todas las fases leen del mismo flujo
 
-            ]
+            flujo_tokens = TokenStream.desde_codigo(fuente)
 
-            lista_tokens = Tokenizador.obtener_tokens_del_codigo(self.editor_widget.get_text(), patrones)
-
-            analizador_sintactico = AnalizadorSintactico(lista_tokens)
+            analizador_sintactico = AnalizadorSintactico(flujo_tokens.vista_plana(), tiempo_limite=TIEMPO_LIMITE_SINTACTICO)
 
             analisis_sintactico_exitoso = analizador_sintactico.analizar()
 
             if not analisis_sintactico_exitoso:
                 self.semantico_tab.append(">> Fallo SINTÁCTICO detectado. Deteniendo análisis semántico.")
+                if analizador_sintactico.estadisticas.detenido_por is not None:
+                    self.semantico_tab.append(
+                        f">> El análisis sintáctico se detuvo por límite de {analizador_sintactico.estadisticas.detenido_por}."
+                    )
 
                 # Le decimos a la UI que muestre los errores sintácticos y aborte.
 
@@ -676,7 +681,7 @@ inicio"""
 
             self.tab_widget.setCurrentIndex(2)
 
-            codigo_linea_por_linea = Tokenizador.obtener_tokens_del_codigo_linea_por_linea(self.editor_widget.get_text(), patrones)
+            codigo_linea_por_linea = flujo_tokens.vista_lineas()
 
             analizador_semantico = AnalizadorSemantico(codigo_linea_por_linea)
 
@@ -702,8 +707,13 @@ inicio"""
 
                 self.semantico_tab.append(">> Análisis semántico sin errores. Generando árboles...")
 
-                operaciones = analizador_semantico.obtener_operaciones_aritmeticas()
-                print(operaciones)
+                # Las asignaciones con operadores salen del árbol que armó el parser (no se vuelve a
+                # separar el código): cada una trae sus tokens
+                arbol_sintactico = analizador_sintactico.obtener_arbol()
+                operaciones = [
+                    asignacion for asignacion in arbol_sintactico.buscar("asignacion")
+                    if next(asignacion.buscar("operador_arit"), None) is not None
+                ]
                 # Si no hay operaciones, no hay árboles que generar.
 
                 if not operaciones:
@@ -734,9 +744,9 @@ inicio"""
 
                 for i, op in enumerate(operaciones):
 
-                    self.semantico_tab.append(f"Procesando operación: {' '.join(op)}")
+                    self.semantico_tab.append(f"Procesando operación: {' '.join(arbol_sintactico.lexemas(op))}")
 
-                    arbol_raiz = constructor_arbol.construir(op)
+                    arbol_raiz = constructor_arbol.construir_desde_cst(op)
 
                     if arbol_raiz:
                         pdf_visualizer = ArbolPDF(arbol_raiz)
@@ -757,7 +767,7 @@ inicio"""
 
             self.codigo_intermedio_tab.append("FASE 1: Ejecutando análisis léxico...")
 
-            analizador_lexico = LexicalAnalizerForMy(self.editor_widget.get_text())
+            analizador_lexico = LexicalAnalizerForMy(fuente)
 
             hay_errores_lexicos = analizador_lexico.analizar_codigo()
 
@@ -775,26 +785,20 @@ inicio"""
 
             self.codigo_intermedio_tab.append("FASE 2: Ejecutando análisis sintáctico...")
 
-            # Reutilizamos los patrones que ya tenías definidos
-
-            patrones = [
-
-                r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*', r'\d+[a-zA-Z_][a-zA-Z0-9_]*',
-
-                r'\d+(\.\d+){2,}', r'\d+\.\d+', r'\d+\.', r'[a-zA-Z_][a-zA-Z0-9_]*',
+            # El código se tokeniza una sola vez y todas las fases leen del mismo flujo
 
-                r'\d+', r'"[^"]*"', r'#.*?#', r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])', r'(\s)'
+            flujo_tokens = TokenStream.desde_codigo(fuente)
 
-            ]
-
-            lista_tokens = Tokenizador.obtener_tokens_del_codigo(self.editor_widget.get_text(), patrones)
-
-            analizador_sintactico = AnalizadorSintactico(lista_tokens)
+            analizador_sintactico = AnalizadorSintactico(flujo_tokens.vista_plana(), tiempo_limite=TIEMPO_LIMITE_SINTACTICO)
 
             analisis_sintactico_exitoso = analizador_sintactico.analizar()
 
             if not analisis_sintactico_exitoso:
                 self.codigo_intermedio_tab.append(">> Fallo SINTÁCTICO detectado. Deteniendo análisis semántico.")
+                if analizador_sintactico.estadisticas.detenido_por is not None:
+                    self.codigo_intermedio_tab.append(
+                        f">> El análisis sintáctico se detuvo por límite de {analizador_sintactico.estadisticas.detenido_por}."
+                    )
 
                 # Le decimos a la UI que muestre los errores sintácticos y aborte.
 
@@ -812,7 +816,7 @@ inicio"""
 
             #self.tab_widget.setCurrentIndex(2)
 
-            codigo_linea_por_linea = Tokenizador.obtener_tokens_del_codigo_linea_por_linea(self.editor_widget.get_text(), patrones)
+            codigo_linea_por_linea = flujo_tokens.vista_lineas()
 
             analizador_semantico = AnalizadorSemantico(codigo_linea_por_linea)
 
@@ -842,7 +846,7 @@ inicio"""
 
             self.optimizacion_tab.append("FASE 1: Ejecutando análisis léxico...")
 
-            analizador_lexico = LexicalAnalizerForMy(self.editor_widget.get_text())
+            analizador_lexico = LexicalAnalizerForMy(fuente)
 
             hay_errores_lexicos = analizador_lexico.analizar_codigo()
 
@@ -857,18 +861,17 @@ inicio"""
 
             self.optimizacion_tab.append("FASE 2: Ejecutando análisis sintáctico...")
 
-            patrones = [
-                r'\d+\.[a-zA-Z_][a-zA-Z0-9_]*', r'\d+[a-zA-Z_][a-zA-Z0-9_]*',
-                r'\d+(\.\d+){2,}', r'\d+\.\d+', r'\d+\.', r'[a-zA-Z_][a-zA-Z0-9_]*',
-                r'\d+', r'"[^"]*"', r'#.*?#', r'([,.;:(){}\[\]\+\-\*/=<>!?%&#|@^~])', r'(\s)'
-            ]
-
-            lista_tokens = Tokenizador.obtener_tokens_del_codigo(self.editor_widget.get_text(), patrones)
-            analizador_sintactico = AnalizadorSintactico(lista_tokens)
+            # El código se tokeniza una sola vez y todas las fases leen del mismo flujo
+            flujo_tokens = TokenStream.desde_codigo(fuente)
+            analizador_sintactico = AnalizadorSintactico(flujo_tokens.vista_plana(), tiempo_limite=TIEMPO_LIMITE_SINTACTICO)
             analisis_sintactico_exitoso = analizador_sintactico.analizar()
 
             if not analisis_sintactico_exitoso:
                 self.optimizacion_tab.append(">> Fallo SINTÁCTICO detectado. Deteniendo optimización.")
+                if analizador_sintactico.estadisticas.detenido_por is not None:
+                    self.optimizacion_tab.append(
+                        f">> El análisis sintáctico se detuvo por límite de {analizador_sintactico.estadisticas.detenido_por}."
+                    )
                 self.ejecutar_analisis("Sintáctico")
                 return
 
@@ -878,7 +881,7 @@ inicio"""
 
             self.optimizacion_tab.append("FASE 3: Ejecutando análisis semántico...")
 
-            codigo_linea_por_linea = Tokenizador.obtener_tokens_del_codigo_linea_por_linea(self.editor_widget.get_text(), patrones)
+            codigo_linea_por_linea = flujo_tokens.vista_lineas()
             analizador_semantico = AnalizadorSemantico(codigo_linea_por_linea)
             analizador_semantico.analizar_codigo()
             errores_semanticos = analizador_semantico.obtener_errores()
@@ -895,7 +898,7 @@ inicio"""
             self.optimizacion_tab.append("\nFASE 4: Ejecutando optimizaciones...\n")
 
             tabla_variables = analizador_semantico.obtener_tabla_simbolos()
-            optimizador = Optimizacion(self.editor_widget.get_text(), tabla_variables)
+            optimizador = Optimizacion(flujo_tokens, tabla_variables)
             codigo_optimizado, estados_intermedios = optimizador.optimizar_codigo()
 
             self.optimizacion_tab.append("\n>> Optimización completada exitosamente.")
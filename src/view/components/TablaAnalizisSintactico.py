@@ -1,15 +1,90 @@
 import sys
+from itertools import chain
+
 from PyQt6.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout,
-                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QTableView, QPushButton, QLineEdit, QSpinBox,
                              QLabel, QHeaderView, QFrame, QTextEdit, QSplitter)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QFont, QIcon
 
 
-class TablaAnalizisSintactico(QDialog):
+class ModeloTrazaSintactica(QAbstractTableModel):
+    """
+    Modelo de solo lectura sobre las filas [S, I, REGLA, lista_A, lista_B] de la traza.
+
+    Las filas se piden a data_list (una lista o directamente la TrazaSintactica del parser, que
+    las reconstruye al pedirlas) y se formatean solo cuando la vista las muestra, así que abrir
+    una traza de cientos de miles de pasos no crea nada por fila. Las últimas filas formateadas
+    se guardan para no reconstruirlas una vez por columna.
+    """
+
+    ENCABEZADOS = ["S", "I", "R", "Analizado (pila a)", "Por analizar (pila b)"]
+    FILAS_EN_CACHE = 512
+
     def __init__(self, data_list, parent=None):
+        super().__init__(parent)
+        self.data_list = data_list if data_list is not None else []
+        self._formateadas = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.data_list)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ENCABEZADOS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.ENCABEZADOS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        celdas = self.fila_formateada(index.row())
+        return celdas[index.column()] if index.column() < len(celdas) else None
+
+    def fila(self, fila: int):
+        return self.data_list[fila]
+
+    def fila_formateada(self, fila: int) -> list:
+        celdas = self._formateadas.get(fila)
+        if celdas is None:
+            if len(self._formateadas) >= self.FILAS_EN_CACHE:
+                self._formateadas.clear()
+            celdas = self._formateadas[fila] = [self.formatear(celda) for celda in self.fila(fila)]
+        return celdas
+
+    @staticmethod
+    def formatear(celda) -> str:
+        # Convertir listas a string si es necesario
+        if isinstance(celda, list):
+            return ", ".join(str(item) for item in celda)
+        return str(celda)
+
+    def buscar(self, texto: str, desde: int = 0):
+        """
+        Primera fila desde `desde` (dando la vuelta al final) cuyo S, I o regla es texto o que
+        tiene en sus pilas un símbolo que contiene texto. Devuelve None si no hay ninguna.
+
+        Las filas se recorren en orden, que es como la TrazaSintactica las reconstruye más rápido.
+        """
+        total = len(self.data_list)
+        for fila in chain(range(desde, total), range(0, min(desde, total))):
+            s, i, regla, pila_a, pila_b = self.fila(fila)
+            if texto in (str(s), str(i), str(regla)):
+                return fila
+            if any(texto in str(simbolo) for simbolo in pila_a) or any(texto in str(simbolo) for simbolo in pila_b):
+                return fila
+        return None
+
+
+class TablaAnalizisSintactico(QDialog):
+    def __init__(self, data_list, parent=None, estadisticas=None):
         super().__init__(parent)
         self.data_list = data_list
+        self.estadisticas = estadisticas  # <-- EstadisticasSintacticas del análisis (opcional)
         self.init_ui()
         self.populate_table()
 
@@ -56,6 +131,24 @@ class TablaAnalizisSintactico(QDialog):
         toolbar_layout.addWidget(self.close_btn)
         toolbar_layout.addWidget(title_label)
         toolbar_layout.addStretch()
+
+        # Búsqueda y salto a un paso
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar símbolo, regla o estado...")
+        self.search_input.setFixedWidth(220)
+        self.search_btn = QPushButton("Buscar")
+        self.search_btn.setObjectName("actionBtn")
+
+        self.step_input = QSpinBox()
+        self.step_input.setPrefix("Paso ")
+        self.step_input.setRange(1, max(1, len(self.data_list) if self.data_list is not None else 1))
+        self.step_btn = QPushButton("Ir")
+        self.step_btn.setObjectName("actionBtn")
+
+        toolbar_layout.addWidget(self.search_input)
+        toolbar_layout.addWidget(self.search_btn)
+        toolbar_layout.addWidget(self.step_input)
+        toolbar_layout.addWidget(self.step_btn)
         toolbar_layout.addWidget(self.status_label)
 
         # Contenido principal
@@ -69,7 +162,8 @@ class TablaAnalizisSintactico(QDialog):
         table_layout.setContentsMargins(0, 0, 0, 0)
         table_layout.setSpacing(0)
 
-        self.table = QTableWidget()
+        self.model = ModeloTrazaSintactica(self.data_list, self)
+        self.table = QTableView()
         self.table.setObjectName("dataTable")
         self.setup_table()
         table_layout.addWidget(self.table)
@@ -127,6 +221,25 @@ class TablaAnalizisSintactico(QDialog):
         details_layout.addWidget(col4_container, 1)
         details_layout.addWidget(col5_container, 1)
 
+        # Estadísticas del análisis
+        if self.estadisticas is not None:
+            stats_container = QFrame()
+            stats_container.setObjectName("textContainer")
+            stats_layout = QVBoxLayout(stats_container)
+            stats_layout.setContentsMargins(8, 8, 8, 8)
+            stats_layout.setSpacing(6)
+
+            stats_label = QLabel("⏱ Estadísticas del análisis")
+            stats_label.setObjectName("fieldLabel")
+            self.stats_text = QTextEdit()
+            self.stats_text.setObjectName("textArea")
+            self.stats_text.setReadOnly(True)
+            self.stats_text.setPlainText(str(self.estadisticas))
+
+            stats_layout.addWidget(stats_label)
+            stats_layout.addWidget(self.stats_text)
+            details_layout.addWidget(stats_container, 1)
+
         # Configurar splitter
         content_splitter.addWidget(table_container)
         content_splitter.addWidget(details_panel)
@@ -139,19 +252,19 @@ class TablaAnalizisSintactico(QDialog):
         main_layout.addWidget(content_splitter, 1)
 
         # Conectar señales
-        self.table.itemSelectionChanged.connect(self.on_row_selected)
+        self.table.selectionModel().selectionChanged.connect(lambda *_: self.on_row_selected())
+        self.search_btn.clicked.connect(self.buscar)
+        self.search_input.returnPressed.connect(self.buscar)
+        self.step_btn.clicked.connect(lambda: self.ir_a_paso(self.step_input.value()))
+        self.close_btn.clicked.connect(self.close)
 
         # Aplicar estilos
         self.apply_modern_styles()
 
     def setup_table(self):
         """Configura la estructura de la tabla"""
-        # Establecer número de columnas
-        self.table.setColumnCount(5)
-
-        # Headers de las columnas
-        headers = ["S", "I", "R", "Analizado (pila a)", "Por analizar (pila b)"]
-        self.table.setHorizontalHeaderLabels(headers)
+        # Columnas y encabezados salen del modelo
+        self.table.setModel(self.model)
 
         # Configurar tamaños de columnas
         header = self.table.horizontalHeader()
@@ -167,49 +280,59 @@ class TablaAnalizisSintactico(QDialog):
 
         # Configuraciones adicionales de la tabla
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.setWordWrap(False)
+
+        # Filas de alto fijo: la vista no mide cada fila, solo pide las visibles al modelo
+        vertical = self.table.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(24)
 
     def populate_table(self):
-        """Llena la tabla con los datos proporcionados"""
+        """Muestra el estado de los datos (las filas las formatea el modelo al mostrarse)"""
         try:
             if not self.data_list:
                 self.update_status("Sin datos para mostrar", "warning")
                 return
 
-            # Establecer número de filas
-            self.table.setRowCount(len(self.data_list))
-
-            # Llenar cada fila
-            for row_index, row_data in enumerate(self.data_list):
-                if len(row_data) != 5:
-                    self.update_status(f"Error: Fila {row_index + 1} no tiene 5 elementos", "error")
-                    continue
-
-                for col_index, cell_data in enumerate(row_data):
-                    # Convertir listas a string si es necesario
-                    if isinstance(cell_data, list):
-                        display_text = ", ".join(str(item) for item in cell_data)
-                    else:
-                        display_text = str(cell_data)
-
-                    # Crear item para la celda
-                    item = QTableWidgetItem(display_text)
-                    item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-
-                    # Agregar item a la tabla
-                    self.table.setItem(row_index, col_index, item)
-
-            self.update_status("Completado", "success")
+            if self.estadisticas is not None and self.estadisticas.detenido_por is not None:
+                self.update_status(f"Detenido por límite de {self.estadisticas.detenido_por}", "warning")
+            else:
+                self.update_status(f"Completado: {len(self.data_list):,} pasos", "success")
 
         except Exception as e:
             self.update_status(f"Error: {str(e)}", "error")
 
+    def ir_a_paso(self, paso):
+        """Selecciona el paso (empezando en 1) y lo centra en la tabla"""
+        if not self.data_list or not 1 <= paso <= len(self.data_list):
+            self.update_status(f"No existe el paso {paso}", "warning")
+            return
+        index = self.model.index(paso - 1, 0)
+        self.table.selectRow(paso - 1)
+        self.table.scrollTo(index, QTableView.ScrollHint.PositionAtCenter)
+
+    def buscar(self):
+        """Busca el texto desde la fila siguiente a la seleccionada"""
+        texto = self.search_input.text().strip()
+        if not texto or not self.data_list:
+            return
+
+        actual = self.table.currentIndex().row()
+        fila = self.model.buscar(texto, actual + 1)
+        if fila is None:
+            self.update_status(f"Sin resultados para '{texto}'", "warning")
+            return
+        self.ir_a_paso(fila + 1)
+        self.update_status(f"'{texto}' en el paso {fila + 1}", "info")
+
     def on_row_selected(self):
         """Maneja la selección de filas y actualiza las áreas de texto"""
-        selected_items = self.table.selectedItems()
+        selected_rows = self.table.selectionModel().selectedRows()
 
-        if not selected_items:
+        if not selected_rows:
             # Si no hay selección, limpiar las áreas de texto
             self.col4_text.clear()
             self.col5_text.clear()
@@ -218,12 +341,12 @@ class TablaAnalizisSintactico(QDialog):
             return
 
         # Obtener el número de fila seleccionada
-        current_row = selected_items[0].row()
+        current_row = selected_rows[0].row()
 
         try:
             # Obtener los datos originales de la fila seleccionada
             if current_row < len(self.data_list):
-                row_data = self.data_list[current_row]
+                row_data = self.model.fila(current_row)
 
                 # Obtener contenido de columna 4 (índice 3)
                 col4_content = row_data[3] if len(row_data) > 3 else []
@@ -5,18 +5,23 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor
 
+from src.models.IndiceTokens import IndiceTokens
+
 class TablaTokensDialog(QDialog):
     """
-    Componente independiente para mostrar una tabla de tokens desde una lista
+    Componente independiente para mostrar una tabla de tokens desde una lista o un IndiceTokens.
+    Las filas se muestran por páginas, así solo se decodifican las de la página visible.
     """
 
     tokenSeleccionado = pyqtSignal(str, str)  # token, tipo
 
-    def __init__(self, tokens_data, parent=None, title="Tabla de Tokens"):
+    def __init__(self, tokens_data, parent=None, title="Tabla de Tokens", filas_por_pagina=500):
         super().__init__(parent)
         self.title = title
         self.headers = ["Token", "Tipo", "Declara", "Repite"]
-        self.data = tokens_data  # Ahora espera una lista de listas
+        self.data = tokens_data  # Lista de filas o IndiceTokens (ambos se pueden cortar con [a:b])
+        self.filas_por_pagina = filas_por_pagina
+        self.pagina = 0
         self.setupUI()
         self.configurar_tabla()
 
@@ -109,20 +114,47 @@ class TablaTokensDialog(QDialog):
 
         self.close_btn.setStyleSheet(button_style)
 
+        # Paginación
+        self.prev_btn = QPushButton("◀ Anterior")
+        self.prev_btn.clicked.connect(lambda: self.cambiar_pagina(self.pagina - 1))
+        self.next_btn = QPushButton("Siguiente ▶")
+        self.next_btn.clicked.connect(lambda: self.cambiar_pagina(self.pagina + 1))
+        self.pagina_label = QLabel()
+        self.prev_btn.setStyleSheet(button_style)
+        self.next_btn.setStyleSheet(button_style)
+
+        button_layout.addWidget(self.prev_btn)
+        button_layout.addWidget(self.pagina_label)
+        button_layout.addWidget(self.next_btn)
         button_layout.addStretch()
         button_layout.addWidget(self.close_btn)
 
         layout.addLayout(button_layout)
 
+    def total_paginas(self):
+        return max(1, -(-len(self.data) // self.filas_por_pagina))
+
+    def cambiar_pagina(self, pagina):
+        if 0 <= pagina < self.total_paginas():
+            self.pagina = pagina
+            self.configurar_tabla()
+
     def configurar_tabla(self):
+        self.actualizar_paginacion()
         if not self.data:
             return
 
+        inicio = self.pagina * self.filas_por_pagina
+        filas = self.data[inicio:inicio + self.filas_por_pagina]
+
+        # El orden de la página no depende del que haya dejado el usuario al ordenar la anterior
+        self.table.setSortingEnabled(False)
+        self.table.clearContents()
         self.table.setColumnCount(len(self.headers))
-        self.table.setRowCount(len(self.data))
+        self.table.setRowCount(len(filas))
         self.table.setHorizontalHeaderLabels(self.headers)
 
-        for row_idx, row_data in enumerate(self.data):
+        for row_idx, row_data in enumerate(filas):
             for col_idx, cell_data in enumerate(row_data):
                 item = QTableWidgetItem(str(cell_data))
 
@@ -130,12 +162,22 @@ class TablaTokensDialog(QDialog):
 
                 self.table.setItem(row_idx, col_idx, item)
 
+        self.table.setSortingEnabled(True)
         self.configurar_encabezados()
 
         total_tokens = len(self.data)
-        tipos_unicos = len(set(row[1] for row in self.data if len(row) > 1))
+        if isinstance(self.data, IndiceTokens):
+            tipos_unicos = len(self.data.conteo_por_tipo())     # <-- Sin decodificar las líneas de cada fila
+        else:
+            tipos_unicos = len(set(row[1] for row in self.data if len(row) > 1))
         self.info_label.setText(f"Total de tokens: {total_tokens} | Tipos únicos: {tipos_unicos}")
 
+    def actualizar_paginacion(self):
+        total = self.total_paginas()
+        self.pagina_label.setText(f"Página {self.pagina + 1} de {total}")
+        self.prev_btn.setEnabled(self.pagina > 0)
+        self.next_btn.setEnabled(self.pagina < total - 1)
+
     def aplicar_estilos_celda(self, item, col_idx, cell_data):
         if col_idx == 0:  # Token
             item.setFont(QFont("Courier New", 10, QFont.Weight.Bold))
@@ -164,7 +206,7 @@ class TablaTokensDialog(QDialog):
 
     def on_item_clicked(self, item):
         row = item.row()
-        if row < len(self.data):
+        if row < self.table.rowCount():
             token = self.table.item(row, 0).text() if self.table.item(row, 0) else ""
             tipo = self.table.item(row, 1).text() if self.table.item(row, 1) else ""
             self.tokenSeleccionado.emit(token, tipo)
@@ -173,6 +215,8 @@ class TablaTokensDialog(QDialog):
         return self.data
 
     def obtener_tokens(self):
+        if isinstance(self.data, IndiceTokens):
+            return [token for token, _tipo in self.data.claves]
         if len(self.data) > 1:
             return [row[0] for row in self.data if row]
         return []